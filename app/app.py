@@ -1,8 +1,13 @@
+import asyncio
 import os
 import sys
 import folium.plugins
-from nicegui import ui
+from nicegui import app, ui
 from pyosrd import OSRD
+from pyosrd.agents.milp_agent import MILPAgent
+from pyosrd.jobs import JobManager, delayed_job, regulation_job
+from pyosrd.utils.cache_dir import cache_dir
+from pyosrd.viz.dashboard_cache import DashboardCache, files_hash
 import folium
 
 
@@ -14,14 +19,44 @@ def render_map(
     return m.get_root()._repr_html_()
 
 
+MAX_POINTS = 2_000  # samples per train in the space-time charts
+
+
 def space_time_charts_with_selector(sim):
-    fig = sim.space_time_chart_plotly(sim.trains[0], points_to_show=['station'], eco_or_base='base')
-    def update_graph():
-        fig = sim.space_time_chart_plotly(train.value, points_to_show=['station'], eco_or_base='base')
-        graph.update_figure(fig)
+    # Copy of the cached figure, whose traces are updated in place
+    fig = sim.space_time_chart_plotly(
+        sim.trains[0],
+        points_to_show=['station'],
+        eco_or_base='base',
+        webgl=True,
+        max_points=MAX_POINTS,
+    )
+    def update_graph(x_range=None):
+        sim.update_space_time_chart_plotly(
+            fig,
+            train.value,
+            points_to_show=['station'],
+            eco_or_base='base',
+            max_points=MAX_POINTS,
+            x_range=x_range,
+        )
+        graph.update()
+    def zoom(e):
+        if 'yaxis.range[0]' in e.args:
+            fig.layout.yaxis.range = (e.args['yaxis.range[0]'], e.args['yaxis.range[1]'])
+        elif 'yaxis.autorange' in e.args:
+            fig.layout.yaxis.range = None
+        if 'xaxis.range[0]' in e.args:
+            update_graph((e.args['xaxis.range[0]'], e.args['xaxis.range[1]']))
+        elif 'xaxis.autorange' in e.args:
+            update_graph()
+    def select_train():
+        fig.layout.yaxis.range = None
+        update_graph()
     with ui.column().classes('w-full h-[calc(100vh-80px)]'):
-        train = ui.select(options=sim.trains, label='Train', value=sim.trains[0]).on_value_change(update_graph)
+        train = ui.select(options=sim.trains, label='Train', value=sim.trains[0]).on_value_change(select_train)
         graph = ui.plotly(fig).classes('w-full h-[calc(100vh-80px)]')
+        graph.on('plotly_relayout', zoom)
 
 
 folder: str = sys.argv[1]
@@ -31,28 +66,89 @@ ref_sim = OSRD(dir=folder)
 CASES = {
     'Reference': '',
     'Delayed with conflicts': 'delayed',
-    'Interlocking only': 'propagate'
+    'Interlocking only': 'propagate',
+    'Dispatched': 'dispatch',
 }
 INV_CASES = {v: k for k, v in CASES.items()}
 
+# Maps and charts built once per infra and results files content, shared
+# by all page loads (and saved in the user cache for the next runs)
+cache = DashboardCache(cache_dir('dashboard'), maxsize=32, max_keys=64)
+
+# Delays and regulations run in worker processes, not in the event loop
+jobs = JobManager(max_workers=2)
+
+
+def results_files(case: str) -> list[str]:
+    files = [
+        os.path.join(folder, ref_sim.infra_json),
+        os.path.join(folder, ref_sim.results_json),
+    ]
+    if case == 'delayed':
+        files.append(os.path.join(folder, ref_sim.delays_json))
+    elif case:
+        files.append(
+            os.path.join(folder, 'delayed', case, ref_sim.results_json)
+        )
+    return files
+
+
+def case_simulation(case: str) -> OSRD:
+    if not case:
+        return ref_sim
+    if case == 'delayed':
+        return ref_sim.delayed()
+    return OSRD(
+        dir=folder,
+        infra_json='infra.json',
+        simulation_json='simulation.json',
+        results_json=os.path.join('delayed', case, 'results.json'),
+        delays_json='delays.json',
+    )
+
+
+def case_data(case: str) -> dict:
+    """Simulation, map and delays chart of a case, from the cache"""
+    key = files_hash(*results_files(case))
+    sim = cache.get(key, 'simulation', lambda: case_simulation(case))
+    data = {
+        'sim': sim,
+        'map': cache.get(
+            key,
+            'map',
+            lambda: render_map(
+                sim.folium_results(
+                    ref_sim=ref_sim if case else None,
+                    eco_or_base='base'
+                )
+            )
+        ),
+    }
+    if case:
+        data['delays'] = cache.get(
+            key,
+            'delays_chart',
+            lambda: sim.delays_chart_plotly(ref_sim, eco_or_base='base')
+        )
+    return data
+
+
+async def precompute() -> None:
+    """Fill the cache in a thread once the server is started"""
+    for case in CASES.values():
+        results = results_files(case)
+        if os.path.exists(results[1 if case == 'delayed' else -1]):
+            await asyncio.to_thread(case_data, case)
+            print(f"{INV_CASES[case]} ready", cache.stats)
+
+
 @ui.page('/')
 def simulation(case: str | None = ''):
 
-    if case=='delayed':
-        sim = ref_sim.delayed()
-        m = sim.folium_results(ref_sim=ref_sim, eco_or_base='base')    
-    elif case=='reference' or case=='' or case is None:
-        sim = ref_sim
-        m = sim.folium_results(eco_or_base='base')
-    else:
-        sim = OSRD(
-            dir=folder,
-            infra_json='infra.json',
-            simulation_json='simulation.json',
-            results_json=os.path.join('delayed', case, 'results.json'),
-            delays_json='delays.json',
-        )
-        m = sim.folium_results(ref_sim=ref_sim, eco_or_base='base')
+    if case == 'reference' or case is None:
+        case = ''
+    data = case_data(case)
+    sim = data['sim']
 
     with ui.header(elevated=True).classes('bg-white text-black justify-between pl-5', replace='row items-center'):
         with ui.row().classes('items-center'):
@@ -70,17 +166,59 @@ def simulation(case: str | None = ''):
             get = ui.tab(name='SPACE-TIME',label='', icon="ssid_chart").props('flat')
             delays = ui.tab(name='Delays',label='', icon='area_chart').props('flat' if case else 'flat disabled')
 
+        ui.button(icon='tune', on_click=lambda: right_drawer.toggle()).props('flat')
+
     with ui.tab_panels(tabs, value=map).classes('w-full'):
         with ui.tab_panel(map).classes('p-0'):
-            ui.html(render_map(m)).classes('w-full h-[calc(100vh-80px)] p-0')
+            ui.html(data['map']).classes('w-full h-[calc(100vh-80px)] p-0')
         with ui.tab_panel(get).classes('p-0'):
             space_time_charts_with_selector(sim)
         if case:
             with ui.tab_panel(delays).classes('p-0'):
-                ui.plotly(sim.delays_chart_plotly(ref_sim, eco_or_base='base')).classes('w-full')
+                ui.plotly(data['delays']).classes('w-full')
         with ui.tab_panel(info).classes('p-0'):
             ui.label('info')
 
+    def show_progress():
+        jobs.poll()
+        if jobs.jobs:
+            job = jobs.jobs[max(jobs.jobs)]
+            info = job.progress[-1] if job.progress else {}
+            status.text = f"{job.name}: {job.status} " + ' '.join(
+                f"{k}={v}" for k, v in info.items() if k != 'status'
+            )
+        cancel.set_visibility(any(j.active for j in jobs.jobs.values()))
+
+    async def run_job(name, new_case, function, *args):
+        job = jobs.submit(name, function, folder, *args)
+        show_progress()
+        await jobs.wait(job)
+        show_progress()
+        if job.status == 'done':
+            ui.navigate.to(f"/?case={new_case}")
+        elif job.status == 'failed':
+            ui.notify(job.error, type='negative')
+
+    async def add_delay():
+        await run_job(
+            'Add delay',
+            'delayed',
+            delayed_job,
+            [{
+                'train': delayed_train.value,
+                'time_threshold': time_threshold.value,
+                'delay': delay.value,
+            }],
+        )
+
+    async def dispatch():
+        await run_job('Dispatch', 'dispatch', regulation_job, MILPAgent('dispatch'))
+
+    def cancel_jobs():
+        for job in list(jobs.jobs.values()):
+            jobs.cancel(job)
+        show_progress()
+
     with ui.right_drawer(value=False) as right_drawer:
         with ui.row().classes('justify-end w-full'):
             ui.button(icon='close', on_click=lambda: right_drawer.hide()).props('flat')
@@ -88,10 +226,22 @@ def simulation(case: str | None = ''):
             with ui.row():
                 ui.icon('update').classes('text-2xl ')
                 ui.label('Delays')
-            ui.button('Add delay')
+            ui.button('Add delay', on_click=add_delay)
+        delayed_train = ui.select(options=ref_sim.trains, label='Train', value=ref_sim.trains[0]).classes('w-full')
+        time_threshold = ui.input(label='After (hh:mm:ss)', value='00:00:00').classes('w-full')
+        delay = ui.number(label='Delay (s)', value=60, min=0).classes('w-full')
         with ui.row().classes('items-center'):
             ui.icon('error').classes('text-2xl')
             ui.label('Conflit')
-        ui.button('Dispatch').classes('w-full')
+        ui.button('Dispatch', on_click=dispatch).classes('w-full')
+        with ui.row().classes('items-center justify-between w-full'):
+            status = ui.label('')
+            cancel = ui.button(icon='cancel', on_click=cancel_jobs).props('flat')
+            # Delays stop at their next step, the dispatch search at once
+            cancel.tooltip('Cancel (delays stop after their current step)')
+        show_progress()
+        ui.timer(0.5, show_progress)
 
+app.on_startup(precompute)
+app.on_shutdown(jobs.shutdown)
 ui.run(title='RailwAI | OSRD', favicon='🚉')
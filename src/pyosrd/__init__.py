@@ -1,22 +1,5 @@
-import importlib
-import json
-
-from importlib.resources import files
-
 from .osrd import OSRD
+from .utils.rolling_stocks import ROLLING_STOCKS
 
 
 __all__ = [OSRD]
-
-
-ROLLING_STOCKS = {}
-for path in files('pyosrd').joinpath('rolling_stocks/').iterdir():
-    if path.suffix == '.json':
-        with open(path) as f:
-            rs = json.load(f)
-            ROLLING_STOCKS[rs["name"]] = rs
-
-
-importlib.import_module(
-    'railjson_generator.schema.simulation.simulation'
-).ROLLING_STOCKS = ROLLING_STOCKS
@@ -4,7 +4,7 @@ import os
 from abc import ABC, abstractmethod
 from dataclasses import dataclass
 
-from pyosrd.delays import shift_train_departure, add_delay_between_points
+from pyosrd.delays import shift_train_departure, add_delays_in_zones
 
 
 @dataclass
@@ -20,35 +20,7 @@ class Agent(ABC):
         for train, delay in self.departures_to_shift().items():
             shift_train_departure(regulated, train, delay)
 
-        dispatching_delays = self.delays_to_add()
-
-        for train, delays in dispatching_delays.items():
-            points = [
-                p
-                for p in osrd.delayed().points_encountered_by_train(train)
-                if p['type'] in ['detector', 'departure', 'arrival']
-            ]
-            for zone, delay in delays.items():
-                limits = sorted(
-                    [
-                        p
-                        for p in points
-                        if p['id'] in zone.split('<->')
-                    ],
-                    key=lambda x: x['t_base']
-                )
-
-                if len(limits) == 1:
-                    if points.index(limits[0]) == 1:
-                        limits = [points[0]] + limits
-                    else:
-                        limits += [points[-1]]
-                add_delay_between_points(
-                    regulated, 
-                    train,
-                    *[limit['id'] for limit in limits],
-                    delay
-                )
+        add_delays_in_zones(regulated, self.delays_to_add())
 
         os.makedirs(
             os.path.join(osrd.dir, 'delayed', self.name),
@@ -0,0 +1,241 @@
+"""Benchmark scheduler agents on parametrically generated scenarii
+
+>>> from pyosrd.agents.benchmark import generate_scenarii, benchmark_agents
+>>> scenarii = generate_scenarii(num_trains=[2, 4], num_stations=[1, 3])
+>>> report = benchmark_agents(agents, scenarii, report='bench.csv')
+"""
+import itertools
+import os
+import tempfile
+import tracemalloc
+
+from typing import Any
+
+import pandas as pd
+
+from pyosrd import OSRD
+from pyosrd.agents.scheduler_agent import SchedulerAgent
+
+
+def generate_scenarii(
+    num_trains: list[int] = [2],
+    num_stations: list[int] = [1],
+    seeds: list[int] = [42],
+    with_delays: list[str] = [
+        'multistation_multitrains_randomdelay',
+        'c2y11s_conflict_20_trains',
+    ],
+) -> list[dict[str, Any]]:
+    """Scenarii for all combinations of numbers of trains, stations and seeds
+
+    Parameters only apply to the parametrized use cases
+    (`multistation_multitrains_randomdelay`), other use cases
+    are generated once.
+
+    Parameters
+    ----------
+    num_trains : list[int], optional
+        Numbers of trains, by default [2]
+    num_stations : list[int], optional
+        Numbers of stations, by default [1]
+    seeds : list[int], optional
+        Seeds for the random delays, by default [42]
+    with_delays : list[str], optional
+        Use cases with delays to generate, by default
+        ['multistation_multitrains_randomdelay', 'c2y11s_conflict_20_trains']
+
+    Returns
+    -------
+    list[dict[str, Any]]
+        List of scenarii, each one described by a dict with keys
+        'scenario', 'with_delay' and 'params_use_case'
+    """
+
+    scenarii = []
+    for with_delay in with_delays:
+        if with_delay == 'multistation_multitrains_randomdelay':
+            for trains, stations, seed in itertools.product(
+                num_trains, num_stations, seeds
+            ):
+                scenarii.append({
+                    'scenario': (
+                        f"{with_delay}_{trains}tr_{stations}st_seed{seed}"
+                    ),
+                    'with_delay': with_delay,
+                    'params_use_case': {
+                        'num_trains': trains,
+                        'num_stations': stations,
+                        'delay_seed': seed,
+                    },
+                })
+        else:
+            scenarii.append({
+                'scenario': with_delay,
+                'with_delay': with_delay,
+                'params_use_case': {},
+            })
+    return scenarii
+
+
+def _run_agent(
+    agent: SchedulerAgent,
+    sim: OSRD,
+    memory: bool = True,
+) -> dict[str, Any]:
+    """Regulate a simulation with an agent, its peak memory being
+    measured in a second regulation so that tracing does not slow down
+    the timed one"""
+
+    agent.set_schedules_from_osrd(sim, 'all_steps')
+    result = agent.result
+
+    peak_memory = None
+    if memory:
+        agent._result = None
+        tracemalloc.start()
+        agent.result
+        _, peak_memory = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        agent._result = result
+
+    return {
+        'agent': agent.name,
+        'num_trains': len(agent.ref_schedule.trains),
+        'wall_time': result.stats['wall_time'],
+        'nodes_explored': result.stats['nodes_explored'],
+        'peak_memory': peak_memory,
+        'total_weighted_delay': result.regulated_schedule.total_weighted_delay(
+            agent.ref_schedule,
+            agent.weights,
+        ),
+    }
+
+
+def benchmark_agents(
+    agents: SchedulerAgent | list[SchedulerAgent],
+    scenarii: list[dict[str, Any]] | None = None,
+    report: str | None = None,
+    memory: bool = True,
+) -> pd.DataFrame:
+    """Regulate scenarii with agents and measure speed and quality
+
+    Each scenario is simulated once and regulated by every agent. The
+    peak memory is measured in a second regulation, with tracemalloc, so
+    that the wall time is measured without tracing.
+
+    Parameters
+    ----------
+    agents : SchedulerAgent | list[SchedulerAgent]
+        Agent or list of agents to benchmark
+    scenarii : list[dict[str, Any]] | None, optional
+        Scenarii as given by `generate_scenarii`,
+        by default `generate_scenarii()`
+    report : str | None, optional
+        If set, path of the file where the report is saved,
+        either in parquet format (if extension is .parquet)
+        or csv, by default None
+    memory : bool, optional
+        If False, the peak memory is not measured (None) and each
+        scenario is regulated once by each agent, by default True
+
+    Returns
+    -------
+    pd.DataFrame
+        One row per scenario and agent, with columns
+        'scenario', 'agent', 'num_trains', 'wall_time' [s],
+        'nodes_explored', 'peak_memory' [bytes] and
+        'total_weighted_delay' [s]
+    """
+
+    if isinstance(agents, SchedulerAgent):
+        agents = [agents]
+
+    if scenarii is None:
+        scenarii = generate_scenarii()
+
+    records = []
+    for scenario in scenarii:
+        with tempfile.TemporaryDirectory() as dir:
+            sim = OSRD(
+                dir=dir,
+                with_delay=scenario['with_delay'],
+                params_use_case=scenario['params_use_case'],
+            )
+            for agent in agents:
+                records.append(
+                    {'scenario': scenario['scenario']}
+                    | _run_agent(agent, sim, memory)
+                )
+
+    df = pd.DataFrame(records)
+
+    if report is not None:
+        if os.path.splitext(report)[1] == '.parquet':
+            df.to_parquet(report, index=False)
+        else:
+            df.to_csv(report, index=False)
+
+    return df
+
+
+def regressions(
+    report: pd.DataFrame | str,
+    baseline: pd.DataFrame | str,
+    max_time_ratio: float = 1.5,
+    max_delay_increase: float = 0.,
+) -> pd.DataFrame:
+    """Compare a benchmark report to a baseline
+
+    Designed for CI, e.g.
+
+    >>> assert regressions(report, 'baseline.csv').empty
+
+    Parameters
+    ----------
+    report : pd.DataFrame | str
+        Benchmark report or path to a saved report
+    baseline : pd.DataFrame | str
+        Baseline report or path to a saved report
+    max_time_ratio : float, optional
+        Maximum allowed ratio between the wall times of the report and the
+        baseline, by default 1.5
+    max_delay_increase : float, optional
+        Maximum allowed increase of the total weighted delay in seconds,
+        by default 0.
+
+    Returns
+    -------
+    pd.DataFrame
+        Rows (scenario, agent) of the report exceeding the thresholds,
+        with the report and baseline values
+    """
+
+    def _read(df: pd.DataFrame | str) -> pd.DataFrame:
+        if isinstance(df, pd.DataFrame):
+            return df
+        if os.path.splitext(df)[1] == '.parquet':
+            return pd.read_parquet(df)
+        return pd.read_csv(df)
+
+    compared = _read(report).merge(
+        _read(baseline),
+        on=['scenario', 'agent'],
+        suffixes=('', '_baseline'),
+    )
+
+    too_slow = (
+        compared.wall_time > max_time_ratio * compared.wall_time_baseline
+    )
+    worse = (
+        compared.total_weighted_delay
+        > compared.total_weighted_delay_baseline + max_delay_increase
+    )
+
+    return compared[too_slow | worse][[
+        'scenario',
+        'agent',
+        'wall_time',
+        'wall_time_baseline',
+        'total_weighted_delay',
+        'total_weighted_delay_baseline',
+    ]].reset_index(drop=True)
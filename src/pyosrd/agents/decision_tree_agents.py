@@ -403,6 +403,7 @@ class DecisionTreeAgent(SchedulerAgent):
             self._env,
             max_successive_actions=None
         )
+        self.nodes_explored = len(tree.nodes)
 
         print(
             f"{seconds_to_hour(-int(best_reward))} found at {best_node}"
@@ -442,9 +443,11 @@ class PropagationAgent(SchedulerAgent):
         self.build_gym_env()
         self._env.reset()
         done = self._env._schedule.no_conflict()
+        self.nodes_explored = 0
 
         while not done:
             _, reward, done, info = self._env.step(0)
-        
+            self.nodes_explored += 1
+
         return self._env._schedule
 
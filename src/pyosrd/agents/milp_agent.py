@@ -0,0 +1,249 @@
+import copy
+import math
+import threading
+
+from dataclasses import dataclass
+from itertools import combinations
+from typing import Callable
+
+import pandas as pd
+
+from ortools.sat.python import cp_model
+
+from pyosrd.schedules import Schedule
+from pyosrd.agents.scheduler_agent import SchedulerAgent
+
+
+class _ScheduleSolutionCallback(cp_model.CpSolverSolutionCallback):
+    """Forward each improving solution to a user callback as a Schedule"""
+
+    def __init__(
+        self,
+        agent: "MILPAgent",
+        variables: dict,
+        callback: Callable[[Schedule, float], None],
+    ):
+        cp_model.CpSolverSolutionCallback.__init__(self)
+        self._agent = agent
+        self._variables = variables
+        self._callback = callback
+        self.num_solutions = 0
+
+    def on_solution_callback(self) -> None:
+        self.num_solutions += 1
+        shifts = {
+            key: (self.Value(a), self.Value(b))
+            for key, (a, b) in self._variables.items()
+        }
+        self._callback(
+            self._agent._schedule_from_shifts(shifts),
+            self.ObjectiveValue(),
+        )
+
+
+@dataclass
+class MILPAgent(SchedulerAgent):
+    """Regulate the whole schedule at once with a CP-SAT model
+
+    Each step (a train in a zone) gets two integer variables: the time shift
+    of the head entering the zone and the time shift of the tail leaving it,
+    both relative to the delayed schedule. Working with shifts keeps the
+    regulated times exactly equal to the delayed ones when no action is
+    taken. Constraints are:
+
+    - trains can not be ahead of the delayed schedule,
+    - the overlap between two consecutive zones of a train is unchanged,
+    - a step lasts at least its `min_durations` value, or exactly its
+      delayed duration if `step_has_fixed_duration` is True,
+    - a step keeps its delayed times if `frozen_steps` is True,
+    - for each pair of trains sharing a zone, an ordering boolean forces
+      one train to leave before the other one enters.
+
+    The objective is the total weighted delay of the zone entries.
+
+    Attributes
+    ----------
+    time_limit: float, optional
+        Maximum solving time in seconds, by default 10.
+    num_workers: int, optional
+        Number of CP-SAT search workers, by default 8
+    solution_callback: Callable[[Schedule, float], None] | None, optional
+        Called with the regulated schedule and the objective value each
+        time the solver finds an improving solution, by default None
+    stop_requested: Callable[[], bool] | None, optional
+        Polled every `stop_poll_interval` seconds while solving: the search
+        stops (keeping the best solution found) once it returns True, e.g.
+        when a background job is cancelled, by default None
+    stop_poll_interval: float, optional
+        Seconds between two calls of stop_requested, by default 0.2
+    """
+
+    time_limit: float = 10.
+    num_workers: int = 8
+    solution_callback: Callable[[Schedule, float], None] | None = None
+    stop_requested: Callable[[], bool] | None = None
+    stop_poll_interval: float = 0.2
+
+    def _watch_stop(
+        self,
+        solver: cp_model.CpSolver,
+        solved: threading.Event,
+    ) -> None:
+        """Stop the search once stop_requested() returns True"""
+        while not solved.wait(self.stop_poll_interval):
+            if self.stop_requested():
+                solver.StopSearch()
+                return
+
+    def _schedule_from_shifts(
+        self,
+        shifts: dict[tuple[str, int | str], tuple[int, int]],
+    ) -> Schedule:
+
+        schedule = copy.deepcopy(self.delayed_schedule)
+        schedule.clear_cache()
+
+        for (train, zone), (shift_in, shift_out) in shifts.items():
+            schedule._df.loc[zone, (train, 's')] += shift_in
+            schedule._df.loc[zone, (train, 'e')] += shift_out
+
+        return schedule
+
+    def _build_model(self) -> tuple[cp_model.CpModel, dict]:
+
+        delayed = self.delayed_schedule
+        starts, ends = delayed.starts, delayed.ends
+        min_durations = delayed.min_durations
+        fixed = (
+            self.step_has_fixed_duration.fillna(False).astype(bool)
+            if self.step_has_fixed_duration is not None
+            else pd.DataFrame(
+                False,
+                index=delayed.zones,
+                columns=delayed.trains
+            )
+        )
+        frozen = (
+            self.frozen_steps.fillna(False).astype(bool)
+            if self.frozen_steps is not None
+            else None
+        )
+        weights = (
+            self.weights.fillna(0).astype(int)
+            if self.weights is not None
+            else starts.notna().astype(int)
+        )
+
+        horizon = math.ceil(
+            (ends.max().max() - starts.min().min()) * len(delayed.trains)
+        )
+
+        model = cp_model.CpModel()
+        variables = dict()
+
+        for train in delayed.trains:
+            path = delayed.path(train)
+            for zone in path:
+                max_shift = (
+                    0
+                    if frozen is not None and frozen.loc[zone, train]
+                    else horizon
+                )
+                shift_in = model.NewIntVar(
+                    0, max_shift, f"in_{train}_{zone}"
+                )
+                shift_out = model.NewIntVar(
+                    0, max_shift, f"out_{train}_{zone}"
+                )
+                variables[(train, zone)] = (shift_in, shift_out)
+
+                duration = ends.loc[zone, train] - starts.loc[zone, train]
+                if fixed.loc[zone, train]:
+                    model.Add(shift_out == shift_in)
+                else:
+                    model.Add(
+                        shift_out - shift_in
+                        >= math.ceil(min_durations.loc[zone, train] - duration)
+                    )
+
+            for zone, next_zone in zip(path[:-1], path[1:]):
+                model.Add(
+                    variables[(train, next_zone)][0]
+                    == variables[(train, zone)][1]
+                )
+
+        for zone in delayed.zones:
+            trains = starts.loc[zone].dropna().index
+            for train1, train2 in combinations(trains, 2):
+                train1_first = model.NewBoolVar(
+                    f"order_{zone}_{train1}_{train2}"
+                )
+                # train1 leaves before train2 enters, or the opposite
+                model.Add(
+                    variables[(train1, zone)][1]
+                    - variables[(train2, zone)][0]
+                    <= math.floor(
+                        starts.loc[zone, train2] - ends.loc[zone, train1]
+                    )
+                ).OnlyEnforceIf(train1_first)
+                model.Add(
+                    variables[(train2, zone)][1]
+                    - variables[(train1, zone)][0]
+                    <= math.floor(
+                        starts.loc[zone, train1] - ends.loc[zone, train2]
+                    )
+                ).OnlyEnforceIf(train1_first.Not())
+
+        model.Minimize(
+            sum(
+                int(weights.loc[zone, train]) * shift_in
+                for (train, zone), (shift_in, _) in variables.items()
+            )
+        )
+
+        return model, variables
+
+    @property
+    def regulated_schedule(self) -> Schedule:
+
+        model, variables = self._build_model()
+
+        solver = cp_model.CpSolver()
+        solver.parameters.max_time_in_seconds = self.time_limit
+        solver.parameters.num_search_workers = self.num_workers
+
+        solved = threading.Event()
+        if self.stop_requested is not None:
+            threading.Thread(
+                target=self._watch_stop,
+                args=(solver, solved),
+                daemon=True,
+            ).start()
+
+        try:
+            if self.solution_callback is not None:
+                status = solver.Solve(
+                    model,
+                    _ScheduleSolutionCallback(
+                        self,
+                        variables,
+                        self.solution_callback
+                    )
+                )
+            else:
+                status = solver.Solve(model)
+        finally:
+            solved.set()
+
+        self.solver_status = solver.StatusName(status)
+        self.nodes_explored = solver.NumBranches()
+
+        if status not in (cp_model.OPTIMAL, cp_model.FEASIBLE):
+            raise RuntimeError(
+                f"No regulated schedule found ({self.solver_status})"
+            )
+
+        return self._schedule_from_shifts({
+            key: (solver.Value(a), solver.Value(b))
+            for key, (a, b) in variables.items()
+        })
@@ -0,0 +1,217 @@
+import copy
+import time
+
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+from pyosrd.schedules import Schedule
+from pyosrd.agents.scheduler_agent import SchedulerAgent
+
+
+def _restrict(
+    schedule: Schedule,
+    steps: pd.DataFrame,
+) -> Schedule:
+    """Sub-schedule containing only the given steps
+
+    Parameters
+    ----------
+    schedule : Schedule
+        Schedule to restrict
+    steps : pd.DataFrame
+        Boolean DataFrame (zones x trains) of the steps to keep
+
+    Returns
+    -------
+    Schedule
+        New schedule with only the zones and trains having
+        at least one step to keep
+    """
+
+    trains = [train for train in schedule.trains if steps[train].any()]
+    zones = steps.index[steps.any(axis=1)]
+    columns = pd.MultiIndex.from_product([trains, ['s', 'e']])
+    mask = pd.DataFrame(
+        np.repeat(steps.loc[zones, trains].values, 2, axis=1),
+        index=zones,
+        columns=columns,
+    )
+
+    new_schedule = copy.copy(schedule)
+    new_schedule._trains = trains
+    new_schedule._df = (
+        schedule._df.loc[zones, list(columns)]
+        .set_axis(columns, axis=1)
+        .where(mask)
+    )
+    if hasattr(schedule, '_min_times'):
+        new_schedule._min_times = (
+            schedule._min_times.loc[zones, list(columns)]
+            .set_axis(columns, axis=1)
+            .where(mask)
+        )
+    if hasattr(schedule, '_step_type'):
+        new_schedule._step_type = (
+            schedule._step_type.loc[zones, trains]
+            .where(steps.loc[zones, trains])
+        )
+    new_schedule.clear_cache()
+
+    return new_schedule
+
+
+@dataclass
+class RollingHorizonAgent(SchedulerAgent):
+    """Regulate long schedules window by window with another agent
+
+    The delayed schedule is cut into overlapping time windows, the steps
+    of each window being clipped at its start time. Each window is
+    regulated by `agent`, then only the steps starting before the overlap
+    are committed, the remaining ones being shifted to stay consistent with
+    the committed part and regulated again in the next window. Committed
+    steps are frozen: the next windows pass them to `agent` as
+    `frozen_steps` (kept at their committed times by agents supporting it,
+    such as MILPAgent) and never overwrite them.
+
+    Attributes
+    ----------
+    agent: SchedulerAgent | None
+        Agent used to regulate each window, by default None
+    window: float, optional
+        Duration of a time window in seconds, by default 3600.
+    overlap: float, optional
+        Duration in seconds shared by two consecutive windows,
+        by default 600.
+    window_stats: pd.DataFrame
+        After regulation, one row per window with its start and end times,
+        numbers of trains, steps and frozen steps, solve time in seconds
+        and number of nodes explored by the agent (None if not reported)
+    """
+
+    agent: SchedulerAgent | None = None
+    window: float = 3600.
+    overlap: float = 600.
+
+    def _regulate_window(
+        self,
+        schedule: Schedule,
+        start: float,
+        end: float,
+        commit_until: float,
+        frozen: pd.DataFrame,
+    ) -> tuple[Schedule, dict, pd.DataFrame]:
+        """Regulate the steps of a time window, returning the new
+        schedule, the window statistics and the newly committed steps"""
+
+        starts, ends = schedule.starts, schedule.ends
+        in_window = (ends > start) & (starts < end)
+
+        stats = {
+            'start': start,
+            'end': end,
+            'num_trains': int(in_window.any().sum()),
+            'num_steps': int(in_window.sum().sum()),
+            'num_frozen_steps': int((in_window & frozen).sum().sum()),
+            'solve_time': 0.,
+            'nodes_explored': 0,
+        }
+        committed = in_window & (starts < commit_until) & ~frozen
+        if not in_window.any().any():
+            return schedule, stats, committed
+
+        self.agent.delayed_schedule = _restrict(schedule, in_window)
+        self.agent.delayed_schedule._df = (
+            self.agent.delayed_schedule._df.clip(lower=start)
+        )
+        self.agent.ref_schedule = _restrict(self.ref_schedule, in_window)
+        trains = self.agent.delayed_schedule.trains
+        zones = self.agent.delayed_schedule.zones
+        for attr in ['step_has_fixed_duration', 'weights']:
+            df = getattr(self, attr)
+            setattr(
+                self.agent,
+                attr,
+                df.loc[zones, trains].where(in_window.loc[zones, trains])
+                if df is not None
+                else None
+            )
+        self.agent.frozen_steps = (
+            frozen.loc[zones, trains] & in_window.loc[zones, trains]
+        )
+
+        tic = time.perf_counter()
+        regulated = self.agent.regulated_schedule
+        stats['solve_time'] = time.perf_counter() - tic
+        stats['nodes_explored'] = getattr(self.agent, 'nodes_explored', None)
+
+        new_schedule = copy.deepcopy(schedule)
+
+        for train in trains:
+            path = schedule.path(train)
+            zones_committed = [z for z in path if committed.loc[z, train]]
+            if not zones_committed:
+                continue
+            for zone in zones_committed:
+                if starts.loc[zone, train] >= start:
+                    new_schedule._df.loc[zone, (train, 's')] =\
+                        regulated.starts.loc[zone, train]
+                new_schedule._df.loc[zone, (train, 'e')] =\
+                    regulated.ends.loc[zone, train]
+
+            # Zones after the committed ones follow the last committed zone
+            last_zone = zones_committed[-1]
+            shift = (
+                regulated.ends.loc[last_zone, train]
+                - ends.loc[last_zone, train]
+            )
+            for zone in path[path.index(last_zone)+1:]:
+                new_schedule._df.loc[zone, (train, 's')] += shift
+                new_schedule._df.loc[zone, (train, 'e')] += shift
+
+        new_schedule.clear_cache()
+        return new_schedule, stats, committed
+
+    @property
+    def regulated_schedule(self) -> Schedule:
+
+        if self.agent is None:
+            raise ValueError("No agent given to regulate the windows")
+        if self.overlap >= self.window:
+            raise ValueError("The overlap must be shorter than the window")
+
+        schedule = copy.deepcopy(self.delayed_schedule)
+        schedule.clear_cache()
+
+        start = schedule.starts.min().min()
+        frozen = pd.DataFrame(
+            False,
+            index=schedule.zones,
+            columns=schedule.trains,
+        )
+        stats = []
+        while start < schedule.ends.max().max():
+            end = start + self.window
+            last_window = end >= schedule.ends.max().max()
+            schedule, window_stats, committed = self._regulate_window(
+                schedule,
+                start,
+                end,
+                commit_until=np.inf if last_window else end - self.overlap,
+                frozen=frozen,
+            )
+            frozen = frozen | committed
+            stats.append(window_stats)
+            if last_window:
+                break
+            start = end - self.overlap
+
+        self.window_stats = pd.DataFrame(stats)
+        nodes_explored = self.window_stats.nodes_explored
+        self.nodes_explored = (
+            None
+            if nodes_explored.isna().any()
+            else int(nodes_explored.sum())
+        )
+        return schedule
@@ -1,7 +1,9 @@
 from abc import abstractmethod
 import shutil
+import time
 
-from dataclasses import dataclass
+from dataclasses import dataclass, field
+from typing import Any
 
 import pandas as pd
 
@@ -18,6 +20,29 @@ from pyosrd.schedules.compare_schedules import (
 from pyosrd.agents import Agent
 
 
+@dataclass
+class RegulationResult:
+    """Outcome of a regulation by a SchedulerAgent
+
+    Attributes
+    ----------
+    regulated_schedule: Schedule
+        Schedule found by the agent
+    departures_to_shift: dict[str, float]
+        Departure shifts w.r.t. the delayed schedule {train: shift [s]}
+    delays_to_add: dict[str, dict[str, float]]
+        Delays to add w.r.t. the delayed schedule
+        {train: {zone: delay [s], ...}, ...}
+    stats: dict[str, Any]
+        Search statistics: 'wall_time' in seconds, 'nodes_explored'
+    """
+
+    regulated_schedule: Schedule
+    departures_to_shift: dict[str, float]
+    delays_to_add: dict[str, dict[str, float]]
+    stats: dict[str, Any] = field(default_factory=dict)
+
+
 @dataclass
 class SchedulerAgent(Agent):
     """Base class for regulation agents that use schedules
@@ -30,6 +55,10 @@ class SchedulerAgent(Agent):
         ...
     ```
 
+    The regulation is run once and stored in the `result` attribute,
+    which is reset whenever a public attribute (schedules, fixed
+    durations, weights or parameters of the child class) is set.
+
     Attributes
     ----------
     name: str
@@ -46,12 +75,25 @@ class SchedulerAgent(Agent):
         DataFrame of step weights for the weighted total delay.
         Can be generated using methods from the schedules.weight module
         , by default None
+    frozen_steps: pd.DataFrame | None, optional
+        DataFrame of booleans indicating the steps that must keep their
+        delayed times (e.g. committed by a previous window of a
+        RollingHorizonAgent), for agents supporting it (MILPAgent),
+        by default None
     """
 
     ref_schedule: Schedule | None = None
     delayed_schedule: Schedule | None = None
     step_has_fixed_duration: pd.DataFrame | None = None
     weights: pd.DataFrame | None = None
+    frozen_steps: pd.DataFrame | None = None
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        # Any public attribute (schedules, weights, parameters of the
+        # child classes) may change the regulation
+        if not name.startswith('_'):
+            super().__setattr__('_result', None)
+        super().__setattr__(name, value)
 
     def set_schedules_from_osrd(
         self,
@@ -90,6 +132,30 @@ class SchedulerAgent(Agent):
     def regulated_schedule(self) -> Schedule:
         ...
 
+    @property
+    def result(self) -> RegulationResult:
+        """Regulation result, computed on first access"""
+        if getattr(self, '_result', None) is None:
+            tic = time.perf_counter()
+            rs = self.regulated_schedule
+            wall_time = time.perf_counter() - tic
+            self._result = RegulationResult(
+                regulated_schedule=rs,
+                departures_to_shift=departure_shift_between_schedules(
+                    rs,
+                    self.delayed_schedule
+                ),
+                delays_to_add=delays_between_schedules(
+                    rs,
+                    self.delayed_schedule
+                ),
+                stats={
+                    'wall_time': wall_time,
+                    'nodes_explored': getattr(self, 'nodes_explored', None),
+                },
+            )
+        return self._result
+
     def regulated(self, osrd):
         self.set_schedules_from_osrd(osrd)
         return super().regulated(osrd)
@@ -97,20 +163,12 @@ class SchedulerAgent(Agent):
     def departures_to_shift(
         self: "Agent",
     ) -> dict[str, float]:
-        rs = self.regulated_schedule
-        return departure_shift_between_schedules(
-            rs,
-            self.delayed_schedule
-        )
+        return self.result.departures_to_shift
 
     def delays_to_add(
         self: "Agent",
     ) -> dict[str, dict[str, float]]:
-        rs = self.regulated_schedule
-        return delays_between_schedules(
-            rs,
-            self.delayed_schedule
-        )
+        return self.result.delays_to_add
 
     def load_scenario(
         self,
@@ -164,7 +222,7 @@ class SchedulerAgent(Agent):
         df = pd.DataFrame(
             {
                 self.name: [
-                    self.regulated_schedule.total_weighted_delay(
+                    self.result.regulated_schedule.total_weighted_delay(
                         self.ref_schedule,
                         weights_.all_steps(sim),
                     )
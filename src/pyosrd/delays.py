@@ -3,8 +3,12 @@ import json
 import os
 import shutil
 
+import numpy as np
+
 from pyosrd.utils import hour_to_seconds
 
+TIME_TO_STOP = 60  # seconds
+
 
 def add_delay(
     self,
@@ -51,6 +55,10 @@ def add_delay(
 
 def add_delays_in_results(self) -> None:
 
+    # results are modified in place
+    self._space_time_data = None
+    self._reset_simulated()  # the next run() simulates all trains
+
     try:
         with open(os.path.join(self.dir, self.delays_json), 'r') as f:
             delays = json.load(f)
@@ -134,7 +142,11 @@ def add_delay_between_points(
     point_id_B: str,
     delay: float,
 ) -> None:
-    
+
+    # results are modified in place
+    self._space_time_data = None
+    self._reset_simulated()  # the next run() simulates all trains
+
     if isinstance(train, str):
         train = self.trains.index(train)
 
@@ -175,7 +187,6 @@ def add_delay_between_points(
         t_in, t_out = limits[0][f"t_{eco_or_base}"], limits[1][f"t_{eco_or_base}"]
         pos_in, pos_out = limits[0]['offset'], limits[1]['offset']
 
-        TIME_TO_STOP = 60  # seconds
         stop = next(
             (
             s
@@ -213,12 +224,147 @@ def add_delay_between_points(
                     r['track_section'] =  h[i-1]['track_section']
 
 
+def _zone_limits(
+    points: list[dict],
+    zone: str,
+) -> tuple[dict, dict]:
+
+    limits = sorted(
+        [
+            p
+            for p in points
+            if p['id'] in zone.split('<->')
+        ],
+        key=lambda x: x['t_base']
+    )
+
+    if len(limits) == 1:
+        if points.index(limits[0]) == 1:
+            limits = [points[0]] + limits
+        else:
+            limits += [points[-1]]
+    return limits[0], limits[1]
+
+
+def add_delays_in_zones(
+    self,
+    delays: dict[str, dict[str, float]],
+) -> None:
+    """Add delays in zones for several trains at once
+
+    Same result as calling `add_delay_between_points` with the limits of
+    each zone, but the points encountered are computed once per train and
+    the head positions are modified as arrays.
+
+    Parameters
+    ----------
+    delays : dict[str, dict[str, float]]
+        Dict with format {train_label: {zone: delay [s], ...}, ...},
+        zones being in the order of the train's path
+    """
+
+    # results are modified in place
+    self._space_time_data = None
+    self._reset_simulated()  # the next run() simulates all trains
+
+    for train, zone_delays in delays.items():
+
+        if isinstance(train, str):
+            train = self.trains.index(train)
+
+        points = [
+            p
+            for p in self.points_encountered_by_train(train)
+            if p['type'] in ['detector', 'departure', 'arrival']
+        ]
+        limits = [
+            (*[p['offset'] for p in _zone_limits(points, zone)], delay)
+            for zone, delay in zone_delays.items()
+        ]
+        stops = self.get_stops(train)
+
+        group, _ = self._train_schedule_group[self.trains[train]]
+
+        for eco_or_base in ['base', 'eco']:
+
+            if self.results[group][f'{eco_or_base}_simulations'] == [None]:
+                break
+
+            head_positions = self._head_position(train, eco_or_base)
+            time = np.array([r['time'] for r in head_positions], dtype=float)
+            path_offset = np.array(
+                [r['path_offset'] for r in head_positions],
+                dtype=float
+            )
+
+            for offset_A, offset_B, delay in limits:
+
+                (t_in, pos_in), (t_out, pos_out) = sorted(
+                    zip(
+                        np.interp([offset_A, offset_B], path_offset, time),
+                        [offset_A, offset_B]
+                    ),
+                    key=lambda x: x[0]
+                )
+
+                stop = next(
+                    (
+                        s
+                        for s in stops
+                        if s['position'] >= pos_in
+                        and s['position'] <= pos_out
+                    ),
+                    None
+                )
+
+                if stop:
+                    time[
+                        (path_offset >= stop['position'])
+                        & (np.roll(path_offset, 1) >= stop['position'])
+                    ] += delay
+
+                elif delay <= 2 * TIME_TO_STOP:
+                    stretch = (t_out - t_in + delay)/(t_out-t_in)
+                    time = np.where(
+                        time < t_in,
+                        time,
+                        np.where(
+                            time < t_out,
+                            t_in + (time - t_in) * stretch,
+                            time + delay
+                        )
+                    )
+
+                elif (time >= t_out).any():
+                    # The train stops TIME_TO_STOP before t_out
+                    # and waits there
+                    i = int(np.argmax(time >= t_out))
+                    after = np.arange(len(time)) > i
+                    if i > 0:
+                        time[i] += delay - TIME_TO_STOP
+                        time[i-1] += TIME_TO_STOP
+                        path_offset[i] = path_offset[i-1]
+                        for key in ['offset', 'track_section']:
+                            head_positions[i][key] = head_positions[i-1][key]
+                    else:
+                        after[i] = True
+                    time[after & (time > t_out)] += delay
+
+            for r, t, o in zip(head_positions, time, path_offset):
+                r['time'] = t.item()
+                r['path_offset'] = o.item()
+
+
 def shift_train_departure(
     self,
     train: int | str,
     delay: float,
 ) -> None:
-    
+
+    # results are modified in place
+    self._space_time_data = None
+    self._reset_simulated()  # the next run() simulates all trains
+
     if isinstance(train, str):
         train = self.trains.index(train)
 
@@ -1,5 +1,22 @@
+from operator import itemgetter
+
 import numpy as np
 
+_TIME_AND_OFFSET = itemgetter('time', 'path_offset')
+
+
+def _times_and_offsets(
+    sim,
+    train: int | str,
+    eco_or_base: str,
+) -> np.ndarray:
+    """(N, 2) array of the times and path offsets of a train's head"""
+    return np.array(
+        list(map(_TIME_AND_OFFSET, sim._head_position(train, eco_or_base))),
+        dtype=float,
+    ).reshape(-1, 2)
+
+
 def calculate_delay_f_time(
     sim,
     ref_sim,
@@ -22,15 +39,64 @@ def calculate_delay_f_time(
         results (head_position)
     """
 
-    sim_offset = [r['path_offset'] for r in sim._head_position(train, eco_or_base)]
-    sim_time = [r['time'] for r in sim._head_position(train, eco_or_base)]
-    ref_sim_offset = [r['path_offset'] for r in ref_sim._head_position(train, eco_or_base)]
-    ref_sim_time = [r['time'] for r in ref_sim._head_position(train, eco_or_base)]
-    
+    sim_time, sim_offset = _times_and_offsets(sim, train, eco_or_base).T
+    ref_sim_time, ref_sim_offset = \
+        _times_and_offsets(ref_sim, train, eco_or_base).T
+
     ref_sim_time_interp = np.interp(
         sim_offset,
         ref_sim_offset,
         ref_sim_time
     )
 
-    return (sim_time - ref_sim_time_interp).round().tolist()
\ No newline at end of file
+    return (sim_time - ref_sim_time_interp).round().tolist()
+
+
+def delays_f_time(
+    sim,
+    ref_sim,
+    eco_or_base: str = 'base',
+    resolution: float = 1.,
+) -> tuple[np.ndarray, np.ndarray]:
+    """Delays=f(time) between two simulations for all trains
+
+    Delays are sampled every resolution seconds from the first departure,
+    the last sample being the last arrival (rounded to the second), and
+    are 0 before the departure of each train.
+
+    Parameters
+    ----------
+    sim : OSRD
+        Delayed simulation
+    ref_sim : OSRD
+        Reference simulation
+    eco_or_base : str, optional
+        Simulation compared, by default 'base'
+    resolution : float, optional
+        Time step in seconds, by default 1.
+
+    Returns
+    -------
+    tuple[np.ndarray, np.ndarray]
+        Times (T,) and delays (T, number of trains), in seconds
+    """
+
+    tmin = min(sim.departure_times)
+    tmax = round(max(sim.last_arrival_times))
+    time = np.append(np.arange(tmin, tmax, resolution), tmax)
+
+    delays = np.zeros((len(time), len(sim.trains)))
+    for i, train in enumerate(sim.trains):
+        sim_time, sim_offset = _times_and_offsets(sim, train, eco_or_base).T
+        ref_sim_time, ref_sim_offset = \
+            _times_and_offsets(ref_sim, train, eco_or_base).T
+        delay = (
+            sim_time - np.interp(sim_offset, ref_sim_offset, ref_sim_time)
+        ).round()
+        delays[:, i] = np.where(
+            time > sim_time.min(),
+            np.interp(time, sim_time, delay),
+            0
+        )
+
+    return time, delays
@@ -1 +1,9 @@
-from .build import build_infra
+def __getattr__(name: str):
+    # railjson_generator is only imported to build infras
+    if name == 'build_infra':
+        from .build import build_infra
+        return build_infra
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+__all__ = ['build_infra']
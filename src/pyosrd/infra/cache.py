@@ -0,0 +1,160 @@
+"""Binary cache of parsed infra files
+
+The parsed infra is saved in marshal format, all its strings being
+interned so that each id is stored once, in the `infra` directory of the
+user cache (see `utils.cache_dir`) under the content hash of the json
+file, which is not recomputed while its size and modification time are
+unchanged. A cache file is only used if it was written by the same
+Python version. The least recently used cache files are removed once
+they exceed PYOSRD_INFRA_CACHE_SIZE bytes, by default 1 GB.
+"""
+import json
+import marshal
+import os
+import struct
+import sys
+import warnings
+
+from typing import Any
+
+from pyosrd.utils.cache_dir import cache_dir, cache_max_size, evict
+from pyosrd.utils.hashing import files_hash
+
+CACHE_VERSION = 2
+DEFAULT_MAX_SIZE = 1 << 30
+_HEADER_SIZE = struct.Struct('<Q')
+
+
+def _intern(obj: Any) -> Any:
+    if isinstance(obj, dict):
+        return {sys.intern(k): _intern(v) for k, v in obj.items()}
+    if isinstance(obj, list):
+        return [_intern(v) for v in obj]
+    if isinstance(obj, str):
+        return sys.intern(obj)
+    return obj
+
+
+def cache_path(
+    path: str,
+    directory: str,
+) -> str:
+    """Path of the cache of a json file in a cache directory"""
+
+    key = files_hash(path)
+    return os.path.join(directory, key[:2], key + '.cache')
+
+
+def _read_header(f) -> tuple[dict, int]:
+    size, = _HEADER_SIZE.unpack(f.read(_HEADER_SIZE.size))
+    return marshal.loads(f.read(size)), _HEADER_SIZE.size + size
+
+
+def write_cache(
+    path: str,
+    infra: dict[str, Any],
+    directory: str,
+) -> None:
+    """Save the binary cache of a parsed infra json file
+
+    Parameters
+    ----------
+    path : str
+        Path of the infra json file
+    infra : dict[str, Any]
+        Parsed infra
+    directory : str
+        Cache directory
+    """
+
+    header = marshal.dumps({
+        'version': CACHE_VERSION,
+        'python': tuple(sys.version_info[:2]),
+    })
+
+    cached = cache_path(path, directory)
+    os.makedirs(os.path.dirname(cached), exist_ok=True)
+    tmp_path = cached + f'.{os.getpid()}.tmp'
+    with open(tmp_path, 'wb') as f:
+        f.write(_HEADER_SIZE.pack(len(header)))
+        f.write(header)
+        f.write(marshal.dumps(_intern(infra)))
+    os.replace(tmp_path, cached)
+
+
+def _read_cache(
+    path: str,
+    directory: str,
+) -> dict[str, Any] | None:
+    """Cached infra of a json file, None if missing or not valid"""
+
+    cached = cache_path(path, directory)
+    try:
+        with open(cached, 'rb') as f:
+            header, _ = _read_header(f)
+            if (
+                header.get('version') != CACHE_VERSION
+                or header.get('python') != tuple(sys.version_info[:2])
+            ):
+                return None
+            infra = marshal.loads(f.read())
+        os.utime(cached)  # recently used, see evict()
+    except (OSError, ValueError, EOFError, TypeError, struct.error):
+        return None
+    return infra
+
+
+def load_infra(
+    path: str,
+    use_cache: bool = True,
+    directory: str | None = None,
+    max_size: int | None = None,
+) -> dict[str, Any]:
+    """Parsed infra json file, from its binary cache if valid
+
+    If the cache is missing or outdated, the json file is parsed and
+    the cache is written (with a warning if it cannot be), the least
+    recently used cache files being removed beyond max_size.
+
+    Parameters
+    ----------
+    path : str
+        Path of the infra json file
+    use_cache : bool, optional
+        If False, only parse the json file, by default True
+    directory : str | None, optional
+        Cache directory, by default `cache_dir('infra')` (no cache if
+        caches are disabled)
+    max_size : int | None, optional
+        Maximal size of the cache directory in bytes, by default
+        PYOSRD_INFRA_CACHE_SIZE or 1 GB
+
+    Returns
+    -------
+    dict[str, Any]
+        Infra, empty if the json file is not valid
+    """
+
+    if directory is None:
+        directory = cache_dir('infra')
+    use_cache = use_cache and directory is not None
+
+    if use_cache and (infra := _read_cache(path, directory)) is not None:
+        return infra
+
+    with open(path, 'rb') as f:
+        content = f.read()
+    try:
+        infra = json.loads(content)
+    except ValueError:  # JSONDecodeError inherits from ValueError
+        return {}
+
+    if use_cache:
+        if max_size is None:
+            max_size = cache_max_size('infra', DEFAULT_MAX_SIZE)
+        try:
+            write_cache(path, infra, directory)
+            evict(directory, max_size, '.cache')
+        except OSError as e:
+            warnings.warn(f"Infra cache not written in {directory}: {e}")
+    return infra
@@ -0,0 +1,127 @@
+"""Conversion of positions on track sections to geographic coordinates
+
+>>> geometry = sim.track_geometry()
+>>> geometry.coordinates(['T0', 'T1'], [120., 3000.])
+array([[lat0, lng0],
+       [lat1, lng1]])
+"""
+from typing import Sequence
+
+import numpy as np
+
+EARTH_RADIUS = 6371.0088 * 1_000  # meters, as in haversine
+
+
+def haversine_distances(
+    lng_lat_1: np.ndarray,
+    lng_lat_2: np.ndarray,
+) -> np.ndarray:
+    """Distances in meters between arrays of [lng, lat] points"""
+
+    lng1, lat1 = np.radians(lng_lat_1).T
+    lng2, lat2 = np.radians(lng_lat_2).T
+    d = (
+        np.sin((lat2 - lat1) / 2) ** 2
+        + np.cos(lat1) * np.cos(lat2) * np.sin((lng2 - lng1) / 2) ** 2
+    )
+    return 2 * EARTH_RADIUS * np.arcsin(np.sqrt(d))
+
+
+class TrackGeometry:
+    """Geometries of the track sections with their cumulative arc lengths
+
+    Positions along a track section are mapped to its polyline
+    proportionally to the arc lengths (rounded to the cm for each segment),
+    so that position 0 is the first point and the length of the track
+    section is the last one.
+
+    Parameters
+    ----------
+    infra : dict
+        RailJSON infra
+    """
+
+    def __init__(self, infra: dict):
+
+        tracks = infra['track_sections']
+        self.index = {track['id']: i for i, track in enumerate(tracks)}
+        self.lengths = np.array([track['length'] for track in tracks])
+
+        geometries = [track['geo']['coordinates'] for track in tracks]
+        self.offsets = np.cumsum([0] + [len(g) for g in geometries])
+        self.coords = np.array(
+            [point for g in geometries for point in g],
+            dtype=float,
+        ).reshape(-1, 2)  # [lng, lat]
+
+        owners = np.repeat(np.arange(len(tracks)), np.diff(self.offsets))
+        segments = np.round(
+            haversine_distances(self.coords[:-1], self.coords[1:]),
+            2
+        )
+        segments[owners[1:] != owners[:-1]] = 0.  # between two tracks
+        arc_lengths = np.concatenate([[0.], np.cumsum(segments)])
+        arc_lengths -= arc_lengths[self.offsets[:-1]][owners]
+        self.arc_lengths = arc_lengths
+
+        totals = arc_lengths[self.offsets[1:] - 1]
+        fractions = np.divide(
+            arc_lengths,
+            totals[owners],
+            out=np.zeros_like(arc_lengths),
+            where=totals[owners] > 0,
+        )
+        # Track i spans [2i, 2i+1] so that all tracks can be interpolated
+        # in a single call
+        self._keys = 2 * owners + fractions
+        self._max_fractions = fractions[self.offsets[1:] - 1]
+
+    def track_arc_lengths(self, track_section: str) -> np.ndarray:
+        """Cumulative arc lengths (m) of the points of a track section"""
+        i = self.index[track_section]
+        return self.arc_lengths[self.offsets[i]:self.offsets[i+1]]
+
+    def coordinates(
+        self,
+        track_sections: Sequence[str],
+        positions: Sequence[float],
+    ) -> np.ndarray:
+        """[lat, lng] of positions on track sections
+
+        Parameters
+        ----------
+        track_sections : Sequence[str]
+            Track section of each position
+        positions : Sequence[float]
+            Positions (m) from the beginning of the track sections
+
+        Returns
+        -------
+        np.ndarray
+            (N, 2) array of [lat, lng]
+        """
+
+        if len(track_sections) == 0:
+            return np.empty((0, 2))
+        indices = np.array([self.index[t] for t in track_sections])
+        fractions = np.clip(
+            np.asarray(positions, dtype=float) / self.lengths[indices],
+            0,
+            self._max_fractions[indices]
+        )
+        keys = 2 * indices + fractions
+        return np.column_stack([
+            np.interp(keys, self._keys, self.coords[:, 1]),
+            np.interp(keys, self._keys, self.coords[:, 0]),
+        ])
+
+
+def track_geometry(
+    self,
+) -> TrackGeometry:
+    """Geometry of the track sections, built once per infra"""
+
+    cached = getattr(self, '_track_geometry', None)
+    if cached is None or cached[0] is not self.infra:
+        self._track_geometry = (self.infra, TrackGeometry(self.infra))
+    return self._track_geometry[1]
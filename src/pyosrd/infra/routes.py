@@ -0,0 +1,239 @@
+from typing import Any, Iterable
+
+from pyosrd.infra.stream import iter_section, iter_sections
+
+SWITCH_EXIT = {
+    'link': {'STATIC': {'A': 'B', 'B': 'A'}},
+    'point_switch': {
+        'A_B1': {'A': 'B1', 'B1': 'A'},
+        'A_B2': {'A': 'B2', 'B2': 'A'},
+    },
+    'crossing': {
+        'STATIC': {
+            'A1': 'B1', 'B1': 'A1',
+            'A2': 'B2', 'B2': 'A2',
+        }
+    },
+    'double_slip_switch': {
+        'A1_B1': {'A1': 'B1', 'B1': 'A1'},
+        'A1_B2': {'A1': 'B2', 'B2': 'A1'},
+        'A2_B1': {'A2': 'B1', 'B1': 'A2'},
+        'A2_B2': {'A2': 'B2', 'B2': 'A2'},
+    }
+}
+
+
+def _expand_route(
+    route: dict[str, Any],
+    waypoints: dict[str, dict],
+    switches_ports: dict[str, dict],
+) -> list[dict[str, str]]:
+    """Track sections (id and direction) crossed by a route
+
+    Raises
+    ------
+    ValueError
+        If a waypoint or a switch of the route is not found
+    """
+
+    for point in ['entry_point', 'exit_point']:
+        if route[point]['id'] not in waypoints:
+            raise ValueError(f"waypoint {route[point]['id']} not found")
+    entry = waypoints[route['entry_point']['id']]
+    curr_track = entry['track']
+
+    if not route['switches_directions']:
+        exit = waypoints[route['exit_point']['id']]
+        if entry['position'] < exit['position']:
+            direction = 'START_TO_STOP'
+        else:
+            direction = 'STOP_TO_START'
+        return [{'id': curr_track, 'direction': direction}]
+
+    not_visited = set(route['switches_directions'].keys())
+    track_sections = []
+
+    while not_visited:
+        sw, entry_port = next(
+            (
+                switch_port
+                for sw_id, switch_port in
+                switches_ports.get(curr_track, {}).items()
+                if sw_id in not_visited
+            ),
+            (None, None)
+        )
+        if sw is None:
+            raise ValueError(
+                f"none of the switches {', '.join(sorted(not_visited))} "
+                f"is connected to track section {curr_track}"
+            )
+        sw_id = sw['id']
+        switch_direction = route['switches_directions'][sw_id]
+        exits = SWITCH_EXIT.get(sw['switch_type'], {}).get(switch_direction)
+        if exits is None or entry_port not in exits:
+            raise ValueError(
+                f"switch {sw_id} ({sw['switch_type']}) has no exit "
+                f"from port {entry_port} in direction {switch_direction}"
+            )
+        if not track_sections:
+            direction = (
+                'START_TO_STOP'
+                if sw['ports'][entry_port]['endpoint'] == 'END'
+                else 'STOP_TO_START'
+            )
+            track_sections.append({'id': curr_track, 'direction': direction})
+        exit_port = exits[entry_port]
+        direction = (
+            'START_TO_STOP'
+            if sw['ports'][exit_port]['endpoint'] == 'BEGIN'
+            else 'STOP_TO_START'
+        )
+        curr_track = sw['ports'][exit_port]['track']
+        track_sections.append({'id': curr_track, 'direction': direction})
+        not_visited.remove(sw_id)
+
+    return track_sections
+
+
+def infra_indexes(
+    infra: dict[str, Any],
+) -> dict[str, dict]:
+    """Lookups of an infra, computed once and shared by the methods
+    reconstructing paths, splitting infras, etc.
+
+    Parameters
+    ----------
+    infra : dict[str, Any]
+        RailJSON infra
+
+    Returns
+    -------
+    dict[str, dict]
+        Dict with keys
+        'waypoints_tracks': track of each detector and buffer stop,
+        'switches_ports': for each track, the switches and ports connected
+        to it (dict {switch_id: (switch, port)}, in infra order),
+        'routes': for each route that can be walked through its switches,
+        dict with keys 'track_sections' (list of dicts with keys 'id' and
+        'direction', in the route order) and 'offsets' (distance from the
+        beginning of the first track section to the beginning of each
+        track section, in the route direction),
+        'invalid_routes': for each other route, the reason why it cannot
+        be walked (see `route_index`)
+    """
+
+    return _infra_indexes(
+        {
+            p['id']: p
+            for p in (
+                infra.get('detectors', []) + infra.get('buffer_stops', [])
+            )
+        },
+        infra.get('switches', []),
+        {t['id']: t['length'] for t in infra.get('track_sections', [])},
+        infra.get('routes', []),
+    )
+
+
+def read_infra_indexes(
+    path: str,
+) -> dict[str, dict]:
+    """`infra_indexes` of a RailJSON file, built from its sections read
+    item by item: only the waypoints, switches and track sections lengths
+    are held in memory, not the track sections nor the routes
+
+    Parameters
+    ----------
+    path : str
+        Path of the RailJSON file
+
+    Returns
+    -------
+    dict[str, dict]
+        Same as `infra_indexes` of the whole infra
+    """
+
+    waypoints = dict()
+    switches = []
+    lengths = dict()
+    for section, item in iter_sections(
+        path,
+        ['detectors', 'buffer_stops', 'switches', 'track_sections'],
+    ):
+        if section == 'track_sections':
+            lengths[item['id']] = item['length']
+        elif section == 'switches':
+            switches.append(item)
+        else:
+            waypoints[item['id']] = item
+
+    return _infra_indexes(
+        waypoints,
+        switches,
+        lengths,
+        iter_section(path, 'routes'),
+    )
+
+
+def _infra_indexes(
+    waypoints: dict[str, dict],
+    switches: list[dict],
+    lengths: dict[str, float],
+    routes: Iterable[dict],
+) -> dict[str, dict]:
+
+    switches_ports = dict()
+    for switch in switches:
+        for port, details in switch['ports'].items():
+            switches_ports.setdefault(details['track'], dict())
+            switches_ports[details['track']].setdefault(
+                switch['id'],
+                (switch, port)
+            )
+
+    routes_tracks = dict()
+    invalid_routes = dict()
+    for route in routes:
+        try:
+            track_sections = _expand_route(route, waypoints, switches_ports)
+        except ValueError as e:
+            invalid_routes[route['id']] = str(e)
+            continue
+        offsets = [0.]
+        for track in track_sections[:-1]:
+            offsets.append(offsets[-1] + lengths.get(track['id'], 0.))
+        routes_tracks[route['id']] = {
+            'track_sections': track_sections,
+            'offsets': offsets,
+        }
+
+    return {
+        'waypoints_tracks': {id: p['track'] for id, p in waypoints.items()},
+        'switches_ports': switches_ports,
+        'routes': routes_tracks,
+        'invalid_routes': invalid_routes,
+    }
+
+
+def route_index(
+    indexes: dict[str, dict],
+    route_id: str,
+) -> dict[str, list]:
+    """Track sections and offsets of a route in `infra_indexes()`
+
+    Raises
+    ------
+    ValueError
+        If the route is not in the infra or cannot be walked through its
+        switches, with the reason
+    """
+
+    try:
+        return indexes['routes'][route_id]
+    except KeyError:
+        reason = indexes['invalid_routes'].get(route_id, 'not in the infra')
+        raise ValueError(
+            f"Route {route_id} cannot be expanded into track sections: "
+            f"{reason}"
+        ) from None
@@ -0,0 +1,367 @@
+"""Spatial index of the track sections geometries
+
+Track sections bounding boxes are registered in a uniform grid, so that
+rectangle, polygon and radius queries only test the track sections
+lying in the cells they cover.
+
+>>> index = sim.spatial_index()
+>>> index.rectangle(48.8, 48.9, 2.3, 2.4)
+>>> index.radius(48.85, 2.35, 1000)
+>>> index.polygon([(48.8, 2.3), (48.9, 2.3), (48.85, 2.4)])
+"""
+import os
+import warnings
+
+import numpy as np
+
+from pyosrd.infra.stream import iter_section
+from pyosrd.utils.cache_dir import cache_dir, cache_max_size, evict
+from pyosrd.utils.hashing import files_hash
+
+EARTH_RADIUS = 6_371_008.8  # meters
+DEFAULT_CACHE_SIZE = 256 << 20
+
+
+class SpatialIndex:
+    """Uniform grid over the bounding boxes of track sections
+
+    Coordinates are stored as in RailJSON geometries ([lng, lat]),
+    queries take latitudes and longitudes.
+
+    Parameters
+    ----------
+    ids : list[str]
+        Track sections ids
+    coordinates : np.ndarray
+        (M, 2) array of the [lng, lat] points of all track sections
+    offsets : np.ndarray
+        (N + 1,) array, the points of the i-th track section being
+        coordinates[offsets[i]:offsets[i+1]]
+    cell_size : float | None, optional
+        Size of the grid cells in degrees, by default the extent of the
+        infra divided by the square root of the number of track sections
+    """
+
+    def __init__(
+        self,
+        ids: list[str],
+        coordinates: np.ndarray,
+        offsets: np.ndarray,
+        cell_size: float | None = None,
+    ):
+        self.ids = list(ids)
+        self.coordinates = np.asarray(coordinates, dtype=float)
+        self.offsets = np.asarray(offsets, dtype=int)
+
+        starts = self.offsets[:-1]
+        self.bboxes = np.column_stack([
+            np.minimum.reduceat(self.coordinates, starts),
+            np.maximum.reduceat(self.coordinates, starts),
+        ])  # min_lng, min_lat, max_lng, max_lat
+
+        self.origin = self.bboxes[:, :2].min(axis=0)
+        if cell_size is None:
+            extent = (self.bboxes[:, 2:].max(axis=0) - self.origin).max()
+            cell_size = extent / np.sqrt(len(self.ids)) or 1.
+        self.cell_size = float(cell_size)
+
+        # Register each track section in all the cells covered by its bbox
+        cells_min = self._cells(self.bboxes[:, :2])
+        cells_max = self._cells(self.bboxes[:, 2:])
+        self.num_rows = int(cells_max[:, 1].max()) + 1
+        counts = np.prod(cells_max - cells_min + 1, axis=1)
+        tracks = np.repeat(np.arange(len(self.ids)), counts)
+        rank = np.arange(counts.sum()) - np.repeat(
+            np.cumsum(counts) - counts,
+            counts
+        )
+        heights = (cells_max - cells_min + 1)[tracks, 1]
+        columns = cells_min[tracks, 0] + rank // heights
+        rows = cells_min[tracks, 1] + rank % heights
+        keys = columns * self.num_rows + rows
+        order = np.argsort(keys, kind='stable')
+        self.cell_keys = keys[order]
+        self.cell_tracks = tracks[order]
+
+    @classmethod
+    def from_infra(
+        cls,
+        infra: dict,
+        cell_size: float | None = None,
+    ) -> "SpatialIndex":
+        """Index the track sections of a RailJSON infra"""
+        geometries = [
+            track['geo']['coordinates'] for track in infra['track_sections']
+        ]
+        return cls(
+            ids=[track['id'] for track in infra['track_sections']],
+            coordinates=np.concatenate(geometries),
+            offsets=np.cumsum([0] + [len(g) for g in geometries]),
+            cell_size=cell_size,
+        )
+
+    @classmethod
+    def from_file(
+        cls,
+        path: str,
+        cell_size: float | None = None,
+    ) -> "SpatialIndex":
+        """Index the track sections of a RailJSON file
+
+        Track sections are read one by one, only their ids and geometries
+        being kept in memory.
+        """
+        ids, geometries = [], []
+        for track in iter_section(path, 'track_sections'):
+            ids.append(track['id'])
+            geometries.append(track['geo']['coordinates'])
+        return cls(
+            ids=ids,
+            coordinates=np.concatenate(geometries),
+            offsets=np.cumsum([0] + [len(g) for g in geometries]),
+            cell_size=cell_size,
+        )
+
+    def save(self, path: str) -> None:
+        """Save the index in numpy .npz format"""
+        np.savez_compressed(
+            path,
+            ids=np.array(self.ids),
+            coordinates=self.coordinates,
+            offsets=self.offsets,
+            cell_size=self.cell_size,
+        )
+
+    @classmethod
+    def load(cls, path: str) -> "SpatialIndex":
+        """Load an index saved with `save`"""
+        with np.load(path) as data:
+            return cls(
+                ids=data['ids'].tolist(),
+                coordinates=data['coordinates'],
+                offsets=data['offsets'],
+                cell_size=data['cell_size'].item(),
+            )
+
+    def _cells(self, points: np.ndarray) -> np.ndarray:
+        return np.maximum(
+            np.floor((points - self.origin) / self.cell_size),
+            0
+        ).astype(int)
+
+    def _candidates(
+        self,
+        min_lng: float,
+        min_lat: float,
+        max_lng: float,
+        max_lat: float,
+    ) -> np.ndarray:
+        """Indices of the track sections whose bbox intersects the box"""
+
+        (col_min, row_min), (col_max, row_max) = self._cells(
+            np.array([[min_lng, min_lat], [max_lng, max_lat]])
+        )
+        row_max = min(row_max, self.num_rows - 1)
+        if row_min > row_max:
+            return np.array([], dtype=int)
+
+        columns = np.arange(col_min, col_max + 1) * self.num_rows
+        lefts = np.searchsorted(self.cell_keys, columns + row_min)
+        rights = np.searchsorted(self.cell_keys, columns + row_max, 'right')
+        candidates = np.unique(np.concatenate([
+            self.cell_tracks[left:right]
+            for left, right in zip(lefts, rights)
+        ]))
+
+        bboxes = self.bboxes[candidates]
+        return candidates[
+            (bboxes[:, 0] <= max_lng) & (bboxes[:, 2] >= min_lng)
+            & (bboxes[:, 1] <= max_lat) & (bboxes[:, 3] >= min_lat)
+        ]
+
+    def _segments(
+        self,
+        tracks: np.ndarray,
+    ) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Start points, end points and track of the segments of tracks"""
+        points = [
+            np.arange(self.offsets[t], self.offsets[t+1]) for t in tracks
+        ]
+        starts = np.concatenate([p[:-1] for p in points] + [[]]).astype(int)
+        ends = starts + 1
+        owners = np.repeat(tracks, [max(len(p) - 1, 0) for p in points])
+        return self.coordinates[starts], self.coordinates[ends], owners
+
+    def rectangle(
+        self,
+        min_lat: float,
+        max_lat: float,
+        min_lng: float,
+        max_lng: float,
+    ) -> list[str]:
+        """Track sections whose bounding box intersects the rectangle"""
+        return [
+            self.ids[i]
+            for i in self._candidates(min_lng, min_lat, max_lng, max_lat)
+        ]
+
+    def radius(
+        self,
+        lat: float,
+        lng: float,
+        radius: float,
+    ) -> list[str]:
+        """Track sections closer than radius (in meters) to a point"""
+
+        dlat = np.degrees(radius / EARTH_RADIUS)
+        dlng = dlat / max(np.cos(np.radians(lat)), 1e-12)
+        candidates = self._candidates(
+            lng - dlng, lat - dlat, lng + dlng, lat + dlat
+        )
+
+        # Equirectangular projection around the point, in meters
+        scale = np.radians(1) * EARTH_RADIUS * np.array(
+            [np.cos(np.radians(lat)), 1.]
+        )
+        a, b, owners = self._segments(candidates)
+        a = (a - [lng, lat]) * scale
+        b = (b - [lng, lat]) * scale
+        ab = b - a
+        length2 = (ab**2).sum(axis=1)
+        t = np.clip(
+            -(a * ab).sum(axis=1) / np.where(length2 > 0, length2, 1),
+            0,
+            1
+        )
+        distances = np.linalg.norm(a + t[:, None] * ab, axis=1)
+
+        single_points = candidates[np.diff(self.offsets)[candidates] == 1]
+        distances_points = np.linalg.norm(
+            (self.coordinates[self.offsets[single_points]] - [lng, lat])
+            * scale,
+            axis=1
+        )
+
+        close = set(owners[distances <= radius])
+        close |= set(single_points[distances_points <= radius])
+        return [self.ids[i] for i in candidates if i in close]
+
+    def polygon(
+        self,
+        points: list[tuple[float, float]],
+    ) -> list[str]:
+        """Track sections intersecting a polygon given as (lat, lng) points
+        """
+
+        polygon = np.asarray(points, dtype=float)[:, ::-1]
+        candidates = self._candidates(
+            *polygon.min(axis=0), *polygon.max(axis=0)
+        )
+
+        # Track sections having a point inside the polygon (ray casting)
+        coordinates = [
+            self.coordinates[self.offsets[i]:self.offsets[i+1]]
+            for i in candidates
+        ]
+        vertices = np.concatenate(coordinates + [np.empty((0, 2))])
+        owners = np.repeat(candidates, [len(c) for c in coordinates])
+        p1, p2 = polygon, np.roll(polygon, -1, axis=0)
+        x, y = vertices[:, :1], vertices[:, 1:]
+        crosses = (
+            ((p1[:, 1] > y) != (p2[:, 1] > y))
+            & (
+                x < (p2[:, 0] - p1[:, 0]) * (y - p1[:, 1])
+                / np.where(p2[:, 1] != p1[:, 1], p2[:, 1] - p1[:, 1], 1)
+                + p1[:, 0]
+            )
+        )
+        inside = set(owners[crosses.sum(axis=1) % 2 == 1])
+
+        # Track sections crossing an edge of the polygon
+        a, b, owners = self._segments(candidates)
+
+        def orientation(p, q, r):
+            return np.sign(
+                (q[..., 0] - p[..., 0]) * (r[..., 1] - p[..., 1])
+                - (q[..., 1] - p[..., 1]) * (r[..., 0] - p[..., 0])
+            )
+
+        a, b = a[:, None], b[:, None]
+        intersect = (
+            (orientation(a, b, p1) != orientation(a, b, p2))
+            & (orientation(p1, p2, a) != orientation(p1, p2, b))
+        ).any(axis=1)
+        inside |= set(owners[intersect])
+
+        return [self.ids[i] for i in candidates if i in inside]
+
+
+def spatial_index(
+    self,
+    cell_size: float | None = None,
+) -> SpatialIndex:
+    """Spatial index of the track sections, cached per infra content
+
+    The index is kept on the instance for its infra and saved in the
+    `spatial_index` directory of the user cache (see `utils.cache_dir`)
+    under the content hash of the infra file, from where it is loaded by
+    later instances. The least recently used saved indexes are removed
+    once they exceed PYOSRD_SPATIAL_INDEX_CACHE_SIZE bytes, by default
+    256 MB.
+
+    Parameters
+    ----------
+    cell_size : float | None, optional
+        Size of the grid cells in degrees, by default chosen
+        from the extent and size of the infra
+
+    Returns
+    -------
+    SpatialIndex
+        Index of the track sections
+    """
+
+    cached = getattr(self, '_spatial_index', None)
+    if (
+        cached is not None
+        and cached[0] is self.infra
+        and cell_size in [None, cached[1].cell_size]
+    ):
+        return cached[1]
+
+    infra_path = os.path.join(self.dir, self.infra_json)
+    directory = cache_dir('spatial_index')
+    path = None
+    if cell_size is None and directory is not None and os.path.exists(
+        infra_path
+    ):
+        path = os.path.join(directory, files_hash(infra_path) + '.npz')
+
+    index = None
+    if path is not None and os.path.exists(path):
+        index = SpatialIndex.load(path)
+        os.utime(path)  # recently used, see evict()
+        if index.ids != [t['id'] for t in self.infra['track_sections']]:
+            index = None
+
+    if index is None:
+        index = SpatialIndex.from_infra(self.infra, cell_size)
+        if path is not None:
+            try:
+                os.makedirs(directory, exist_ok=True)
+                tmp_path = path + f'.{os.getpid()}.tmp'
+                with open(tmp_path, 'wb') as f:
+                    index.save(f)
+                os.replace(tmp_path, path)
+                evict(
+                    directory,
+                    cache_max_size('spatial_index', DEFAULT_CACHE_SIZE),
+                    '.npz',
+                )
+            except OSError as e:
+                warnings.warn(
+                    f"Spatial index not written in {directory}: {e}"
+                )
+
+    self._spatial_index = (self.infra, index)
+    return index
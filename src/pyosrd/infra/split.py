@@ -3,6 +3,8 @@ import json
 import os
 import shutil
 
+from concurrent.futures import ProcessPoolExecutor
+from types import SimpleNamespace
 from typing import Any
 
 from railjson_generator import InfraBuilder
@@ -11,6 +13,11 @@ from railjson_generator.schema.infra.direction import Direction
 from railjson_generator.schema.infra.infra import Infra
 
 from pyosrd import OSRD
+from pyosrd.infra.routes import (  # noqa: F401
+    SWITCH_EXIT,
+    infra_indexes,
+    route_index,
+)
 
 SWITCHES_TYPES_DIRECTIONS = {
     'link': ['STATIC'],
@@ -19,25 +26,13 @@ SWITCHES_TYPES_DIRECTIONS = {
     'double_slip_switch': ['A1_B1', 'A1_B2', 'A2_B1', 'A2_B2'],
 }
 
-SWITCH_EXIT = {
-    'link': {'STATIC': {'A': 'B', 'B': 'A'}},
-    'point_switch': {
-        'A_B1': {'A': 'B1', 'B1': 'A'},
-        'A_B2': {'A': 'B2', 'B2': 'A'},
-    },
-    'crossing': {
-        'STATIC': {
-            'A1': 'B1', 'B1': 'A1',
-            'A2': 'B2', 'B2': 'A2',
-        }
-    },
-    'double_slip_switch': {
-        'A1_B1': {'A1': 'B1', 'B1': 'A1'},
-        'A1_B2': {'A1': 'B2', 'B2': 'A1'},
-        'A2_B1': {'A2': 'B1', 'B1': 'A2'},
-        'A2_B2': {'A2': 'B2', 'B2': 'A2'},
+
+def _copy_route(route: dict) -> dict:
+    """Copy of a route, only its nested points being copied"""
+    return route | {
+        'entry_point': dict(route['entry_point']),
+        'exit_point': dict(route['exit_point']),
     }
-}
 
 
 def generate_updated_routes(
@@ -47,30 +42,30 @@ def generate_updated_routes(
       modified_switches: dict[str, dict],
 ) -> list:
 
-    detectors = [d['id'] for d in splitted_infra['detectors']]
-    buffer_stops = [d['id'] for d in splitted_infra['buffer_stops']]
+    detectors = {d['id'] for d in splitted_infra['detectors']}
+    buffer_stops = {d['id']: d for d in splitted_infra['buffer_stops']}
     switches = {s['id']: s['switch_type'] for s in splitted_infra['switches']}
-    waypoints = detectors + buffer_stops
+    waypoints = detectors | buffer_stops.keys()
+
+    def updated_switches_directions(route: dict) -> dict[str, str]:
+        return {
+            sw: modified_switches[sw][dir] if sw in modified_switches else dir
+            for sw, dir in route['switches_directions'].items()
+            if sw in switches
+        }
+
+    def updated_release_detectors(route: dict) -> list[str]:
+        return [d for d in route['release_detectors'] if d in detectors]
 
     updated_routes = []
     for route in original_infra['routes']:
         entry = route['entry_point']['id']
         exit = route['exit_point']['id']
         if entry in waypoints and exit in waypoints:
-            new_route = copy.deepcopy(route)
-            release_detectors = [
-                d for d in route['release_detectors']
-                if d in detectors
-            ]
-            new_route['release_detectors'] = release_detectors
-            switches_directions = {}
-            for sw, dir in route['switches_directions'].items():
-                if sw in switches:
-                    if sw in modified_switches:
-                        switches_directions[sw] = modified_switches[sw][dir]
-                    else:
-                        switches_directions[sw] = dir
-            new_route['switches_directions'] = switches_directions
+            new_route = _copy_route(route)
+            new_route['release_detectors'] = updated_release_detectors(route)
+            new_route['switches_directions'] =\
+                updated_switches_directions(route)
             updated_routes.append(new_route)
         if entry in waypoints and exit not in waypoints:
             replaced = [
@@ -78,33 +73,19 @@ def generate_updated_routes(
                 if switch_id in switches_to_buffer_stops
             ]
             if replaced:
-                new_route = copy.deepcopy(route)
                 port =\
                     route['switches_directions'][replaced[0]].replace('A_', '')
                 if port in switches_to_buffer_stops[replaced[0]]:
+                    new_route = _copy_route(route)
                     bs = switches_to_buffer_stops[replaced[0]][port]
                     exit_point = {'type': 'BufferStop', 'id': bs}
                     new_route['exit_point'] = exit_point
                     new_route['id'] = route['id'].replace(exit, bs)
-                    switches_directions = {}
-                    for sw, dir in route['switches_directions'].items():
-                        if sw in switches:
-                            if sw in modified_switches:
-                                switches_directions[sw] =\
-                                    modified_switches[sw][dir]
-                            else:
-                                switches_directions[sw] = dir
-                    new_route['switches_directions'] = switches_directions
-                    release_detectors = [
-                        d for d in route['release_detectors']
-                        if d in detectors
-                    ]
-                    new_route['release_detectors'] = release_detectors
-                    buffer_stop_exit = next(
-                        b for b in splitted_infra['buffer_stops']
-                        if b['id'] == bs
-                    )
-                    if buffer_stop_exit['position'] != 0:
+                    new_route['switches_directions'] =\
+                        updated_switches_directions(route)
+                    new_route['release_detectors'] =\
+                        updated_release_detectors(route)
+                    if buffer_stops[bs]['position'] != 0:
                         new_route['entry_point_direction'] = "START_TO_STOP"
                     else:
                         new_route['entry_point_direction'] = "STOP_TO_START"
@@ -123,13 +104,12 @@ def generate_updated_routes(
             ]
 
             if replaced:
-                new_route = copy.deepcopy(route)
                 port = (
                     route['switches_directions'][replaced[-1]]
                     .replace('A_', '')
                 )
                 if port in switches_to_buffer_stops[replaced[-1]]:
-
+                    new_route = _copy_route(route)
                     bs = switches_to_buffer_stops[replaced[-1]][port]
                     entry_point = {
                         'type': 'BufferStop',
@@ -137,28 +117,14 @@ def generate_updated_routes(
                     }
                     new_route['entry_point'] = entry_point
                     new_route['id'] = route['id'].replace(entry, bs)
-                    switches_directions = {}
-                    for sw, dir in route['switches_directions'].items():
-                        if sw in switches:
-                            if sw in modified_switches:
-                                switches_directions[sw] =\
-                                    modified_switches[sw][dir]
-                            else:
-                                switches_directions[sw] = dir
-                    new_route['switches_directions'] = switches_directions
-                    release_detectors = [
-                        d for d in route['release_detectors']
-                        if d in detectors
-                    ]
-                    buffer_stop_entry = next(
-                        b for b in splitted_infra['buffer_stops']
-                        if b['id'] == bs
-                    )
-                    if buffer_stop_entry['position'] == 0:
+                    new_route['switches_directions'] =\
+                        updated_switches_directions(route)
+                    if buffer_stops[bs]['position'] == 0:
                         new_route['entry_point_direction'] = "START_TO_STOP"
                     else:
                         new_route['entry_point_direction'] = "STOP_TO_START"
-                    new_route['release_detectors'] = release_detectors
+                    new_route['release_detectors'] =\
+                        updated_release_detectors(route)
 
                     if not (
                         new_route['entry_point']['type']
@@ -188,12 +154,70 @@ def build(self: InfraBuilder, progressive_release: bool = True) -> Infra:
     return self.infra
 
 
+def _missing_track_ids(
+    infra: dict[str, Any],
+    track_section_ids: set[str],
+    indexes: dict[str, dict] | None = None,
+) -> set[str]:
+    """Track sections crossed by the routes between the kept waypoints
+
+    Parameters
+    ----------
+    infra : dict[str, Any]
+        RailJSON infra
+    track_section_ids : set[str]
+        Kept track sections
+    indexes : dict[str, dict] | None, optional
+        Lookups given by `infra.routes.infra_indexes(infra)`,
+        by default computed
+
+    Returns
+    -------
+    set[str]
+        Track sections not in track_section_ids but needed to complete
+        the routes whose entry and exit points are on kept track sections
+
+    Raises
+    ------
+    ValueError
+        If one of these routes cannot be walked through its switches
+    """
+
+    if indexes is None:
+        indexes = infra_indexes(infra)
+    waypoints_tracks = indexes['waypoints_tracks']
+
+    waypoints = {
+        id
+        for id, track in waypoints_tracks.items()
+        if track in track_section_ids
+    }
+
+    missing_track_ids = set()
+
+    for route in infra['routes']:
+        if (
+            route['entry_point']['id'] in waypoints
+            and
+            route['exit_point']['id'] in waypoints
+        ):
+            missing_track_ids |= {
+                track['id']
+                for track in
+                route_index(indexes, route['id'])['track_sections']
+                if track['id'] not in track_section_ids
+            }
+
+    return missing_track_ids
+
+
 def filter_by_track_section_ids(
     # infra: dict[str, Any],
     sim,
     track_section_ids: list[str],
     dir: str | None = None,
-    route_updates: bool = True
+    route_updates: bool = True,
+    indexes: dict[str, dict] | None = None,
 ) -> OSRD:
 
     if dir is None:
@@ -203,62 +227,12 @@ def filter_by_track_section_ids(
     new_sim = OSRD(dir=dir)
     os.makedirs(dir, exist_ok=True)
 
-    # Detect missing tracks to complete the routes
-
-    detector_ids = [
-        detector['id']
-        for detector in sim.infra['detectors']
-        if detector['track'] in track_section_ids
-    ]
-
-    buffer_stop_ids = [
-        buffer_stop['id']
-        for buffer_stop in sim.infra['buffer_stops']
-        if buffer_stop['track'] in track_section_ids
-    ]
-
-    missing_track_ids = set()
-
-    SWITCHES_TRACKS = {
-        s['id']: [e['track'] for e in s['ports'].values()]
-        for s in sim.infra['switches']
-    }
-
-    for route in sim.infra['routes']:
-        if (
-            route['entry_point']['id'] in detector_ids+buffer_stop_ids
-            and
-            route['exit_point']['id'] in detector_ids+buffer_stop_ids
-        ):
-            not_visited = set(route['switches_directions'].keys())
-
-            curr_track = next(
-                p['track']
-                for p in sim.infra['detectors'] + sim.infra['buffer_stops']
-                if p['id'] == route['entry_point']['id']
-            )
-            while not_visited:
-                sw = next(
-                    switch
-                    for switch in sim.infra['switches']
-                    if curr_track in SWITCHES_TRACKS[switch['id']]
-                    and switch['id'] in not_visited
-                )
-                sw_id = sw['id']
-                entry_port = next(
-                    p
-                    for p, details in sw['ports'].items()
-                    if details['track'] == curr_track
-                )
-                direction = route['switches_directions'][sw_id]
-                exit_port =\
-                    SWITCH_EXIT[sw['switch_type']][direction][entry_port]
-                curr_track = sw['ports'][exit_port]['track']
-                not_visited.remove(sw_id)
-                if curr_track not in track_section_ids:
-                    missing_track_ids.add(curr_track)
-
-    track_section_ids += list(missing_track_ids)
+    track_section_ids = set(track_section_ids)
+    track_section_ids |= _missing_track_ids(
+        sim.infra,
+        track_section_ids,
+        indexes,
+    )
 
     # Use an InfraBuilder to build a new infra restricted
     # to the track_section_ids
@@ -572,7 +546,7 @@ def filter_by_track_section_ids(
     ]
 
     # Update the new infra to add detectors/buffer stops/ signals extensions
-    detector_ids = [detector['id'] for detector in subinfra['detectors']]
+    detector_ids = {detector['id'] for detector in subinfra['detectors']}
     detectors = [
         detector
         for detector in sim.infra['detectors']
@@ -580,8 +554,8 @@ def filter_by_track_section_ids(
     ]
     subinfra['detectors'] = detectors
 
-    buffer_stop_ids = [bs['id'] for bs in subinfra['buffer_stops']]
-    buffer_stop_ids_original = [bs['id'] for bs in sim.infra['buffer_stops']]
+    buffer_stop_ids = {bs['id'] for bs in subinfra['buffer_stops']}
+    buffer_stop_ids_original = {bs['id'] for bs in sim.infra['buffer_stops']}
     buffer_stops = [
         buffer_stop
         for buffer_stop in sim.infra['buffer_stops']
@@ -593,7 +567,7 @@ def filter_by_track_section_ids(
     ]  # buffer stops created to replace switches
     subinfra['buffer_stops'] = buffer_stops
 
-    signal_ids = [signal['id'] for signal in subinfra['signals']]
+    signal_ids = {signal['id'] for signal in subinfra['signals']}
     signals = [
         signal
         for signal in sim.infra['signals']
@@ -631,8 +605,9 @@ def filter_by_track_section_ids(
             if track_range['track'] in track_section_ids
         ]
         if track_ranges:
-            speed_section['track_ranges'] = track_ranges
-            subinfra['speed_sections'].append(speed_section)
+            subinfra['speed_sections'].append(
+                speed_section | {'track_ranges': track_ranges}
+            )
 
     # electrifications
     subinfra['electrifications'] = []
@@ -643,8 +618,9 @@ def filter_by_track_section_ids(
             if track_range['track'] in track_section_ids
         ]
         if track_ranges:
-            electrification['track_ranges'] = track_ranges
-            subinfra['electrifications'].append(electrification)
+            subinfra['electrifications'].append(
+                electrification | {'track_ranges': track_ranges}
+            )
 
     # # neutral_sections
     subinfra['neutral_sections'] = []
@@ -655,8 +631,9 @@ def filter_by_track_section_ids(
             if track_range['track'] in track_section_ids
         ]
         if track_ranges:
-            neutral_section['track_ranges'] = track_ranges
-            subinfra['neutral_sections'].append(neutral_section)
+            subinfra['neutral_sections'].append(
+                neutral_section | {'track_ranges': track_ranges}
+            )
 
     # Save new infra
     new_sim.infra = subinfra
@@ -692,21 +669,149 @@ def filter_by_latlng(
     dir: str | None = None,
 ) -> dict[str, Any]:
 
-    box = [min_lat, min_lng, max_lat, max_lng]
-    track_section_ids = []
-    for track_section in sim.infra['track_sections']:
-        lats, longs = [], []
-        for coords in track_section['geo']['coordinates']:
-            lats.append(coords[0])
-            longs.append(coords[1])
-
-        bbox = [min(lats), min(longs), max(lats), max(longs)]
-        xA = max(box[0], bbox[0])
-        yA = max(box[1], bbox[1])
-        xB = min(box[2], bbox[2])
-        yB = min(box[3], bbox[3])
-        intersection_area = abs(max((xB - xA, 0)) * max((yB - yA), 0))
-        if intersection_area > 0:
-            track_section_ids.append(track_section['id'])
-
-    return filter_by_track_section_ids(sim, track_section_ids)
+    track_section_ids = sim.spatial_index().rectangle(
+        min_lat, max_lat, min_lng, max_lng
+    )
+
+    return filter_by_track_section_ids(sim, track_section_ids, dir)
+
+
+def filter_by_polygon(
+    sim,
+    points: list[tuple[float, float]],
+    dir: str | None = None,
+) -> dict[str, Any]:
+
+    track_section_ids = sim.spatial_index().polygon(points)
+
+    return filter_by_track_section_ids(sim, track_section_ids, dir)
+
+
+def filter_by_radius(
+    sim,
+    lat: float,
+    lng: float,
+    radius: float,
+    dir: str | None = None,
+) -> dict[str, Any]:
+
+    track_section_ids = sim.spatial_index().radius(lat, lng, radius)
+
+    return filter_by_track_section_ids(sim, track_section_ids, dir)
+
+
+_PARENT = None
+
+
+def _init_worker(infra: dict[str, Any], dir: str) -> None:
+    """Keep the parent infra and its indexes in each worker process"""
+    global _PARENT
+    _PARENT = (SimpleNamespace(infra=infra, dir=dir), infra_indexes(infra))
+
+
+def _filter_in_worker(
+    track_section_ids: list[str],
+    dir: str,
+    route_updates: bool,
+) -> str:
+    sim, indexes = _PARENT
+    filter_by_track_section_ids(
+        sim,
+        track_section_ids,
+        dir,
+        route_updates,
+        indexes,
+    )
+    return dir
+
+
+def filter_many(
+    sim,
+    track_section_ids: list[list[str]] | None = None,
+    line_codes: list[int | list[int]] | None = None,
+    bboxes: list[tuple[float, float, float, float]] | None = None,
+    dirs: list[str] | None = None,
+    route_updates: bool = True,
+    max_workers: int | None = 1,
+) -> list[OSRD]:
+    """Cut several sub-infras from the same infra
+
+    The lookups of the parent infra (waypoints, switches ports,
+    line codes and spatial index) are computed once for all the cuts.
+
+    Parameters
+    ----------
+    sim : OSRD
+        Parent infra
+    track_section_ids : list[list[str]] | None, optional
+        Track sections of each sub-infra to cut, by default None
+    line_codes : list[int | list[int]] | None, optional
+        Line code(s) of each sub-infra to cut, by default None
+    bboxes : list[tuple[float, float, float, float]] | None, optional
+        Bounds (min_lat, max_lat, min_lng, max_lng) of each sub-infra
+        to cut, by default None
+    dirs : list[str] | None, optional
+        Directories of the sub-infras, in the order track sections, line
+        codes, bboxes, by default `<sim.dir>_sub<i>`
+    route_updates : bool, optional
+        See `filter_by_track_section_ids`, by default True
+    max_workers : int | None, optional
+        Number of processes cutting sub-infras in parallel,
+        None for the number of processors, by default 1
+
+    Returns
+    -------
+    list[OSRD]
+        Sub-infras, in the order track sections, line codes, bboxes
+    """
+
+    cuts = [list(ids) for ids in (track_section_ids or [])]
+
+    if line_codes:
+        tracks_by_line = dict()
+        for track in sim.infra['track_sections']:
+            tracks_by_line.setdefault(
+                track['extensions']['sncf']['line_code'],
+                []
+            ).append(track['id'])
+        for codes in line_codes:
+            if not isinstance(codes, list):
+                codes = [codes]
+            cuts.append([
+                track
+                for code in codes
+                for track in tracks_by_line.get(code, [])
+            ])
+
+    if bboxes:
+        index = sim.spatial_index()
+        cuts += [index.rectangle(*bbox) for bbox in bboxes]
+
+    if dirs is None:
+        dirs = [f"{sim.dir}_sub{i}" for i in range(len(cuts))]
+    if len(dirs) != len(cuts):
+        raise ValueError(
+            f"{len(dirs)} directories given for {len(cuts)} sub-infras"
+        )
+
+    if max_workers == 1:
+        indexes = infra_indexes(sim.infra)
+        return [
+            filter_by_track_section_ids(
+                sim, ids, dir, route_updates, indexes
+            )
+            for ids, dir in zip(cuts, dirs)
+        ]
+
+    with ProcessPoolExecutor(
+        max_workers=max_workers,
+        initializer=_init_worker,
+        initargs=(sim.infra, sim.dir),
+    ) as executor:
+        done = executor.map(
+            _filter_in_worker,
+            cuts,
+            dirs,
+            [route_updates] * len(cuts),
+        )
+        return [OSRD(dir=dir) for dir in done]
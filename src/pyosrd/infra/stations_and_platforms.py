@@ -1,68 +1,163 @@
+import difflib
+import re
+import unicodedata
+
 import pandas as pd
 
 
+def _normalize(name: str) -> str:
+    """Lower case name without accents nor punctuation"""
+    name = unicodedata.normalize('NFKD', name)
+    name = ''.join(c for c in name if not unicodedata.combining(c))
+    return re.sub(r'[^a-z0-9]+', ' ', name.lower()).strip()
+
+
+class StationCatalog:
+    """Stations and platforms of an infra, indexed once
+
+    Parameters
+    ----------
+    infra : dict
+        RailJSON infra
+
+    Attributes
+    ----------
+    stations: list[str]
+        Sorted names of the stations, operational points without name
+        or SNCF extensions being skipped
+    platforms: pd.DataFrame
+        One row per platform with columns 'station', 'track_name',
+        'track_section', 'offset' and 'line_code'
+    """
+
+    def __init__(self, infra: dict):
+
+        tracks = {
+            track['id']: track.get('extensions', {}).get('sncf', {})
+            for track in infra['track_sections']
+        }
+
+        self.names = set()
+        indexed = set()
+        records = []
+        for op in infra['operational_points']:
+            extensions = op.get('extensions', {})
+            name = extensions.get('identifier', {}).get('name')
+            if name is None:
+                continue
+            self.names.add(name)
+            if extensions.get('sncf', {}).get('ch') not in ['BV', '00']:
+                continue
+            # Only the first operational point of a station is used
+            if name in indexed:
+                continue
+            indexed.add(name)
+            for part in op['parts']:
+                if part['track'] in tracks:
+                    records.append({
+                        'station': name,
+                        'track_name': tracks[part['track']].get('track_name'),
+                        'track_section': part['track'],
+                        'offset': part['position'],
+                        'line_code': tracks[part['track']].get('line_code'),
+                    })
+        self.stations = sorted(indexed)
+
+        self.platforms = (
+            pd.DataFrame(
+                records,
+                columns=[
+                    'station',
+                    'track_name',
+                    'track_section',
+                    'offset',
+                    'line_code',
+                ]
+            )
+            .drop_duplicates(['station', 'track_name'], keep='last')
+            .reset_index(drop=True)
+        )
+
+        self._normalized = dict()
+        for name in sorted(self.names):
+            self._normalized.setdefault(_normalize(name), []).append(name)
+
+    def find(self, name: str, n: int = 5) -> list[str]:
+        """Names of operational points matching a (misspelled) name
+
+        Exact matches come first, then names containing it once
+        normalized (case, accents and punctuation ignored), then the
+        closest names.
+
+        Parameters
+        ----------
+        name : str
+            Name to look for
+        n : int, optional
+            Maximum number of close names, by default 5
+
+        Returns
+        -------
+        list[str]
+            Matching names
+        """
+
+        key = _normalize(name)
+        found = list(self._normalized.get(key, []))
+        found += [
+            match
+            for normalized, names in self._normalized.items()
+            if key in normalized and normalized != key
+            for match in names
+        ]
+        found += [
+            match
+            for close in difflib.get_close_matches(
+                key, self._normalized, n=n
+            )
+            for match in self._normalized[close]
+        ]
+        return list(dict.fromkeys(found))
+
+
+def station_catalog(
+    self,
+) -> StationCatalog:
+    """Station catalog of the infra, built once per infra"""
+
+    cached = getattr(self, '_station_catalog', None)
+    if cached is None or cached[0] is not self.infra:
+        self._station_catalog = (self.infra, StationCatalog(self.infra))
+    return self._station_catalog[1]
+
+
 def stations(
     self,
 ):
-    ops = pd.json_normalize(self.infra['operational_points'])
-    stations = ops[ops['extensions.sncf.ch'].isin(['BV', '00'])]
-    return stations['extensions.identifier.name'].sort_values().values.tolist()
+    return list(station_catalog(self).stations)
 
 
 def platforms(
     self,
     station: str,
 ):
-    track_sections = pd.json_normalize(self.infra['track_sections'])
-    op = pd.json_normalize(self.infra['operational_points'])
+    catalog = station_catalog(self)
 
-    if station not in op['extensions.identifier.name'].unique():
+    if station not in catalog.names:
         print(
             f'{station} is not a valid station in the infra.'
             ' Did you mean any of these ?')
-        print(
-            op[
-                op['extensions.identifier.name']
-                .str.contains(
-                    station.lower(),
-                    case=False
-                )
-            ]['extensions.identifier.name'].unique()
-        )
-
-    op_station = op[
-        op['extensions.identifier.name'] == station
-    ]
+        print(catalog.find(station))
 
-    op_station_platforms = op_station[
-        op_station['extensions.sncf.ch'].isin(['BV', '00'])
-    ]
-
-    if len(op_station_platforms) == 0:
-        return {}
-
-    df = (
-        pd.json_normalize(op_station_platforms.iloc[0].parts)
-        .merge(
-            track_sections[
-                [
-                    'id',
-                    'extensions.sncf.track_name',
-                    'extensions.sncf.line_code'
-                ]
-            ],
-            left_on='track',
-            right_on='id'
-        )
-    )
+    df = catalog.platforms[catalog.platforms.station == station]
 
     return {
-        row['extensions.sncf.track_name']: {
-            'track_section': row['track'],
-            'offset': row['position'],
-            'line_code': row['extensions.sncf.line_code'],
+        row.track_name: {
+            'track_section': row.track_section,
+            'offset': row.offset,
+            'line_code': row.line_code,
         }
-        for _, row in df.iterrows()
+        for row in df.itertuples()
     }
 
 
@@ -76,6 +171,35 @@ def platform_location(
     return (platform['track_section'], platform['offset'])
 
 
+def platform_locations(
+    self,
+    platforms: list[tuple[str, str]],
+) -> pd.DataFrame:
+    """Locations of many platforms at once
+
+    Parameters
+    ----------
+    platforms : list[tuple[str, str]]
+        (station, track_name) of the platforms
+
+    Returns
+    -------
+    pd.DataFrame
+        One row per given platform, in the same order, with columns
+        'station', 'track_name', 'track_section', 'offset' and
+        'line_code' (NaN for unknown platforms)
+    """
+
+    return pd.DataFrame(
+        platforms,
+        columns=['station', 'track_name']
+    ).merge(
+        station_catalog(self).platforms,
+        on=['station', 'track_name'],
+        how='left',
+    )
+
+
 def lines(
     self
 ) -> pd.DataFrame:
@@ -0,0 +1,284 @@
+"""Read RailJSON infra files section by section
+
+The file is read by chunks: the requested top level sections are decoded
+one item at a time and the other ones are skipped without being decoded,
+so that only the needed sections of national-scale infras are held in
+memory.
+
+>>> for track in iter_section('infra.json', 'track_sections'):
+...     print(track['id'])
+>>> infra = read_infra('infra.json', SPLIT_SECTIONS)
+
+Lookups needing only a few fields of large sections are built from the
+items as they are read (see `read_track_section_lengths` and
+`infra.routes.read_infra_indexes`).
+"""
+import json
+import re
+
+from typing import Any, Iterable, Iterator
+
+CHUNK_SIZE = 1 << 20  # characters
+
+# Sections used to cut sub-infras with the infra.split functions
+SPLIT_SECTIONS = [
+    'track_sections',
+    'switches',
+    'detectors',
+    'buffer_stops',
+    'signals',
+    'routes',
+    'operational_points',
+    'speed_sections',
+    'electrifications',
+    'neutral_sections',
+]
+
+_DECODER = json.JSONDecoder()
+_WHITESPACES = re.compile(r'\s*')
+_STRUCTURE = re.compile(r'["\[\]{}]')
+_STRING_END = re.compile(r'["\\]')
+
+
+class _ChunkedReader:
+    """Cursor over a JSON text file read by chunks"""
+
+    def __init__(self, file, chunk_size: int = CHUNK_SIZE):
+        self.file = file
+        self.chunk_size = chunk_size
+        self.buffer = ''
+        self.pos = 0
+        self.eof = False
+
+    def _read_more(self) -> bool:
+        if self.eof:
+            return False
+        chunk = self.file.read(self.chunk_size)
+        if not chunk:
+            self.eof = True
+            return False
+        self.buffer = self.buffer[self.pos:] + chunk
+        self.pos = 0
+        return True
+
+    def peek(self) -> str:
+        """Next non whitespace character"""
+        while True:
+            self.pos = _WHITESPACES.match(self.buffer, self.pos).end()
+            if self.pos < len(self.buffer):
+                return self.buffer[self.pos]
+            if not self._read_more():
+                raise ValueError("Unexpected end of the JSON file")
+
+    def expect(self, char: str) -> None:
+        if self.peek() != char:
+            raise ValueError(
+                f"Expected {char!r} in the JSON file, "
+                f"found {self.buffer[self.pos]!r}"
+            )
+        self.pos += 1
+
+    def decode(self) -> Any:
+        """Decode the next value"""
+        self.peek()
+        while True:
+            try:
+                value, end = _DECODER.raw_decode(self.buffer, self.pos)
+            except json.JSONDecodeError:
+                if not self._read_more():
+                    raise
+                continue
+            # A number could continue in the next chunk
+            if end == len(self.buffer) and self._read_more():
+                continue
+            self.pos = end
+            return value
+
+    def skip(self) -> None:
+        """Move after the next value without decoding it"""
+        if self.peek() not in '[{':
+            self.decode()
+            return
+        depth = 0
+        in_string = False
+        while True:
+            pattern = _STRING_END if in_string else _STRUCTURE
+            match = pattern.search(self.buffer, self.pos)
+            if match is None:
+                self.pos = len(self.buffer)
+                if not self._read_more():
+                    raise ValueError("Unexpected end of the JSON file")
+                continue
+            char = match.group()
+            self.pos = match.end()
+            if char == '\\':
+                # Skip the escaped character
+                if self.pos == len(self.buffer) and not self._read_more():
+                    raise ValueError("Unexpected end of the JSON file")
+                self.pos += 1
+                continue
+            if char == '"':
+                in_string = not in_string
+            elif char in '[{':
+                depth += 1
+            else:
+                depth -= 1
+                if depth == 0:
+                    return
+
+
+def _iter_top_level(
+    reader: _ChunkedReader,
+    sections: set[str],
+) -> Iterator[tuple[str, Any, bool]]:
+    """(section, value, is_item) for the requested sections
+
+    Items of array sections are yielded one by one with is_item True,
+    other values are yielded whole with is_item False.
+    """
+
+    reader.expect('{')
+    if reader.peek() == '}':
+        return
+    while True:
+        key = reader.decode()
+        reader.expect(':')
+        if key not in sections:
+            reader.skip()
+        elif reader.peek() == '[':
+            reader.expect('[')
+            if reader.peek() == ']':
+                reader.pos += 1
+                yield key, [], False
+            else:
+                while True:
+                    yield key, reader.decode(), True
+                    if reader.peek() == ']':
+                        reader.pos += 1
+                        break
+                    reader.expect(',')
+        else:
+            yield key, reader.decode(), False
+        if reader.peek() == '}':
+            return
+        reader.expect(',')
+
+
+def iter_section(
+    path: str,
+    section: str,
+) -> Iterator[Any]:
+    """Items of a top level section of a RailJSON file, one by one
+
+    Parameters
+    ----------
+    path : str
+        Path of the RailJSON file
+    section : str
+        Name of the section, e.g. 'track_sections'
+
+    Yields
+    ------
+    Any
+        Items of the section (the value itself if it is not an array)
+    """
+
+    with open(path, 'r') as f:
+        for _, value, is_item in _iter_top_level(
+            _ChunkedReader(f),
+            {section}
+        ):
+            if is_item:
+                yield value
+            else:
+                yield from value if isinstance(value, list) else [value]
+                return
+
+
+def iter_sections(
+    path: str,
+    sections: Iterable[str],
+) -> Iterator[tuple[str, Any]]:
+    """Items of some top level sections of a RailJSON file, one by one
+
+    Parameters
+    ----------
+    path : str
+        Path of the RailJSON file
+    sections : Iterable[str]
+        Names of the sections
+
+    Yields
+    ------
+    tuple[str, Any]
+        (section, item) in the file order (the value itself as item if
+        the section is not an array)
+    """
+
+    with open(path, 'r') as f:
+        for key, value, is_item in _iter_top_level(
+            _ChunkedReader(f),
+            set(sections)
+        ):
+            if is_item or not isinstance(value, list):
+                yield key, value
+            else:
+                for item in value:
+                    yield key, item
+
+
+def read_track_section_lengths(path: str) -> dict[str, float]:
+    """Lengths of the track sections of a RailJSON file, read without
+    holding the track sections (and their geometries) in memory
+
+    Parameters
+    ----------
+    path : str
+        Path of the RailJSON file
+
+    Returns
+    -------
+    dict[str, float]
+        Length of each track section, as `OSRD.track_section_lengths`
+    """
+
+    return {
+        track['id']: track['length']
+        for track in iter_section(path, 'track_sections')
+    }
+
+
+def read_infra(
+    path: str,
+    sections: Iterable[str] | None = None,
+) -> dict[str, Any]:
+    """Read some sections of a RailJSON file
+
+    Parameters
+    ----------
+    path : str
+        Path of the RailJSON file
+    sections : Iterable[str] | None, optional
+        Top level sections to read, by default all
+
+    Returns
+    -------
+    dict[str, Any]
+        Infra with only the requested sections
+    """
+
+    if sections is None:
+        with open(path, 'r') as f:
+            return json.load(f)
+
+    infra = dict()
+    with open(path, 'r') as f:
+        for key, value, is_item in _iter_top_level(
+            _ChunkedReader(f),
+            set(sections)
+        ):
+            if is_item:
+                infra.setdefault(key, []).append(value)
+            else:
+                infra[key] = value
+    return infra
@@ -0,0 +1,319 @@
+"""Simulations and regulations run in background processes
+
+Jobs run in a process pool so that a JVM run or an agent search does
+not block the caller (e.g. the event loop of the dashboard). Workers
+report their progress through a queue, drained by `JobManager.poll()`,
+and check at each report whether the job was cancelled: a cancelled job
+stops at its next report, except agents with a `stop_requested` hook
+(e.g. MILPAgent), whose search is stopped as soon as it is cancelled.
+
+>>> jobs = JobManager(max_workers=2)
+>>> job = jobs.submit('dispatch', regulation_job, sim.dir, agent)
+>>> jobs.poll()  # jobs whose progress or status changed
+>>> results_json = await jobs.wait(job)
+"""
+import asyncio
+import itertools
+import multiprocessing
+import threading
+import time
+from concurrent.futures import CancelledError, Future, ProcessPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, Callable
+
+from pyosrd import OSRD
+
+PENDING, RUNNING, DONE, FAILED, CANCELLED = (
+    'pending', 'running', 'done', 'failed', 'cancelled'
+)
+
+
+class JobCancelled(Exception):
+    """Raised in a worker reporting progress on a cancelled job"""
+
+
+@dataclass
+class Job:
+    """A function run in a background process
+
+    Attributes
+    ----------
+    id : int
+        Job number, unique in its JobManager
+    name : str
+        Label of the job
+    status : str
+        'pending', 'running', 'done', 'failed' or 'cancelled'
+    progress : list[dict[str, Any]]
+        Progress reports of the worker, oldest first
+    result : Any
+        Value returned by the function, once done
+    error : str | None
+        Error message, if failed
+    started : float | None
+        Start time (time.time()), once running
+    finished : float | None
+        End time, once done, failed or cancelled
+    """
+
+    id: int
+    name: str
+    status: str = PENDING
+    progress: list[dict[str, Any]] = field(default_factory=list)
+    result: Any = None
+    error: str | None = None
+    started: float | None = None
+    finished: float | None = None
+    _future: Future | None = field(default=None, repr=False)
+    _cancelled: Any = field(default=None, repr=False)
+
+    @property
+    def active(self) -> bool:
+        return self.status in (PENDING, RUNNING)
+
+
+class Progress:
+    """Callable given to job functions to report their progress
+
+    Keyword arguments of each call are sent to the JobManager, which
+    appends them to `Job.progress`. Raises JobCancelled if the job was
+    cancelled.
+    """
+
+    def __init__(self, job_id: int, queue, cancelled) -> None:
+        self._job_id = job_id
+        self._queue = queue
+        self._cancelled = cancelled
+
+    @property
+    def cancelled(self) -> bool:
+        return self._cancelled.is_set()
+
+    def __call__(self, **info: Any) -> None:
+        if self.cancelled:
+            raise JobCancelled(f"Job {self._job_id} was cancelled")
+        self._queue.put((self._job_id, info))
+
+
+def _run(
+    function: Callable,
+    progress: Progress,
+    args: tuple,
+    kwargs: dict,
+) -> Any:
+    progress(status=RUNNING)
+    return function(*args, progress=progress, **kwargs)
+
+
+class JobManager:
+    """Submit, follow and cancel jobs run in a process pool
+
+    Parameters
+    ----------
+    max_workers : int | None, optional
+        Number of processes, None for the number of processors,
+        by default 1
+    """
+
+    def __init__(
+        self,
+        max_workers: int | None = 1,
+    ) -> None:
+        self._executor = ProcessPoolExecutor(max_workers=max_workers)
+        self._manager = multiprocessing.Manager()
+        self._queue = self._manager.Queue()
+        self._ids = itertools.count()
+        self.jobs: dict[int, Job] = dict()
+        self._changed: set[int] = set()
+        self._lock = threading.Lock()
+
+    def _change(self, job_id: int) -> None:
+        with self._lock:
+            self._changed.add(job_id)
+
+    def submit(
+        self,
+        name: str,
+        function: Callable,
+        *args,
+        **kwargs,
+    ) -> Job:
+        """Run function(*args, progress=..., **kwargs) in a worker
+
+        function must be importable by the workers (defined at the top
+        level of a module) and take a `progress` keyword argument, a
+        Progress to call with keyword arguments describing its progress.
+        """
+
+        job = Job(id=next(self._ids), name=name)
+        job._cancelled = self._manager.Event()
+        job._future = self._executor.submit(
+            _run,
+            function,
+            Progress(job.id, self._queue, job._cancelled),
+            args,
+            kwargs,
+        )
+        self.jobs[job.id] = job
+        job._future.add_done_callback(lambda future: self._change(job.id))
+        self._change(job.id)
+        return job
+
+    def cancel(
+        self,
+        job: Job | int,
+    ) -> None:
+        """Cancel a job: pending jobs are not run, running jobs stop at
+        their next progress report, and the result of both is ignored"""
+
+        job = self.jobs[job] if isinstance(job, int) else job
+        if not job.active:
+            return
+        job._cancelled.set()
+        job._future.cancel()
+        job.status = CANCELLED
+        job.finished = time.time()
+        self._change(job.id)
+
+    def poll(self) -> list[Job]:
+        """Read the progress reports and results of the workers
+
+        Returns
+        -------
+        list[Job]
+            Jobs whose progress or status changed since the last poll
+        """
+
+        while not self._queue.empty():
+            job_id, info = self._queue.get_nowait()
+            job = self.jobs[job_id]
+            if job.status == CANCELLED:
+                continue
+            if info.get('status') == RUNNING and job.status == PENDING:
+                job.status = RUNNING
+                job.started = time.time()
+            job.progress.append(info)
+            self._change(job_id)
+
+        with self._lock:
+            changed, self._changed = self._changed, set()
+        for job_id in changed:
+            job = self.jobs[job_id]
+            if job.active and job._future.done():
+                self._finish(job)
+        return [self.jobs[job_id] for job_id in sorted(changed)]
+
+    def _finish(self, job: Job) -> None:
+        job.finished = time.time()
+        try:
+            job.result = job._future.result()
+            job.status = DONE
+        except (CancelledError, JobCancelled):
+            job.status = CANCELLED
+        except Exception as e:
+            job.status = FAILED
+            job.error = f"{type(e).__name__}: {e}"
+
+    async def wait(
+        self,
+        job: Job | int,
+    ) -> Any:
+        """Wait without blocking the event loop for the end of a job
+
+        Returns
+        -------
+        Any
+            Result of the job, None if it was cancelled or failed
+        """
+
+        job = self.jobs[job] if isinstance(job, int) else job
+        try:
+            await asyncio.wrap_future(job._future)
+        except asyncio.CancelledError:
+            if not job._future.cancelled():
+                raise
+        except Exception:
+            pass  # see job.error
+        self.poll()
+        return job.result
+
+    def shutdown(self) -> None:
+        """Cancel the pending jobs and stop the workers"""
+
+        for job in self.jobs.values():
+            if job.status == PENDING:
+                self.cancel(job)
+        self._executor.shutdown(wait=False, cancel_futures=True)
+        self._manager.shutdown()
+
+
+def delayed_job(
+    dir: str,
+    delays: list[dict[str, Any]],
+    progress: Progress,
+) -> str:
+    """Add delays to a simulation and compute its delayed results
+
+    Parameters
+    ----------
+    dir : str
+        Directory of the simulation
+    delays : list[dict[str, Any]]
+        Keyword arguments of OSRD.add_delay (train, time_threshold, delay)
+
+    Returns
+    -------
+    str
+        Path of the delayed results, relative to dir
+    """
+
+    sim = OSRD(dir=dir)
+    for i, delay in enumerate(delays):
+        sim.add_delay(**delay)
+        progress(step='delay', done=i + 1, total=len(delays))
+    delayed = sim.delayed()
+    progress(step='delayed')
+    return delayed.results_json
+
+
+def regulation_job(
+    dir: str,
+    agent,
+    progress: Progress,
+) -> str:
+    """Regulate a delayed simulation with an agent
+
+    Scheduler agents without schedules get them from the simulation.
+    Agents with a `solution_callback` (e.g. MILPAgent) report the
+    objective value of each solution found, and agents with a
+    `stop_requested` hook stop their search when the job is cancelled.
+
+    Parameters
+    ----------
+    dir : str
+        Directory of the simulation
+    agent : Agent
+        Regulation agent
+
+    Returns
+    -------
+    str
+        Path of the regulated results, relative to dir
+    """
+
+    from pyosrd.agents.scheduler_agent import SchedulerAgent
+
+    sim = OSRD(dir=dir)
+    if isinstance(agent, SchedulerAgent) and agent.ref_schedule is None:
+        agent.set_schedules_from_osrd(sim)
+        progress(step='schedules')
+    if getattr(agent, 'solution_callback', False) is None:
+        agent.solution_callback = (
+            lambda schedule, objective:
+            progress(step='solution', objective=objective)
+        )
+    if getattr(agent, 'stop_requested', False) is None:
+        agent.stop_requested = lambda: progress.cancelled
+    regulated = sim.regulate(agent)
+    progress(step='regulated')
+    return regulated.results_json
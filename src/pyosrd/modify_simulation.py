@@ -1,6 +1,8 @@
 import json
 import os
 
+from typing import Any
+
 from railjson_generator import (
     SimulationBuilder,
     Location,
@@ -9,6 +11,9 @@ from railjson_generator import (
 from railjson_generator.schema.infra.track_section import TrackSection
 
 from pyosrd.utils import hour_to_seconds
+from pyosrd.utils.rolling_stocks import set_rolling_stocks
+
+set_rolling_stocks()
 
 
 def _group_idx(self, group: str) -> int:
@@ -44,35 +49,71 @@ def add_train(
         When the train's label is already used in the simulation
     """
 
-    if self.simulation and label in self.trains:
-        raise ValueError(f"'{label}' is already used as a train label")
+    add_trains(
+        self,
+        [{
+            'label': label,
+            'locations': locations,
+            'departure_time': departure_time,
+            'rolling_stock': rolling_stock,
+        }]
+    )
+
 
-    if isinstance(departure_time, str):
-        departure_time = hour_to_seconds(departure_time)
+def add_trains(
+    self,
+    trains: list[dict[str, Any]],
+):
+    """Add new train schedules, writing the simulation file once
+
+    Parameters
+    ----------
+    trains : list[dict[str, Any]]
+        Keyword arguments of add_train for each new train:
+        label, locations, departure_time and optionally rolling_stock
 
-    # reconstruct tracks
+    Raises
+    ------
+    ValueError
+        When a train's label is already used in the simulation
+        or given twice
+    """
+
+    labels = [train['label'] for train in trains]
+    used = set(self.trains) if self.simulation else set()
+    for label in labels:
+        if label in used:
+            raise ValueError(f"'{label}' is already used as a train label")
+        used.add(label)
+
+    # reconstruct the tracks of the new trains only
+    lengths = self.track_section_lengths
     track_sections = {
-        t['id']: TrackSection(
-            label=t['id'],
-            length=t['length']
-        )
-        for t in self.infra['track_sections']
+        track: TrackSection(label=track, length=lengths[track])
+        for track in {
+            location[0]
+            for train in trains
+            for location in train['locations']
+        }
     }
 
     sim_builder = SimulationBuilder()
 
-    train = sim_builder.add_train_schedule(
-        *[
-            Location(track_sections[t[0]], t[1])
-            for t in locations
-        ],
-        label=label,
-        departure_time=departure_time,
-        rolling_stock=rolling_stock,
-    )
-    train.add_standard_single_value_allowance("percentage", 5, )
-
-    built_simulation = sim_builder.build()
+    for train in trains:
+        departure_time = train['departure_time']
+        if isinstance(departure_time, str):
+            departure_time = hour_to_seconds(departure_time)
+        sim_builder.add_train_schedule(
+            *[
+                Location(track_sections[t[0]], t[1])
+                for t in train['locations']
+            ],
+            label=train['label'],
+            departure_time=departure_time,
+            rolling_stock=train.get('rolling_stock', 'fast_rolling_stock'),
+        ).add_standard_single_value_allowance("percentage", 5, )
+
+    built_simulation = sim_builder.build().format()
 
     if not self.simulation:
         self.simulation = {
@@ -81,17 +122,13 @@ def add_train(
             'time_step': 2.0,
         }
 
-    train_schedule_group = \
-        built_simulation.format()['train_schedule_groups'][0]
-
     # fill simulation
-    self.simulation['train_schedule_groups'].append(
-        train_schedule_group
-    )
+    self.simulation['train_schedule_groups'] += \
+        built_simulation['train_schedule_groups']
 
-    rs = built_simulation.format()['rolling_stocks'][0]
-    if rs not in self.simulation['rolling_stocks']:
-        self.simulation['rolling_stocks'].append(rs)
+    for rs in built_simulation['rolling_stocks']:
+        if rs not in self.simulation['rolling_stocks']:
+            self.simulation['rolling_stocks'].append(rs)
 
     with open(os.path.join(self.dir, self.simulation_json), 'w') as f:
         json.dump(self.simulation, f)
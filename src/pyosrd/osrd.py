@@ -1,4 +1,5 @@
 import base64
+import hashlib
 import importlib
 import json
 import os
@@ -10,20 +11,27 @@ from dataclasses import dataclass
 from dataclasses import field
 from importlib.resources import files
 from itertools import combinations
-from typing import Any
+from typing import TYPE_CHECKING, Any
 
-import networkx as nx
 import numpy as np
-import PIL
-from PIL.JpegImagePlugin import JpegImageFile
-import requests
 from dotenv import load_dotenv
 from typing_extensions import Self
 from methodtools import lru_cache
 
-import pyosrd.use_cases.infras as infras
-import pyosrd.use_cases.simulations as simulations
-import pyosrd.use_cases.with_delays as with_delays
+from pyosrd.infra.cache import load_infra
+from pyosrd.infra.routes import (  # noqa: F401
+    SWITCH_EXIT,
+    infra_indexes,
+    route_index,
+)
+from pyosrd.infra.stream import read_infra
+from pyosrd.results_cache import results_cache
+
+if TYPE_CHECKING:
+    import networkx as nx
+    from PIL.JpegImagePlugin import JpegImageFile
+
+    from pyosrd.agents import Agent
 
 
 def _read_json(json_file: str) -> dict | list:
@@ -35,6 +43,55 @@ def _read_json(json_file: str) -> dict | list:
     return dict_
 
 
+class _lazy_method:
+    """Function of a pyosrd module used as a method, the module being
+    imported on first access (e.g. viz modules importing folium, plotly
+    or matplotlib)"""
+
+    def __init__(self, module: str) -> None:
+        self.module = module
+
+    def __set_name__(self, owner: type, name: str) -> None:
+        self.name = name
+
+    def __get__(self, obj, owner: type | None = None):
+        owner = owner or type(obj)
+        function = getattr(
+            importlib.import_module(self.module, 'pyosrd'),
+            self.name
+        )
+        setattr(owner, self.name, function)
+        return function.__get__(obj, owner)
+
+
+def _run_digests(
+    infra: dict,
+    simulation: dict,
+) -> dict[str, Any]:
+    """Hashes of the content of the infra, of each train schedule group
+    (by id) and of the rest of the simulation, identifying the inputs
+    of a run"""
+
+    def digest(obj) -> str:
+        return hashlib.blake2b(
+            json.dumps(obj, sort_keys=True).encode(),
+            digest_size=16,
+        ).hexdigest()
+
+    return {
+        'infra': digest(infra),
+        'simulation': digest({
+            k: v
+            for k, v in simulation.items()
+            if k != 'train_schedule_groups'
+        }),
+        'groups': {
+            group['id']: digest(group)
+            for group in simulation.get('train_schedule_groups', [])
+        },
+    }
+
+
 @dataclass
 class Point:
     track_section: str
@@ -63,8 +120,9 @@ class OSRD():
         `OSRD.with_delays`, by default None
     infra_json: str, optional
         Name of the file containing the infrastructure in rail_json format.
-        If the file does not exist, attribute infra will be empty,
-        by default 'infra.json'
+        If the file does not exist, attribute infra will be empty.
+        Once parsed, it is cached in binary format in the user cache
+        directory (see `infra.cache`), by default 'infra.json'
     simulation_json: str, optional
         Name of the file containing the simulation parameters.
         If the file does not exist, attribute simulation will be empty,
@@ -78,6 +136,10 @@ class OSRD():
         simulation obtained with .delayed() method.
         If the file does not exist, attribute delays will be empty,
         by default 'delays.json'
+    infra_sections: list[str] or None, optional
+        If set, only these top level sections of the infra file are read
+        (e.g. `infra.stream.SPLIT_SECTIONS` to cut sub-infras from a
+        national-scale infra), by default None (whole file)
     """
     dir: str = '.'
     infra: str | None = None
@@ -88,27 +150,33 @@ class OSRD():
     results_json: str = 'results.json'
     delays_json: str = 'delays.json'
     params_use_case: dict = field(default_factory=dict)
+    infra_sections: list[str] | None = None
 
-    from .agents import Agent
     from .delays import add_delay, add_delays_in_results, delayed, reset_delays
+    from .infra.geometry import track_geometry
+    from .infra.spatial_index import spatial_index
     from .regulation import add_stop, add_stops
-    from .viz.map import folium_map, folium_results
-    from .viz.space_time_charts import (
-        space_time_chart,
-        space_time_chart_plotly,
-    )
-    from .viz.delays_chart import (
-        delays_chart,
-        delays_chart_plotly
-    )
-    from .modify_simulation import (
-        add_train,
-        add_scheduled_points,
-        cancel_train,
-        cancel_all_trains,
-        stop_train,
-        copy_train
-    )
+    from .viz.space_time_data import space_time_data
+
+    # Methods whose modules import heavy dependencies when first used
+    import_timetable = _lazy_method('.timetable')
+    timetable_trains = _lazy_method('.timetable')
+    folium_map = _lazy_method('.viz.map')
+    folium_results = _lazy_method('.viz.map')
+    write_map_tiles = _lazy_method('.viz.map')
+    write_res2geojson = _lazy_method('.viz.result_to_geojson')
+    space_time_chart = _lazy_method('.viz.space_time_charts')
+    space_time_chart_plotly = _lazy_method('.viz.space_time_charts')
+    update_space_time_chart_plotly = _lazy_method('.viz.space_time_charts')
+    delays_chart = _lazy_method('.viz.delays_chart')
+    delays_chart_plotly = _lazy_method('.viz.delays_chart')
+    add_train = _lazy_method('.modify_simulation')
+    add_trains = _lazy_method('.modify_simulation')
+    add_scheduled_points = _lazy_method('.modify_simulation')
+    cancel_train = _lazy_method('.modify_simulation')
+    cancel_all_trains = _lazy_method('.modify_simulation')
+    stop_train = _lazy_method('.modify_simulation')
+    copy_train = _lazy_method('.modify_simulation')
 
     def __post_init__(self):
 
@@ -192,11 +260,15 @@ class OSRD():
                 **self.params_use_case
             )
 
-        self.infra = (
-            _read_json(os.path.join(self.dir, self.infra_json))
-            if os.path.exists(os.path.join(self.dir, self.infra_json))
-            else {}
-        )
+        if not os.path.exists(os.path.join(self.dir, self.infra_json)):
+            self.infra = {}
+        elif self.infra_sections is not None:
+            self.infra = read_infra(
+                os.path.join(self.dir, self.infra_json),
+                self.infra_sections,
+            )
+        else:
+            self.infra = load_infra(os.path.join(self.dir, self.infra_json))
         
         self.simulation = (
             _read_json(os.path.join(self.dir, self.simulation_json))
@@ -212,10 +284,130 @@ class OSRD():
 
         if self.simulation and not self.results:
             self.run()
+        elif self.simulation:
+            self._simulated = _read_json(self._digests_path()) if (
+                os.path.exists(self._digests_path())
+            ) else None
 
-    def run(self) -> None:
+    def _run_standalone(
+        self,
+        simulation_json: str,
+        results_json: str,
+    ) -> dict:
+        """Run OSRD core on a simulation file and read its results,
+        unless they are in the results cache"""
+
+        if os.path.exists(os.path.join(self.dir, results_json)):
+            os.remove(os.path.join(self.dir, results_json))
+
+        load_dotenv()
+        JAVA = os.getenv('JAVA') or 'java'
+
+        jar_file = files('pyosrd').joinpath('osrd-0213.jar')
+
+        cache = results_cache()
+        if cache is not None:
+            try:
+                key = cache.key(
+                    os.path.join(self.dir, self.infra_json),
+                    os.path.join(self.dir, simulation_json),
+                    str(jar_file),
+                )
+            except OSError:  # missing input, reported by OSRD below
+                cache = None
+        if (
+            cache is not None
+            and cache.get(key, os.path.join(self.dir, results_json))
+        ):
+            return _read_json(os.path.join(self.dir, results_json))
+
+        output = subprocess.run(
+            f"{JAVA} -jar {jar_file} standalone-simulation "
+            f"--infra_path {os.path.join(self.dir, self.infra_json)} "
+            f"--sim_path {os.path.join(self.dir, simulation_json)} "
+            f"--res_path {os.path.join(self.dir, results_json)}",
+            shell=True,
+            stderr=subprocess.PIPE,
+        )
+
+        try:
+            results = _read_json(os.path.join(self.dir, results_json))
+        except FileNotFoundError:
+            raise RuntimeError(output.stderr.decode())
+        if cache is not None and results:
+            cache.put(key, os.path.join(self.dir, results_json))
+        return results
+
+    def _digests_path(self) -> str:
+        """Path of the digests of the run that wrote the results file"""
+        name, _ = os.path.splitext(self.results_json)
+        return os.path.join(self.dir, name + '.digests.json')
+
+    def _set_simulated(
+        self,
+        digests: dict[str, Any] | None = None,
+    ) -> None:
+        """Remember the inputs the results come from (see `_run_digests`),
+        next to the results file"""
+        if digests is None:
+            digests = _run_digests(self.infra, self.simulation)
+        self._simulated = digests
+        with open(self._digests_path(), 'w') as f:
+            json.dump(digests, f)
+
+    def _reset_simulated(self) -> None:
+        """Forget the inputs of the results (modified in place), so that
+        the next run() simulates all trains"""
+        self._simulated = None
+        if os.path.exists(self._digests_path()):
+            os.remove(self._digests_path())
+
+    def _changed_groups(
+        self,
+        digests: dict[str, Any] | None = None,
+    ) -> list[str] | None:
+        """Ids of the train schedule groups modified since the last run,
+        None if all of them must be simulated again (no digests of the
+        last run, changed infra or simulation parameters)"""
+
+        simulated = getattr(self, '_simulated', None)
+        if simulated is None or not isinstance(self.results, dict):
+            return None
+        if digests is None:
+            digests = _run_digests(self.infra, self.simulation)
+        if (
+            digests['infra'] != simulated['infra']
+            or digests['simulation'] != simulated['simulation']
+        ):
+            return None
+        return [
+            group_id
+            for group_id, digest in digests['groups'].items()
+            if (
+                simulated['groups'].get(group_id) != digest
+                or group_id not in self.results
+            )
+        ]
+
+    def run(
+        self,
+        full: bool = False,
+    ) -> None:
         """run the simulation and store the results in attribute results.
 
+        Only the train schedule groups added or modified since the last
+        run are simulated again (OSRD simulates each group independently),
+        their results replacing the previous ones, unless full is True or
+        the infra or the rolling stocks changed. The inputs of the last
+        run are identified by content hashes saved next to the results
+        file (`<results>.digests.json`): without them, e.g. for results
+        written by another tool, all the trains are simulated.
+
+        Parameters
+        ----------
+        full : bool, optional
+            Simulate all the trains, by default False
+
         Raises
         ------
         ValueError
@@ -227,31 +419,60 @@ class OSRD():
         ):
             raise ValueError("Missing json file to run OSRD")
 
-        if os.path.exists(os.path.join(self.dir, self.results_json)):
-            os.remove(os.path.join(self.dir, self.results_json))
-
-        load_dotenv()
-        JAVA = os.getenv('JAVA') or 'java'
-
-        jar_file = files('pyosrd').joinpath('osrd-0213.jar')
-
-        output = subprocess.run(
-            f"{JAVA} -jar {jar_file} standalone-simulation "
-            f"--infra_path {os.path.join(self.dir, self.infra_json)} "
-            f"--sim_path {os.path.join(self.dir, self.simulation_json)} "
-            f"--res_path {os.path.join(self.dir, self.results_json)}",
-            shell=True,
-            stderr=subprocess.PIPE,
+        digests = (
+            _run_digests(self.infra, self.simulation)
+            if not full and getattr(self, '_simulated', None) is not None
+            else None
         )
+        changed = None if digests is None else self._changed_groups(digests)
 
         self.train_track_sections.cache_clear()
 
-        try:
-            self.results = _read_json(
-                os.path.join(self.dir, self.results_json)
+        if changed is None or (
+            len(changed) == len(self.simulation['train_schedule_groups'])
+        ):
+            self.results = self._run_standalone(
+                self.simulation_json,
+                self.results_json,
             )
-        except FileNotFoundError:
-            raise RuntimeError(output.stderr.decode())
+            self._set_simulated(digests)
+            return
+
+        groups = self.simulation['train_schedule_groups']
+        results = dict()
+        if changed:
+            name, _ = os.path.splitext(self.simulation_json)
+            simulation_json = name + '.changed.json'
+            results_json = name + '.changed_results.json'
+            with open(os.path.join(self.dir, simulation_json), 'w') as f:
+                json.dump(
+                    {
+                        **self.simulation,
+                        'train_schedule_groups': [
+                            group for group in groups if group['id'] in changed
+                        ],
+                    },
+                    f
+                )
+            try:
+                results = self._run_standalone(simulation_json, results_json)
+            finally:
+                for json_file in [simulation_json, results_json]:
+                    if os.path.exists(os.path.join(self.dir, json_file)):
+                        os.remove(os.path.join(self.dir, json_file))
+
+        # New dict, for the caches that check the identity of the results
+        self.results = {
+            group['id']: (
+                results[group['id']]
+                if group['id'] in results
+                else self.results[group['id']]
+            )
+            for group in groups
+        }
+        with open(os.path.join(self.dir, self.results_json), 'w') as f:
+            json.dump(self.results, f)
+        self._set_simulated(digests)
 
     def validate_infra(self) -> None:
         """Loads the infra in core and validates"
@@ -288,16 +509,13 @@ class OSRD():
 
     def infras() -> list[str]:
         """List of available infras"""
-        return [
-            name
-            for _, name, _ in pkgutil.iter_modules(infras.__path__)
-        ]
+        return _use_cases('infras')
 
     def simulations(infra: str | None = None) -> list[str]:
         """List of available simulations"""
         return [
             name
-            for _, name, _ in pkgutil.iter_modules(simulations.__path__)
+            for name in _use_cases('simulations')
             if infra is None or infra+"_" in name
         ]
 
@@ -305,7 +523,7 @@ class OSRD():
         """List of available simulations"""
         return [
             name
-            for _, name, _ in pkgutil.iter_modules(with_delays.__path__)
+            for name in _use_cases('with_delays')
             if sim is None or sim+"_" in name
         ]
 
@@ -514,7 +732,7 @@ class OSRD():
     def draw_infra_points(
         self,
         save: str | None = None,
-    ) -> JpegImageFile:
+    ) -> "JpegImageFile":
         """Use mermaid.js to display the infra as a graph of specific points
 
         Parameters
@@ -540,12 +758,15 @@ class OSRD():
         base64_string = base64_bytes.decode("ascii")
         url = "https://mermaid.ink/img/" + base64_string
 
+        import requests
+        from PIL import Image
+
         response = requests.get(url, stream=True)
 
         with open('tmp.png', 'wb') as out_file:
             shutil.copyfileobj(response.raw, out_file)
         del response
-        image = PIL.Image.open('tmp.png')
+        image = Image.open('tmp.png')
 
         if save:
             os.rename('tmp.png', save)
@@ -596,7 +817,9 @@ class OSRD():
         }
 
     @property
-    def _track_section_network(self) -> nx.DiGraph:
+    def _track_section_network(self) -> "nx.DiGraph":
+
+        import networkx as nx
 
         ts = nx.DiGraph()
 
@@ -813,7 +1036,7 @@ class OSRD():
 
         return dict_tvd_zones
 
-    def regulate(self, agent: Agent) -> Self:
+    def regulate(self, agent: "Agent") -> Self:
         """Create and run a regulated simulation
 
         Parameters
@@ -987,79 +1210,26 @@ class OSRD():
             for route in self.results[group][sim][idx]['routing_requirements']
         ]
 
+    @property
+    def indexes(self) -> dict[str, dict]:
+        """Lookups of the infra (waypoints tracks, switches ports and
+        track sections of all routes), computed once per infra.
+        See `infra.routes.infra_indexes`"""
+
+        cached = getattr(self, '_indexes', None)
+        if cached is None or cached[0] is not self.infra:
+            self._indexes = (self.infra, infra_indexes(self.infra))
+        return self._indexes[1]
+
     def route_track_sections(
         self,
         route_id: str
-    ) -> list[str]:
-
-        SWITCHES_TRACKS = {
-            s['id']: [e['track'] for e in s['ports'].values()]
-            for s in self.infra['switches']
-        }
-
-        route = next(r for r in self.infra['routes'] if r['id'] == route_id)
-
-        curr_track = next(
-            p['track']
-            for p in self.infra['detectors'] + self.infra['buffer_stops']
-            if p['id'] == route['entry_point']['id']
-        )
-
-        if not route['switches_directions']:
-            entry_position = next(
-                p['position']
-                for p in self.infra['detectors'] + self.infra['buffer_stops']
-                if p['id'] == route['entry_point']['id']
-            )
-            exit_position = next(
-                p['position']
-                for p in self.infra['detectors'] + self.infra['buffer_stops']
-                if p['id'] == route['exit_point']['id']
-            )
-            if entry_position < exit_position:
-                direction = 'START_TO_STOP'
-            else:
-                direction = 'STOP_TO_START'
-            return [{'id': curr_track, 'direction': direction}]
-
-        not_visited = set(route['switches_directions'].keys())
-        track_sections = []
-
-        while not_visited:
-            sw = next(
-                switch
-                for switch in self.infra['switches']
-                if curr_track in SWITCHES_TRACKS[switch['id']]
-                and switch['id'] in not_visited
-            )
-            sw_id = sw['id']
-            entry_port = next(
-                p
-                for p, details in sw['ports'].items()
-                if details['track'] == curr_track
-            )
-            switch_direction = route['switches_directions'][sw_id]
-            if not track_sections:
-                direction = (
-                    'START_TO_STOP'
-                    if sw['ports'][entry_port]['endpoint'] == 'END'
-                    else 'STOP_TO_START'
-                )
-                track_sections.append(
-                    {'id': curr_track, 'direction': direction}
-                )
-            exit_port =\
-                SWITCH_EXIT[sw['switch_type']][switch_direction][entry_port]
-            direction = (
-                'START_TO_STOP'
-                if sw['ports'][exit_port]['endpoint'] == 'BEGIN'
-                else 'STOP_TO_START'
-            )
-            curr_track = sw['ports'][exit_port]['track']
-            track_sections.append({'id': curr_track, 'direction': direction})
-            not_visited.remove(sw_id)
+    ) -> list[dict[str, str]]:
 
-        return track_sections
+        return [
+            dict(track)
+            for track in route_index(self.indexes, route_id)['track_sections']
+        ]
 
     @lru_cache()
     def train_track_sections(self, train: int | str) -> list[dict[str, str]]:
@@ -1111,29 +1281,19 @@ class OSRD():
         )
 
 
+def _use_cases(kind: str) -> list[str]:
+    # listed without importing pyosrd.use_cases, which needs
+    # railjson_generator
+    return [
+        name
+        for _, name, _ in pkgutil.iter_modules(
+            [str(files('pyosrd') / 'use_cases' / kind)]
+        )
+    ]
+
+
 def _group_idx(self, group: str) -> int:
     return [
         group['id']
         for group in self.simulation['train_schedule_groups']
     ].index(group)
-
-
-SWITCH_EXIT = {
-    'link': {'STATIC': {'A': 'B', 'B': 'A'}},
-    'point_switch': {
-        'A_B1': {'A': 'B1', 'B1': 'A'},
-        'A_B2': {'A': 'B2', 'B2': 'A'},
-    },
-    'crossing': {
-        'STATIC': {
-            'A1': 'B1', 'B1': 'A1',
-            'A2': 'B2', 'B2': 'A2',
-        }
-    },
-    'double_slip_switch': {
-        'A1_B1': {'A1': 'B1', 'B1': 'A1'},
-        'A1_B2': {'A1': 'B2', 'B2': 'A1'},
-        'A2_B1': {'A2': 'B1', 'B1': 'A2'},
-        'A2_B2': {'A2': 'B2', 'B2': 'A2'},
-    }
-}
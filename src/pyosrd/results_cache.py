@@ -0,0 +1,144 @@
+"""Content-addressed cache of simulation results
+
+Results files are stored under a key hashing the content of the infra
+file, the simulation file and the OSRD core jar, so that running the same
+simulation again (use cases, tests, agents scenarii) reads the results
+instead of running OSRD. Least recently used results are removed when
+the cache exceeds its maximal size.
+
+The cache is opt-in: it is only used if the PYOSRD_RESULTS_CACHE
+environment variable (or .env file) gives its directory, and is disabled
+if it is unset, empty or 0. Its maximal size is given in bytes by
+PYOSRD_RESULTS_CACHE_SIZE, by default 256 MB.
+
+>>> cache = results_cache()
+>>> key = cache.key(infra_path, simulation_path, jar_path)
+>>> if not cache.get(key, results_path):
+...     run_osrd(infra_path, simulation_path, results_path)
+...     cache.put(key, results_path)
+"""
+import hashlib
+import os
+import shutil
+
+from pyosrd.utils.cache_dir import (
+    cache_entries,
+    cache_max_size,
+    evict as evict_,
+)
+from pyosrd.utils.hashing import files_hash
+
+DEFAULT_MAX_SIZE = 256 << 20
+
+
+class ResultsCache:
+    """Results files stored by key, with a maximal total size
+
+    Parameters
+    ----------
+    directory : str
+        Cache directory
+    max_size : int, optional
+        Maximal size of the cache in bytes, by default 256 MB
+    """
+
+    def __init__(
+        self,
+        directory: str,
+        max_size: int = DEFAULT_MAX_SIZE,
+    ) -> None:
+        self.directory = os.path.expanduser(directory)
+        self.max_size = max_size
+
+    @staticmethod
+    def key(
+        infra_path: str,
+        simulation_path: str,
+        jar_path: str,
+    ) -> str:
+        """Key of the results of a simulation
+
+        The simulation file is always read, the infra file and the jar
+        only if their size or modification time changed (see files_hash).
+        """
+
+        h = hashlib.blake2b(digest_size=20)
+        h.update(files_hash(infra_path, jar_path).encode())
+        with open(simulation_path, 'rb') as f:
+            h.update(hashlib.blake2b(f.read(), digest_size=20).digest())
+        return h.hexdigest()
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, key[:2], key + '.json')
+
+    def get(
+        self,
+        key: str,
+        results_path: str,
+    ) -> bool:
+        """Copy the cached results of a key to results_path, if any
+
+        Returns
+        -------
+        bool
+            True if the key was in the cache
+        """
+
+        path = self._path(key)
+        try:
+            shutil.copyfile(path, results_path)
+        except FileNotFoundError:
+            return False
+        os.utime(path)  # recently used, see evict()
+        return True
+
+    def put(
+        self,
+        key: str,
+        results_path: str,
+    ) -> None:
+        """Store a copy of a results file under a key"""
+
+        path = self._path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = path + f'.{os.getpid()}.tmp'
+        shutil.copyfile(results_path, tmp_path)
+        os.replace(tmp_path, path)
+        self.evict()
+
+    def entries(self) -> list[tuple[str, int, int]]:
+        """(path, size, last use time in ns) of the cached results,
+        least recently used first"""
+        return cache_entries(self.directory, '.json')
+
+    def size(self) -> int:
+        """Total size of the cached results in bytes"""
+        return sum(size for _, size, _ in self.entries())
+
+    def evict(self) -> list[str]:
+        """Remove the least recently used results until the cache fits
+        in its maximal size
+
+        Returns
+        -------
+        list[str]
+            Paths of the removed results
+        """
+        return evict_(self.directory, self.max_size, '.json')
+
+    def clear(self) -> None:
+        """Remove all the cached results"""
+        shutil.rmtree(self.directory, ignore_errors=True)
+
+
+def results_cache() -> ResultsCache | None:
+    """Results cache configured by the environment, None if disabled
+    (by default)"""
+
+    directory = os.getenv('PYOSRD_RESULTS_CACHE')
+    if directory in (None, '', '0'):
+        return None
+    return ResultsCache(
+        directory,
+        cache_max_size('results', DEFAULT_MAX_SIZE),
+    )
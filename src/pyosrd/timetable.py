@@ -0,0 +1,177 @@
+"""Import of timetables given as tables into simulations
+
+A timetable has one row per train and platform served, with columns
+'train', 'station', 'platform' (track name), 'time' (seconds or
+'hh:mm:ss') and optionally 'rolling_stock'. Each train serves its
+platforms in the order of their times. Only the first time of a train
+(its departure) is simulated: the other ones only set the order of the
+platforms, the train running at its rolling stock speed between them
+(see `import_timetable`). Platforms are resolved to
+locations with one lookup in the station catalog of the infra, checks are
+done on whole columns, and all trains are added with `add_trains()`, so
+that the simulation file is written once.
+
+>>> sim.import_timetable('timetable.csv')
+"""
+import numpy as np
+import pandas as pd
+
+from pyosrd.infra.stations_and_platforms import platform_locations
+
+TIMETABLE_COLUMNS = ['train', 'station', 'platform', 'time']
+
+
+def read_timetable(
+    path: str,
+) -> pd.DataFrame:
+    """Read a timetable from a csv or a parquet file"""
+
+    if path.endswith('.parquet'):
+        return pd.read_parquet(path)
+    return pd.read_csv(path, dtype={'train': str, 'platform': str})
+
+
+def _seconds(times: pd.Series) -> np.ndarray:
+    """Times in seconds, from numbers or 'hh:mm:ss' strings"""
+
+    if pd.api.types.is_numeric_dtype(times):
+        return times.to_numpy(dtype=float)
+    return pd.to_timedelta(times).dt.total_seconds().to_numpy()
+
+
+def timetable_trains(
+    self,
+    timetable: pd.DataFrame,
+    rolling_stock: str = 'fast_rolling_stock',
+) -> list[dict]:
+    """Arguments of add_trains for the trains of a timetable
+
+    Parameters
+    ----------
+    timetable : pd.DataFrame
+        One row per train and platform served, see module docstring
+    rolling_stock : str, optional
+        Rolling stock of the trains without one, by default
+        'fast_rolling_stock'
+
+    Returns
+    -------
+    list[dict]
+        label, locations, departure_time and rolling_stock of each train,
+        in the order of their first appearance in the timetable
+
+    Raises
+    ------
+    ValueError
+        If columns are missing, platforms are unknown, times are missing
+        or equal for a train, or a train serves less than 2 platforms
+    """
+
+    missing = [c for c in TIMETABLE_COLUMNS if c not in timetable.columns]
+    if missing:
+        raise ValueError(f"Missing timetable columns: {missing}")
+
+    df = timetable.reset_index(drop=True)
+    locations = platform_locations(
+        self,
+        list(zip(df.station, df.platform.astype(str))),
+    )
+    unknown = locations.track_section.isna().to_numpy()
+    if unknown.any():
+        raise ValueError(
+            "Unknown platforms: "
+            + ', '.join(
+                f"{s} {p}"
+                for s, p in locations.loc[unknown, ['station', 'track_name']]
+                .drop_duplicates()
+                .itertuples(index=False)
+            )
+        )
+
+    trains = df.train.astype(str).to_numpy()
+    labels, first, codes = np.unique(
+        trains,
+        return_index=True,
+        return_inverse=True,
+    )
+    times = _seconds(df.time)
+
+    if np.isnan(times).any():
+        raise ValueError(
+            "Missing times for trains: "
+            + ', '.join(np.unique(trains[np.isnan(times)]))
+        )
+
+    # Platforms of each train in the order of their times
+    order = np.lexsort((times, codes))
+    codes, times = codes[order], times[order]
+    starts = np.flatnonzero(np.diff(codes, prepend=-1))
+
+    same_time = (codes[1:] == codes[:-1]) & (np.diff(times) == 0)
+    if same_time.any():
+        raise ValueError(
+            "Several platforms at the same time for trains: "
+            + ', '.join(np.unique(labels[codes[1:][same_time]]))
+        )
+    sizes = np.diff(np.append(starts, len(codes)))
+    if (sizes < 2).any():
+        raise ValueError(
+            "Trains serving less than 2 platforms: "
+            + ', '.join(labels[codes[starts[sizes < 2]]])
+        )
+
+    if 'rolling_stock' in df.columns:
+        rolling_stocks = (
+            df.rolling_stock.fillna(rolling_stock).to_numpy()[order]
+        )
+    else:
+        rolling_stocks = np.full(len(df), rolling_stock, dtype=object)
+
+    tracks = locations.track_section.to_numpy()[order].tolist()
+    offsets = locations.offset.to_numpy(dtype=float)[order].tolist()
+    specs = [
+        {
+            'label': str(labels[codes[start]]),
+            'locations': list(zip(tracks[start:end], offsets[start:end])),
+            'departure_time': times[start].item(),
+            'rolling_stock': str(rolling_stocks[start]),
+        }
+        for start, end in zip(starts, np.append(starts[1:], len(codes)))
+    ]
+    # specs are sorted by label, labels[i] being the one of specs[i]
+    return [specs[i] for i in np.argsort(first)]
+
+
+def import_timetable(
+    self,
+    timetable: pd.DataFrame | str,
+    rolling_stock: str = 'fast_rolling_stock',
+) -> list[str]:
+    """Add the trains of a timetable to the simulation
+
+    Each train departs from its first platform at its first time and
+    runs through its other platforms in the order of their times. These
+    later times are not honoured (add_trains() only takes a departure
+    time): the trains neither stop nor wait at their platforms, use
+    add_scheduled_points() or stop_train() afterwards to do so.
+
+    Parameters
+    ----------
+    timetable : pd.DataFrame | str
+        Timetable or path of a csv or parquet file, see module docstring
+    rolling_stock : str, optional
+        Rolling stock of the trains without one, by default
+        'fast_rolling_stock'
+
+    Returns
+    -------
+    list[str]
+        Labels of the added trains
+    """
+
+    if isinstance(timetable, str):
+        timetable = read_timetable(timetable)
+
+    trains = timetable_trains(self, timetable, rolling_stock)
+    self.add_trains(trains)
+    return [train['label'] for train in trains]
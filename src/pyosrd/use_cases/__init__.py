@@ -1,6 +1,11 @@
 import pkgutil
 import os
 
+from pyosrd.utils.rolling_stocks import set_rolling_stocks
+
+# builders of use cases are also called without OSRD
+set_rolling_stocks()
+
 __all__ = [
     module
     for _, module, _ in pkgutil.iter_modules([os.path.dirname(__file__)])
@@ -0,0 +1,114 @@
+"""User cache directory of pyosrd
+
+Data derived from the case files (parsed infras, OSRD results, dashboard
+pages) is cached under the directory given by the PYOSRD_CACHE_DIR
+environment variable, by default `$XDG_CACHE_HOME/pyosrd` or
+`~/.cache/pyosrd`, never next to the case files. Caches are disabled if
+it is set to an empty string or 0.
+
+The maximal size in bytes of a cache is given by the
+PYOSRD_<NAME>_CACHE_SIZE environment variable (see `cache_max_size`),
+the least recently used files being removed beyond it (see `evict`).
+"""
+import os
+
+
+def cache_dir(name: str) -> str | None:
+    """Directory of a cache, None if caches are disabled
+
+    Parameters
+    ----------
+    name : str
+        Name of the cache (sub-directory)
+    """
+
+    directory = os.getenv('PYOSRD_CACHE_DIR')
+    if directory is None:
+        directory = os.path.join(
+            os.getenv('XDG_CACHE_HOME') or os.path.join('~', '.cache'),
+            'pyosrd',
+        )
+    if directory in ('', '0'):
+        return None
+    return os.path.join(os.path.expanduser(directory), name)
+
+
+def cache_max_size(
+    name: str,
+    default: int,
+) -> int:
+    """Maximal size of a cache in bytes, from PYOSRD_<NAME>_CACHE_SIZE
+
+    Parameters
+    ----------
+    name : str
+        Name of the cache, e.g. 'infra' for PYOSRD_INFRA_CACHE_SIZE
+    default : int
+        Size if the environment variable is not set
+    """
+
+    return int(os.getenv(f'PYOSRD_{name.upper()}_CACHE_SIZE', default))
+
+
+def cache_entries(
+    directory: str,
+    suffix: str,
+) -> list[tuple[str, int, int]]:
+    """(path, size, last use time in ns) of the files of a cache
+    directory (and its sub-directories) ending with suffix, least recently
+    used first
+
+    The last use time is the modification time, that caches update with
+    `os.utime` when they read a file.
+    """
+
+    entries = []
+    for root, _, names in os.walk(directory):
+        for name in names:
+            if not name.endswith(suffix):
+                continue
+            path = os.path.join(root, name)
+            try:
+                stat = os.stat(path)
+            except FileNotFoundError:  # removed by another process
+                continue
+            entries.append((path, stat.st_size, stat.st_mtime_ns))
+    return sorted(entries, key=lambda e: e[2])
+
+
+def evict(
+    directory: str,
+    max_size: int,
+    suffix: str,
+) -> list[str]:
+    """Remove the least recently used files of a cache directory until
+    they fit in max_size bytes
+
+    Parameters
+    ----------
+    directory : str
+        Cache directory
+    max_size : int
+        Maximal total size of the files in bytes
+    suffix : str
+        Suffix of the cached files
+
+    Returns
+    -------
+    list[str]
+        Paths of the removed files
+    """
+
+    entries = cache_entries(directory, suffix)
+    total = sum(size for _, size, _ in entries)
+    removed = []
+    for path, size, _ in entries:
+        if total <= max_size:
+            break
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+        total -= size
+        removed.append(path)
+    return removed
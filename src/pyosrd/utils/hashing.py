@@ -0,0 +1,31 @@
+"""Content hashes of files, used as cache keys"""
+import hashlib
+import os
+
+_hashes: dict[str, tuple[int, int, str]] = dict()
+
+
+def files_hash(*paths: str) -> str:
+    """Hash of the content of files, missing files being hashed as empty
+
+    The hash of a file is not recomputed while its size and modification
+    time are unchanged.
+    """
+
+    h = hashlib.blake2b(digest_size=20)
+    for path in paths:
+        try:
+            stat = os.stat(path)
+        except FileNotFoundError:
+            h.update(b'\0')
+            continue
+        size, mtime, file_hash = _hashes.get(path, (None, None, None))
+        if (size, mtime) != (stat.st_size, stat.st_mtime_ns):
+            file_hash = hashlib.blake2b(digest_size=20)
+            with open(path, 'rb') as f:
+                while chunk := f.read(1 << 20):
+                    file_hash.update(chunk)
+            file_hash = file_hash.hexdigest()
+            _hashes[path] = (stat.st_size, stat.st_mtime_ns, file_hash)
+        h.update(file_hash.encode())
+    return h.hexdigest()
@@ -0,0 +1,24 @@
+"""Rolling stocks shipped with pyosrd
+
+railjson_generator builds simulations with the rolling stocks of its
+`ROLLING_STOCKS` dict: modules building simulations (modify_simulation
+and the use_cases package) call `set_rolling_stocks()` so that it holds
+those of pyosrd.
+"""
+import json
+
+from importlib.resources import files
+
+ROLLING_STOCKS = {}
+for path in files('pyosrd').joinpath('rolling_stocks/').iterdir():
+    if path.suffix == '.json':
+        with open(path) as f:
+            rs = json.load(f)
+            ROLLING_STOCKS[rs["name"]] = rs
+
+
+def set_rolling_stocks() -> None:
+    """Use the rolling stocks of pyosrd in railjson_generator simulations"""
+
+    from railjson_generator.schema.simulation import simulation
+    simulation.ROLLING_STOCKS = ROLLING_STOCKS
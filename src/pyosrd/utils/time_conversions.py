@@ -1,5 +1,4 @@
 import datetime
-import pandas as pd
 
 
 def hour_to_seconds(hour: str) -> int:
@@ -31,6 +30,8 @@ def hour_to_seconds(hour: str) -> int:
     >>> hour_to_seconds('20:00')
     72000
     """
+    import pandas as pd
+
     return (pd.to_datetime(hour)-pd.to_datetime('0:00')).seconds
 
 
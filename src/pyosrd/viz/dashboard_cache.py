@@ -0,0 +1,210 @@
+"""Cache of the maps and charts served by the dashboard
+
+Maps (HTML), plotly figures and arrays are built once per key, usually
+the hash of the results files they are drawn from (`files_hash()`), kept
+in memory with least recently used eviction and, if a directory is
+given, saved to disk so that they survive restarts and are shared by
+several processes, only the most recently used keys being kept on disk.
+
+>>> cache = DashboardCache(cache_dir('dashboard'), max_keys=64)
+>>> key = files_hash('case/results.json')
+>>> html = cache.get(key, 'map', lambda: render_map(sim.folium_results()))
+"""
+import os
+import shutil
+import threading
+from collections import OrderedDict
+from typing import Any, Callable
+
+import numpy as np
+import plotly.io as pio
+from plotly import graph_objects as go
+
+from pyosrd.utils.hashing import files_hash  # noqa: F401
+
+
+def _save(path: str, value: Any) -> bool:
+    """Write a value to path + an extension depending on its type"""
+
+    if isinstance(value, str):
+        path, content = path + '.html', value
+    elif isinstance(value, go.Figure):
+        path, content = path + '.json', value.to_json()
+    elif isinstance(value, np.ndarray):
+        path, content = path + '.npy', value
+    else:
+        return False
+
+    tmp_path = path + f'.{os.getpid()}.tmp'
+    if isinstance(content, np.ndarray):
+        with open(tmp_path, 'wb') as f:
+            np.save(f, content, allow_pickle=False)
+    else:
+        with open(tmp_path, 'w') as f:
+            f.write(content)
+    os.replace(tmp_path, path)
+    return True
+
+
+def _load(path: str) -> Any:
+    """Value saved by _save, None if there is none"""
+
+    if os.path.exists(path + '.html'):
+        with open(path + '.html') as f:
+            return f.read()
+    if os.path.exists(path + '.json'):
+        with open(path + '.json') as f:
+            return pio.from_json(f.read())
+    if os.path.exists(path + '.npy'):
+        return np.load(path + '.npy', allow_pickle=False)
+    return None
+
+
+class DashboardCache:
+    """Values built once per key and name, with LRU eviction in memory
+
+    Parameters
+    ----------
+    directory : str | None, optional
+        Where HTML strings, plotly figures and arrays are also saved,
+        in one sub-directory per key, by default None (memory only)
+    maxsize : int, optional
+        Number of values kept in memory, by default 32
+    max_keys : int | None, optional
+        Number of keys kept on disk, the least recently used ones being
+        removed when a new key is saved (see `prune()`), by default None
+        (no limit)
+
+    Attributes
+    ----------
+    stats : dict[str, int]
+        Number of values found in memory ('hits'), read from disk
+        ('disk_hits') and built ('misses')
+    """
+
+    def __init__(
+        self,
+        directory: str | None = None,
+        maxsize: int = 32,
+        max_keys: int | None = None,
+    ) -> None:
+        self.directory = directory
+        self.maxsize = maxsize
+        self.max_keys = max_keys
+        self.stats = {'hits': 0, 'disk_hits': 0, 'misses': 0}
+        self._values: OrderedDict[tuple[str, str], Any] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._values)
+
+    def __contains__(self, key_and_name: tuple[str, str]) -> bool:
+        return key_and_name in self._values
+
+    def _path(self, key: str, name: str) -> str | None:
+        if self.directory is None:
+            return None
+        return os.path.join(self.directory, key, name)
+
+    def _put(self, key: str, name: str, value: Any) -> None:
+        with self._lock:
+            self._values[(key, name)] = value
+            self._values.move_to_end((key, name))
+            while len(self._values) > self.maxsize:
+                self._values.popitem(last=False)
+
+    def get(
+        self,
+        key: str,
+        name: str,
+        build: Callable[[], Any],
+    ) -> Any:
+        """Value of a key and name, built by build() if not cached
+
+        Parameters
+        ----------
+        key : str
+            Key of the data the value is built from (e.g. files_hash())
+        name : str
+            Name of the value (file name on disk, without extension)
+        build : Callable[[], Any]
+            Function building the value
+
+        Returns
+        -------
+        Any
+            The cached or built value
+        """
+
+        with self._lock:
+            if (key, name) in self._values:
+                self._values.move_to_end((key, name))
+                self.stats['hits'] += 1
+                return self._values[(key, name)]
+
+        path = self._path(key, name)
+        value = _load(path) if path is not None else None
+        if value is not None:
+            self.stats['disk_hits'] += 1
+            os.utime(os.path.dirname(path))  # recently used, see prune()
+        else:
+            self.stats['misses'] += 1
+            value = build()
+            if path is not None:
+                new_key = not os.path.isdir(os.path.dirname(path))
+                os.makedirs(os.path.dirname(path), exist_ok=True)
+                _save(path, value)
+                if new_key and self.max_keys is not None:
+                    self.prune(self.max_keys)
+
+        self._put(key, name, value)
+        return value
+
+    def clear(
+        self,
+        disk: bool = False,
+    ) -> None:
+        """Empty the memory cache and, if disk, the cache directory"""
+
+        with self._lock:
+            self._values.clear()
+        if disk and self.directory is not None:
+            shutil.rmtree(self.directory, ignore_errors=True)
+
+    def keys_on_disk(self) -> list[str]:
+        """Keys saved in the cache directory, most recently used last"""
+
+        if self.directory is None or not os.path.isdir(self.directory):
+            return []
+        keys = [
+            entry for entry in os.scandir(self.directory) if entry.is_dir()
+        ]
+        return [
+            entry.name
+            for entry in sorted(keys, key=lambda e: e.stat().st_mtime_ns)
+        ]
+
+    def prune(
+        self,
+        max_keys: int,
+    ) -> list[str]:
+        """Remove from disk all keys but the max_keys most recent ones
+
+        Returns
+        -------
+        list[str]
+            Removed keys
+        """
+
+        keys = self.keys_on_disk()
+        removed = keys[:max(len(keys) - max_keys, 0)]
+        for key in removed:
+            shutil.rmtree(
+                os.path.join(self.directory, key),
+                ignore_errors=True
+            )
+        with self._lock:
+            for key_and_name in list(self._values):
+                if key_and_name[0] in removed:
+                    del self._values[key_and_name]
+        return removed
@@ -6,31 +6,26 @@ from matplotlib.axes._axes import Axes
 from plotly import graph_objects as go
 
 from pyosrd.utils import seconds_to_hour
-from pyosrd.delays_between_simulations import calculate_delay_f_time
+from pyosrd.delays_between_simulations import delays_f_time
 
 def _delays_interp(
     self,
     ref_sim,
-    eco_or_base = 'base'
-
-) -> dict[str, list[float]]:
-    ...
-    tmin, tmax = min(self.departure_times), round(max(self.last_arrival_times))
-    time_interp = np.linspace(tmin, tmax, int(tmax-tmin)+1)
-
-    delays_interp = {'time': time_interp}
-    for train in self.trains:
-        t = [r['time'] for r in self._head_position(train, eco_or_base)]
-        delay = calculate_delay_f_time(self, ref_sim, train, eco_or_base)
-        delay_interp = np.interp(
-            time_interp,
-            t,
-            delay
-        )
-        delays_interp[train] = [
-            delay_interp[i] if time > min(t) else 0
-            for i, time in enumerate(time_interp)
-    ]
+    eco_or_base = 'base',
+    resolution: float = 1.,
+) -> dict[str, np.ndarray]:
+    """Times and delays of each train, sampled every resolution seconds"""
+
+    time, delays = delays_f_time(
+        self,
+        ref_sim,
+        eco_or_base=eco_or_base,
+        resolution=resolution,
+    )
+
+    delays_interp = {'time': time}
+    for i, train in enumerate(self.trains):
+        delays_interp[train] = delays[:, i]
 
     return delays_interp
 
@@ -38,13 +33,15 @@ def _delays_interp(
 def delays_chart_plotly(
     self,
     ref_sim,
-    eco_or_base: str = 'base'
+    eco_or_base: str = 'base',
+    resolution: float = 1.,
 ) -> go.Figure:
     
     data = _delays_interp(
         self,
         ref_sim,
-        eco_or_base=eco_or_base
+        eco_or_base=eco_or_base,
+        resolution=resolution,
     )
 
     time = data['time']
@@ -90,13 +87,15 @@ def delays_chart_plotly(
 def delays_chart(    
     self,
     ref_sim,
-    eco_or_base: str = 'base'
+    eco_or_base: str = 'base',
+    resolution: float = 1.,
 ) -> Axes:
     
     data = _delays_interp(
         self,
         ref_sim,
-        eco_or_base=eco_or_base
+        eco_or_base=eco_or_base,
+        resolution=resolution,
     )
         
     time = data['time']
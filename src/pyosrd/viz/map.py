@@ -1,91 +1,122 @@
 
+import itertools
+import json
+import os
+import time
+import warnings
+
+from typing import Any
+
 import distinctipy
 import folium
 import folium.plugins
 import numpy as np
 
-from haversine import haversine
-
 from .result_to_geojson import res2geojson
-
-def folium_map(
+from .simplify import simplify_line, zoom_tolerance
+
+# Layer name, DivIcon and color (lightweight and clustered modes) of
+# each kind of marker
+MARKER_LAYERS = {
+    'detectors': {
+        'name': 'Detectors',
+        'icon': dict(html="""
+                    <i class="fas fa-equals fa-rotate-by"
+                    style='font-size: 14px; --fa-rotate-angle: -45deg'></i>
+                """),
+        'color': 'black',
+    },
+    'buffer_stops': {
+        'name': 'Buffer Stops',
+        'icon': dict(html="""
+            <div><svg>
+                <rect x="-5" y="-5" width="20"
+                height="20", fill="black", opacity=".8" />
+            </svg></div>"""),
+        'color': '#333',
+    },
+    'signals': {
+        'name': 'Signals',
+        'icon': dict(
+            html="""
+            <i class="fa fa-traffic-light" style='border: 0px solid red; font-size:24px; color: #555'></i><br/>""",  # noqa
+            icon_size=[25, 50],
+        ),
+        'color': '#555',
+    },
+    'operational_points': {
+        'name': 'Operational Points',
+        'icon': dict(html="""
+            <div><svg>
+                <circle cx="5" cy="5" r="5", fill="cyan", opacity=".9" />
+            </svg></div>"""),
+        'color': 'cyan',
+    },
+    'platforms': {
+        'name': 'Stations',
+        'icon': dict(
+            html="""<i class="fas fa-house-user" style='font-size: 24px'></i>""",  # noqa
+            icon_size=[50, 50],
+        ),
+        'color': 'blue',
+    },
+    'switches': {
+        'name': 'Switches',
+        'icon': dict(html="""
+            <div><svg>
+                <circle cx="5" cy="5" r="5", fill="black", opacity=".8" />
+            </svg></div>"""),
+        'color': 'black',
+    },
+}
+
+# Colors of the zones in the lightweight and clustered modes, cycled
+# (distinctipy colors cost a quadratic time in the number of zones)
+ZONE_COLORS = [
+    '#1f77b4', '#ff7f0e', '#2ca02c', '#d62728', '#9467bd',
+    '#8c564b', '#e377c2', '#7f7f7f', '#bcbd22', '#17becf',
+]
+
+_CLUSTER_CALLBACK = """
+function (row) {
+    var marker = L.circleMarker(
+        new L.LatLng(row[0], row[1]),
+        {radius: 5, color: '%s', fill: true, fillOpacity: .8}
+    );
+    marker.bindPopup(row[2]);
+    return marker;
+}
+"""
+
+
+def _marker_positions(
     osrd,
-    markers: list[str] | None = None,
-    fit: bool=True
-) -> folium.folium.Map:
-    """Infra as a folium map"""
+    shown: set[str],
+) -> dict[str, dict[Any, tuple[list[float], str]]]:
+    """[lat, lng] and popup of the markers of each layer (keys of
+    MARKER_LAYERS) located on the shown track sections"""
 
     track_section_names = {
         track['id']: track['extensions']['sncf']['track_name']
         for track in osrd.infra['track_sections']
     }
 
-    TRACK_SECTIONS_COORDINATES = {
-        ts['id']: [(point[1], point[0]) for point in ts['geo']['coordinates']]
-        for ts in osrd.infra['track_sections']
-    }
-
-    track_section_geo_lengths = dict()
-    for ts in osrd.infra['track_sections']:
-        geo_length = 0
-        for i, _ in enumerate(coords:= ts['geo']['coordinates']):
-            if i > 0:
-                geo_length += round(haversine(
-                    coords[i][::-1],
-                    coords[i-1][::-1],
-                    unit='m'
-                ), 2)
-        track_section_geo_lengths[ts['id']] = geo_length
-
-    def coords_from_position_on_track(
-        track_section: str,
-        position: float,
-    ) -> list[float]:
-        length = osrd.track_section_lengths[track_section]
-        pos = position / length
-        
-        geo_lengths = [0]
-        for i, _ in enumerate(coords:=  TRACK_SECTIONS_COORDINATES[track_section]):
-            if i > 0:
-                geo_lengths.append(
-                    round(haversine(
-                        coords[i][::-1],
-                        coords[i-1][::-1],
-                        unit='m'
-                    ), 2) + geo_lengths[i-1]
-                )
-        positions = [length / geo_lengths[-1] for length in geo_lengths]
-
-        lats = [coord[0] for coord in TRACK_SECTIONS_COORDINATES[track_section]]
-        lngs = [coord[1] for coord in TRACK_SECTIONS_COORDINATES[track_section]]
-        return [
-            np.interp([pos], positions, lats).item(),
-            np.interp([pos], positions, lngs).item(),
-        ]
-
-    detector_geo_positions = {
-        detector['id']: coords_from_position_on_track(
-            detector['track'],
-            detector['position']
-        )
-        for detector in osrd.infra['detectors']
-    }
-
-    buffer_stop_geo_positions = {
-        buffer_stop['id']: coords_from_position_on_track(
-            buffer_stop['track'],
-            buffer_stop['position']
+    geometry = osrd.track_geometry()
+
+    def geo_positions(
+        locations: dict[Any, tuple[str, float]],
+        popups: dict[Any, str] | None = None,
+    ) -> dict[Any, tuple[list[float], str]]:
+        """[lat, lng] and popup of locations given as
+        (track section, position)"""
+        coords = geometry.coordinates(
+            [track for track, _ in locations.values()],
+            [position for _, position in locations.values()],
         )
-        for buffer_stop in osrd.infra['buffer_stops']
-    }
-
-    signal_geo_positions = {
-        signal['id']: coords_from_position_on_track(
-            signal['track'],
-            signal['position']
-        )
-        for signal in osrd.infra['signals']
-    }
+        return {
+            key: (position, key if popups is None else popups[key])
+            for key, position in zip(locations.keys(), coords.tolist())
+        }
 
     operational_point_names = {
         (operational_point['id'], part['track']): (
@@ -101,16 +132,6 @@ def folium_map(
         for part in operational_point['parts']
     }
 
-    operational_point_geo_positions = {
-        (operational_point['id'], part['track']):
-            coords_from_position_on_track(
-                part['track'],
-                part['position']
-            )
-        for operational_point in osrd.infra['operational_points']
-        for part in operational_point['parts']
-    }
-
     platform_names = {
         (operational_point['id'], part['track']): (
             (
@@ -126,31 +147,175 @@ def folium_map(
         if operational_point['extensions']['sncf']['ch'] in ['BV', '00']
     }
 
-    platform_geo_positions = {
-        (operational_point['id'], part['track']):
-            coords_from_position_on_track(
-                part['track'],
-                part['position']
-            )
-        for operational_point in osrd.infra['operational_points']
-        for part in operational_point['parts']
-        if operational_point['extensions']['sncf']['ch'] in ['BV', '00']
+    switch_ports = {
+        switch['id']: next(iter(switch['ports'].values()))
+        for switch in osrd.infra['switches']
+        if switch['switch_type'] != 'link'
     }
 
-    switch_geo_positions = {
-        switch['id']: coords_from_position_on_track(
-            switch['ports'][list(switch['ports'].keys())[0]]['track'],
-            0
-            if (
-                switch['ports'][list(switch['ports'].keys())[0]]['endpoint']
-                == 'BEGIN'
+    return {
+        'detectors': geo_positions({
+            detector['id']: (detector['track'], detector['position'])
+            for detector in osrd.infra['detectors']
+            if detector['track'] in shown
+        }),
+        'buffer_stops': geo_positions({
+            buffer_stop['id']: (buffer_stop['track'], buffer_stop['position'])
+            for buffer_stop in osrd.infra['buffer_stops']
+            if buffer_stop['track'] in shown
+        }),
+        'signals': geo_positions({
+            signal['id']: (signal['track'], signal['position'])
+            for signal in osrd.infra['signals']
+            if signal['track'] in shown
+        }),
+        'operational_points': geo_positions(
+            {
+                (operational_point['id'], part['track']):
+                    (part['track'], part['position'])
+                for operational_point in osrd.infra['operational_points']
+                for part in operational_point['parts']
+                if part['track'] in shown
+            },
+            operational_point_names,
+        ),
+        'platforms': geo_positions(
+            {
+                (operational_point['id'], part['track']):
+                    (part['track'], part['position'])
+                for operational_point in osrd.infra['operational_points']
+                for part in operational_point['parts']
+                if operational_point['extensions']['sncf']['ch']
+                in ['BV', '00']
+                and part['track'] in shown
+            },
+            platform_names,
+        ),
+        'switches': geo_positions({
+            id: (
+                port['track'],
+                0
+                if port['endpoint'] == 'BEGIN'
+                else osrd.track_section_lengths[port['track']]
             )
-            else osrd.track_section_lengths[
-                switch['ports'][list(switch['ports'].keys())[0]]['track']
-            ]
-        )
-        for switch in osrd.infra['switches']
-        if switch['switch_type'] != 'link'
+            for id, port in switch_ports.items()
+            if port['track'] in shown
+        }),
+    }
+
+
+def _zones_geojson(
+    zones_limits: dict[str, set[str]],
+    limits_geo_positions: dict[str, tuple[list[float], str]],
+) -> dict[str, Any]:
+    """Bounding rectangles of the zones (of their limits) as a GeoJSON
+    FeatureCollection, colored with ZONE_COLORS"""
+
+    colors = itertools.cycle(ZONE_COLORS)
+    features = []
+    for zone, limits in zones_limits.items():
+        coords = np.array([
+            limits_geo_positions[d][0]
+            for d in limits
+            if d in limits_geo_positions
+        ]).reshape(-1, 2)  # [lat, lng]
+        if not len(coords):
+            continue
+        (min_lat, min_lng), (max_lat, max_lng) = \
+            coords.min(axis=0).tolist(), coords.max(axis=0).tolist()
+        features.append({
+            'type': 'Feature',
+            'geometry': {
+                'type': 'Polygon',
+                'coordinates': [[
+                    [min_lng, min_lat],
+                    [max_lng, min_lat],
+                    [max_lng, max_lat],
+                    [min_lng, max_lat],
+                    [min_lng, min_lat],
+                ]],
+            },
+            'properties': {'name': zone, 'color': next(colors)},
+        })
+    return {'type': 'FeatureCollection', 'features': features}
+
+
+def folium_map(
+    osrd,
+    markers: list[str] | None = None,
+    fit: bool=True,
+    bounds: tuple[float, float, float, float] | None = None,
+    lightweight: bool = False,
+    cluster: bool = False,
+    simplify_zoom: int | None = None,
+    max_size: int | None = None,
+    max_time: float | None = None,
+) -> folium.folium.Map:
+    """Infra as a folium map
+
+    If bounds (min_lat, max_lat, min_lng, max_lng) are given, only the
+    track sections intersecting them (and the elements on these track
+    sections) are drawn.
+
+    For large infras, lightweight=True draws all the track sections in a
+    single GeoJSON layer and each kind of marker in a single GeoJSON layer
+    of circle markers instead of one element with its own HTML icon each,
+    cluster=True groups the markers in clusters built by the browser and
+    simplify_zoom simplifies the track sections geometries so that they
+    differ by less than one pixel from the original ones at this zoom
+    level.
+
+    In these modes, the zones are drawn as a single GeoJSON layer of
+    rectangles colored from ZONE_COLORS, and with cluster=True their
+    limits are clustered markers too.
+
+    Statistics of the map (number of features per layer, number of points
+    before and after simplification, build time and, if max_size is
+    given, size of the generated HTML in bytes) are stored in its `stats`
+    attribute, and a warning is raised if the size or the build time
+    (in seconds) exceed max_size or max_time. Once the build time exceeds
+    max_time, the remaining markers and zones layers are skipped (and
+    listed in `stats['skipped']`).
+    """
+
+    tic = time.perf_counter()
+
+    track_section_names = {
+        track['id']: track['extensions']['sncf']['track_name']
+        for track in osrd.infra['track_sections']
+    }
+
+    track_sections = osrd.infra['track_sections']
+    if bounds is not None:
+        in_bounds = set(osrd.spatial_index().rectangle(*bounds))
+        track_sections = [
+            ts for ts in track_sections if ts['id'] in in_bounds
+        ]
+    shown = {ts['id'] for ts in track_sections}
+
+    tolerance = (
+        0. if simplify_zoom is None else zoom_tolerance(simplify_zoom)
+    )
+    TRACK_SECTIONS_COORDINATES = {
+        ts['id']: simplify_line(ts['geo']['coordinates'], tolerance)
+        for ts in track_sections
+    }  # [lng, lat]
+
+    positions = _marker_positions(osrd, shown)
+
+    stats = {
+        'features': {'tracks': len(TRACK_SECTIONS_COORDINATES)} | {
+            layer: len(layer_positions)
+            for layer, layer_positions in positions.items()
+        },
+        'points': {
+            'raw': sum(
+                len(ts['geo']['coordinates']) for ts in track_sections
+            ),
+            'drawn': sum(
+                len(line) for line in TRACK_SECTIONS_COORDINATES.values()
+            ),
+        },
     }
 
     m = folium.Map(location=[49.5, -0.4],tiles=None)
@@ -159,95 +324,96 @@ def folium_map(
     folium.TileLayer("openstreetmap", name="OpenStreetMap", attr="blank", show=False).add_to(m)
     folium.TileLayer("", name="None", attr="blank", show=False).add_to(m)
 
-    tracks = folium.FeatureGroup(name='Rails')
-    for id, line in TRACK_SECTIONS_COORDINATES.items():
-        folium.PolyLine(
-            line,
-            tooltip=track_section_names[id],
-            color='black',
-            weight=1
-        ).add_to(tracks)
+    if lightweight:
+        tracks = folium.GeoJson(
+            {
+                'type': 'FeatureCollection',
+                'features': [
+                    {
+                        'type': 'Feature',
+                        'geometry': {
+                            'type': 'LineString',
+                            'coordinates': line.tolist(),
+                        },
+                        'properties': {'name': track_section_names[id]},
+                    }
+                    for id, line in TRACK_SECTIONS_COORDINATES.items()
+                ],
+            },
+            name='Rails',
+            style_function=lambda _: {'color': 'black', 'weight': 1},
+            tooltip=folium.GeoJsonTooltip(fields=['name'], labels=False),
+        )
+    else:
+        tracks = folium.FeatureGroup(name='Rails')
+        for id, line in TRACK_SECTIONS_COORDINATES.items():
+            folium.PolyLine(
+                line[:, ::-1].tolist(),
+                tooltip=track_section_names[id],
+                color='black',
+                weight=1
+            ).add_to(tracks)
     tracks.add_to(m)
 
-    if fit:
+    if fit and TRACK_SECTIONS_COORDINATES:
         m.fit_bounds(tracks.get_bounds())
 
-    detectors = folium.FeatureGroup('Detectors', show=False)
-    for id, position in detector_geo_positions.items():
-        folium.Marker(
-            position,
-            popup=id,
-            icon=folium.DivIcon(
-                html="""
-                    <i class="fas fa-equals fa-rotate-by"
-                    style='font-size: 14px; --fa-rotate-angle: -45deg'></i>
-                """,
-            )
-            ).add_to(detectors)
-    detectors.add_to(m)
-
-    buffer_stops = folium.FeatureGroup('Buffer Stops', show=False)
-    for id, position in buffer_stop_geo_positions.items():
-        folium.Marker(
-            position,
-            popup=id,
-            icon=folium.DivIcon(html="""
-            <div><svg>
-                <rect x="-5" y="-5" width="20"
-                height="20", fill="black", opacity=".8" />
-            </svg></div>"""),
-            ).add_to(buffer_stops)
-    buffer_stops.add_to(m)
-
-    signals = folium.FeatureGroup('Signals', show=False)
-    for id, position in signal_geo_positions.items():
-        folium.Marker(
-            position,
-            popup=id,
-            icon=folium.DivIcon(
-            html="""
-            <i class="fa fa-traffic-light" style='border: 0px solid red; font-size:24px; color: #555'></i><br/>""",
-            icon_size=[25, 50],
-            # icon_anchor=(20, 0),
-            ),
-            ).add_to(signals)
-    signals.add_to(m)
-
-    operational_points = folium.FeatureGroup('Operational Points', show=False)
-    for id, position in operational_point_geo_positions.items():
-        folium.Marker(
-            position,
-            popup=operational_point_names[id],
-            icon=folium.DivIcon(html="""
-            <div><svg>
-                <circle cx="5" cy="5" r="5", fill="cyan", opacity=".9" />
-            </svg></div>"""),
-            ).add_to(operational_points)
-    operational_points.add_to(m)
-
-    platforms = folium.FeatureGroup('Stations', show=False)
-    for id, position in platform_geo_positions.items():
-        folium.Marker(
-            position,
-            popup=platform_names[id],
-            icon=folium.DivIcon(
-                """<i class="fas fa-house-user" style='font-size: 24px'></i>""",
-                icon_size=[50, 50]
-            )
-            ).add_to(platforms)
-    platforms.add_to(m)
-
-    switches = folium.FeatureGroup('Switches', show=False)
-    for id, position in switch_geo_positions.items():
-        folium.Marker(
-            position,
-            popup=id,
-            icon=folium.DivIcon(html="""
-            <div><svg>
-                <circle cx="5" cy="5" r="5", fill="black", opacity=".8" />
-            </svg></div>"""),
-            ).add_to(switches)
-    switches.add_to(m)
+    def over_time() -> bool:
+        return (
+            max_time is not None
+            and time.perf_counter() - tic > max_time
+        )
+
+    stats['skipped'] = []
+    for layer, style in MARKER_LAYERS.items():
+        layer_positions = positions[layer]
+        if over_time():
+            stats['skipped'].append(layer)
+        elif cluster:
+            folium.plugins.FastMarkerCluster(
+                [
+                    [*position, popup]
+                    for position, popup in layer_positions.values()
+                ],
+                callback=_CLUSTER_CALLBACK % style['color'],
+                name=style['name'],
+                show=False,
+            ).add_to(m)
+        elif lightweight:
+            folium.GeoJson(
+                {
+                    'type': 'FeatureCollection',
+                    'features': [
+                        {
+                            'type': 'Feature',
+                            'geometry': {
+                                'type': 'Point',
+                                'coordinates': position[::-1],
+                            },
+                            'properties': {'name': popup},
+                        }
+                        for position, popup in layer_positions.values()
+                    ],
+                },
+                name=style['name'],
+                show=False,
+                marker=folium.CircleMarker(
+                    radius=5,
+                    color=style['color'],
+                    fill=True,
+                    fill_opacity=.8,
+                ),
+                popup=folium.GeoJsonPopup(fields=['name'], labels=False),
+            ).add_to(m)
+        else:
+            group = folium.FeatureGroup(style['name'], show=False)
+            for position, popup in layer_positions.values():
+                folium.Marker(
+                    position,
+                    popup=popup,
+                    icon=folium.DivIcon(**style['icon']),
+                    ).add_to(group)
+            group.add_to(m)
 
     m.add_child(folium.plugins.Fullscreen())
 
@@ -257,56 +423,233 @@ def folium_map(
             zones_limits[zone] = set()
         for d in tvd.split('<->'):
             zones_limits[zone].add(d)
-    colors = distinctipy.get_colors(len(zones_limits))
-    colors_iter = (distinctipy.get_hex(c) for c in colors)
 
-    zones = folium.FeatureGroup('Zones', show=False)
-    limits_geo_positions = detector_geo_positions | buffer_stop_geo_positions
-    for zone, limits in zones_limits.items():
-        zone_group = folium.FeatureGroup(zone)
-        for d in limits:
-            folium.Marker(limits_geo_positions[d]).add_to(zone_group)
-        folium.Rectangle(
-            zone_group.get_bounds(),
-            popup=zone,
-            color=next(colors_iter),
-            fill=True,
-            weight=1,
-            name=zone,
-        ).add_to(zones)
-    zones.add_to(m)
+    limits_geo_positions = positions['detectors'] | positions['buffer_stops']
+    if over_time():
+        stats['skipped'].append('zones')
+    elif lightweight or cluster:
+        folium.GeoJson(
+            _zones_geojson(zones_limits, limits_geo_positions),
+            name='Zones',
+            show=False,
+            style_function=lambda feature: {
+                'color': feature['properties']['color'],
+                'fillColor': feature['properties']['color'],
+                'fillOpacity': .2,
+                'weight': 1,
+            },
+            popup=folium.GeoJsonPopup(fields=['name'], labels=False),
+        ).add_to(m)
+        if cluster:
+            limits_zones = dict()
+            for zone, limits in zones_limits.items():
+                for d in limits:
+                    limits_zones.setdefault(d, []).append(zone)
+            folium.plugins.FastMarkerCluster(
+                [
+                    [
+                        *limits_geo_positions[d][0],
+                        d + ': ' + ', '.join(zones),
+                    ]
+                    for d, zones in limits_zones.items()
+                    if d in limits_geo_positions
+                ],
+                callback=_CLUSTER_CALLBACK % 'black',
+                name='Zones limits',
+                show=False,
+            ).add_to(m)
+    else:
+        colors = distinctipy.get_colors(len(zones_limits))
+        colors_iter = (distinctipy.get_hex(c) for c in colors)
+
+        zones = folium.FeatureGroup('Zones', show=False)
+        for zone, limits in zones_limits.items():
+            limits = [d for d in limits if d in limits_geo_positions]
+            if not limits:
+                continue
+            zone_group = folium.FeatureGroup(zone)
+            for d in limits:
+                folium.Marker(limits_geo_positions[d][0]).add_to(zone_group)
+            folium.Rectangle(
+                zone_group.get_bounds(),
+                popup=zone,
+                color=next(colors_iter),
+                fill=True,
+                weight=1,
+                name=zone,
+            ).add_to(zones)
+        zones.add_to(m)
 
     if markers:
         for marker in markers:
-            for positions in [
-                buffer_stop_geo_positions,
-                detector_geo_positions,
-                signal_geo_positions,
-                switch_geo_positions,
+            for layer in [
+                'buffer_stops',
+                'detectors',
+                'signals',
+                'switches',
             ]:
-                if marker in positions:
-                    m.add_child(folium.Marker(positions[marker]))
+                if marker in positions[layer]:
+                    m.add_child(folium.Marker(positions[layer][marker][0]))
 
     folium.LayerControl().add_to(m)
-    
+
     folium.plugins.MiniMap(
         toggle_display=True,
         zoom_level_offset=-7
     ).add_to(m)
 
+    stats['build_time'] = time.perf_counter() - tic
+    stats['html_size'] = None
+    if max_size is not None:
+        stats['html_size'] = len(m.get_root().render().encode())
+        if stats['html_size'] > max_size:
+            warnings.warn(
+                f"The map weighs {stats['html_size']} bytes "
+                f"(budget: {max_size}), use lightweight=True, "
+                "cluster=True, simplify_zoom or bounds"
+            )
+    if max_time is not None and stats['build_time'] > max_time:
+        warnings.warn(
+            f"The map was built in {stats['build_time']:.1f}s "
+            f"(budget: {max_time}s)"
+            + (
+                ", skipped layers: " + ", ".join(stats['skipped'])
+                if stats['skipped'] else ""
+            )
+        )
+    m.stats = stats
+
     return m
 
 
+def _tiles(
+    lng_lat: np.ndarray,
+    zoom: int,
+) -> tuple[np.ndarray, np.ndarray]:
+    """x and y of the web map tiles of [lng, lat] points"""
+
+    n = 2**zoom
+    lng, lat = np.asarray(lng_lat, dtype=float).reshape(-1, 2).T
+    x = np.floor((lng + 180) / 360 * n)
+    y = np.floor(
+        (1 - np.arcsinh(np.tan(np.radians(lat))) / np.pi) / 2 * n
+    )
+    return (
+        np.clip(x, 0, n - 1).astype(int),
+        np.clip(y, 0, n - 1).astype(int),
+    )
+
+
+def write_map_tiles(
+    self,
+    directory: str,
+    zooms: tuple[int, ...] = (8, 11, 14),
+    pixels: float = 1.,
+) -> dict[str, Any]:
+    """Write the infra as GeoJSON files chunked like web map tiles
+
+    For each zoom level z, the track sections geometries, simplified
+    to a tolerance of some pixels at this zoom level, are written in
+    `<directory>/<z>/<x>/<y>.geojson`, each track section being in all
+    the tiles covered by its bounding box. Markers (properties 'id',
+    'layer' and 'name') are only written in the tiles of the highest
+    zoom level. `<directory>/tiles.json` lists the written tiles.
+
+    Parameters
+    ----------
+    directory : str
+        Output directory
+    zooms : tuple[int, ...], optional
+        Zoom levels, by default (8, 11, 14)
+    pixels : float, optional
+        Tolerance of the simplification in pixels, by default 1.
+
+    Returns
+    -------
+    dict[str, Any]
+        Statistics: number of tiles, total size in bytes and time in
+        seconds
+    """
+
+    tic = time.perf_counter()
+    os.makedirs(directory, exist_ok=True)
+
+    tracks = self.infra['track_sections']
+    tiles = dict()
+    for zoom in zooms:
+        tolerance = zoom_tolerance(zoom, pixels)
+        for track in tracks:
+            line = simplify_line(track['geo']['coordinates'], tolerance)
+            feature = {
+                'type': 'Feature',
+                'geometry': {
+                    'type': 'LineString',
+                    'coordinates': line.tolist(),
+                },
+                'properties': {
+                    'id': track['id'],
+                    'name': track['extensions']['sncf']['track_name'],
+                },
+            }
+            xs, ys = _tiles(line, zoom)
+            for x in range(xs.min(), xs.max() + 1):
+                for y in range(ys.min(), ys.max() + 1):
+                    tiles.setdefault((zoom, x, y), []).append(feature)
+
+    zoom = max(zooms)
+    positions = _marker_positions(self, {track['id'] for track in tracks})
+    for layer, layer_positions in positions.items():
+        for id, (position, popup) in layer_positions.items():
+            (x,), (y,) = _tiles(position[::-1], zoom)
+            tiles.setdefault((zoom, x, y), []).append({
+                'type': 'Feature',
+                'geometry': {'type': 'Point', 'coordinates': position[::-1]},
+                'properties': {
+                    'id': id if isinstance(id, str) else id[0],
+                    'layer': layer,
+                    'name': popup,
+                },
+            })
+
+    size = 0
+    for (z, x, y), features in tiles.items():
+        os.makedirs(os.path.join(directory, str(z), str(x)), exist_ok=True)
+        path = os.path.join(directory, str(z), str(x), f'{y}.geojson')
+        with open(path, 'w') as f:
+            json.dump({'type': 'FeatureCollection', 'features': features}, f)
+        size += os.path.getsize(path)
+
+    with open(os.path.join(directory, 'tiles.json'), 'w') as f:
+        json.dump({'zooms': list(zooms), 'tiles': sorted(tiles)}, f)
+
+    return {
+        'tiles': len(tiles),
+        'size': size,
+        'time': time.perf_counter() - tic,
+    }
+
+
 def folium_results(
     self,
     ref_sim = None,
     eco_or_base: str = 'base',
     period: int = 5,
+    min_move: float | None = None,
 ) -> folium.Map:
-    """Results as a folium map"""
+    """Results as a folium map
+
+    If min_move is given, trains positions are only updated once they have
+    moved by more than min_move meters (see res2geojson).
+    """
 
     m = folium_map(self)
-    data = res2geojson(self, ref_sim=ref_sim, period=period, eco_or_base=eco_or_base)
+    data = res2geojson(
+        self,
+        ref_sim=ref_sim,
+        period=period,
+        eco_or_base=eco_or_base,
+        min_move=min_move,
+    )
     folium.plugins.TimestampedGeoJson(
         data=data,
         auto_play=False,
@@ -1,15 +1,15 @@
 import copy
+import json
 from datetime import datetime
-from typing import Any
+from typing import Any, Iterator
 
 import numpy as np
 
 import branca.colormap as cm
 
-from haversine import haversine
-
 from pyosrd.osrd import Point
 from pyosrd.delays_between_simulations import calculate_delay_f_time
+from pyosrd.infra.geometry import haversine_distances
 
 
 def coords_from_position_on_track(
@@ -17,122 +17,124 @@ def coords_from_position_on_track(
     track_section_id: str,
     position: float,
 ) -> list[float]:
-    
-    track_section = next(
-        t for t in self.infra['track_sections']
-        if t['id'] == track_section_id
+    """[lat, lng] of a position on a track section"""
+    return self.track_geometry().coordinates(
+        [track_section_id],
+        [position]
+    )[0].tolist()
+
+
+def _train_geo_positions(
+    self,
+    train_index: int,
+    eco_or_base: str,
+) -> tuple[list[float], list[list[float]]]:
+    """Times (s) and [lat, lng] of the head of a train
+    at each simulated position and at each point of the geometries of
+    its track sections"""
+
+    geometry = self.track_geometry()
+
+    positions = copy.deepcopy(
+        self._head_position(train_index, eco_or_base)
     )
 
-    coordinates = [
-        (point[1], point[0])
-        for point in track_section['geo']['coordinates']
-    ]
-    
-    geo_lengths = [0]
-    for i, _ in enumerate(coords:= track_section['geo']['coordinates']):
-        if i > 0:
-            geo_lengths.append(
-                round(haversine(
-                    coords[i][::-1],
-                    coords[i-1][::-1],
-                    unit='m'
-                ), 2) + geo_lengths[i-1]
-            )
-    pos = position / track_section['length']
-    positions = [length / geo_lengths[-1] for length in geo_lengths]
+    # for p in self.points_encountered_by_train(train_index, types=['switch', 'link']):
+    #     switch = next(
+    #         s for s in self.infra['switches']
+    #         if s['id'] == p['id']
+    #     )
+    #     port_key = next(p for p in switch['ports'])
+    #     port = switch['ports'][port_key]
+    #     position = 0 if port['endpoint'] == 'BEGIN' else self.track_section_lengths[port['track']]
+    #     positions.append({
+    #         'offset': position,
+    #         'track_section': port['track'],
+    #         'path_offset': p['offset'],
+    #         'time': p['t_'+eco_or_base]
+    #     })
 
-    lats = [coord[0] for coord in coordinates]
-    lngs = [coord[1] for coord in coordinates]
+    t, o = (
+        [p['time'] for p in positions],
+        [p['path_offset'] for p in positions]
+    )
+    for train_track in self.train_track_sections(train_index):
+        geo_lengths = geometry.track_arc_lengths(train_track['id'])
+        for length in geo_lengths:
+            if path_offset := self.offset_in_path_of_train(
+                Point(
+                    id='',
+                    track_section=train_track['id'],
+                    type='record',
+                    position=length
+                ),
+                train_index
+            ):
+                positions.append({
+                    'offset': length.item(),
+                    'track_section': train_track['id'],
+                    'path_offset': path_offset,
+                    'time': np.interp([path_offset], o, t).item(),
+                })
 
-    return [
-        np.interp([pos], positions, lats).item(),
-        np.interp([pos], positions, lngs).item(),
-    ]
+    positions.sort(key=lambda x: x['path_offset'])
 
+    coords = geometry.coordinates(
+        [p['track_section'] for p in positions],
+        [p['offset'] for p in positions],
+    ).tolist()
+    return [p['time'] for p in positions], coords
 
-def res2geojson(
+
+def iter_res2geojson(
     self,
     ref_sim = None,
     eco_or_base: str = 'base',
-    period: int = 5
-) -> dict[str, Any]:
+    period: int = 5,
+    chunk: float | None = None,
+    min_move: float | None = None,
+) -> Iterator[dict[str, Any]]:
+    """GeoJSON features of the trains positions, train by train
 
-    features = []
+    Each train is sampled every period seconds. Its positions are
+    yielded in one feature per chunk of time, followed, if ref_sim is
+    given, by the feature of its delayed positions in this chunk.
 
-    for train_index, _ in enumerate(self.trains):
+    Parameters
+    ----------
+    ref_sim : OSRD, optional
+        Reference simulation to show the delays, by default None
+    eco_or_base : str, optional
+        Results used, by default 'base'
+    period : int, optional
+        Sampling period in seconds, by default 5
+    chunk : float | None, optional
+        Duration of the chunks in seconds, by default one chunk per train
+    min_move : float | None, optional
+        If given, positions are only emitted once the train has moved
+        by more than min_move meters along its path since the previous
+        emitted one (the first and last positions are always emitted)
 
-        coords, times = [], []
-        today = datetime.combine(datetime.today(), datetime.min.time())
-        today_timestamp = today.timestamp() * 1_000
+    Yields
+    ------
+    dict[str, Any]
+        GeoJSON features (LineString with one time per point) for
+        folium.plugins.TimestampedGeoJson
+    """
 
-        positions = copy.deepcopy(
-            self._head_position(train_index, eco_or_base)
-        )
-        
-        # for p in self.points_encountered_by_train(train_index, types=['switch', 'link']):
-        #     switch = next(
-        #         s for s in self.infra['switches']
-        #         if s['id'] == p['id']
-        #     )
-        #     port_key = next(p for p in switch['ports'])
-        #     port = switch['ports'][port_key]
-        #     position = 0 if port['endpoint'] == 'BEGIN' else self.track_section_lengths[port['track']]
-        #     positions.append({
-        #         'offset': position,
-        #         'track_section': port['track'],
-        #         'path_offset': p['offset'],
-        #         'time': p['t_'+eco_or_base]
-        #     })
-
-        t, o = (
-            [p['time'] for p in positions],
-            [p['path_offset'] for p in positions]
-        )
-        for train_track in self.train_track_sections(train_index):
-            track = next(
-                t for t in self.infra['track_sections']
-                if t['id'] == train_track['id']
-            )
-            geo_lengths = [0]
-            for i, _ in enumerate(coordinates:= track['geo']['coordinates']):
-                if i > 0:
-                    geo_lengths.append(
-                        round(haversine(
-                            coordinates[i][::-1],
-                            coordinates[i-1][::-1],
-                            unit='m'
-                        ), 2) + geo_lengths[i-1]
-                    )
-
-            for length in geo_lengths:
-                if path_offset := self.offset_in_path_of_train(
-                    Point(
-                        id='',
-                        track_section=train_track['id'],
-                        type='record',
-                        position=length
-                    ),
-                    train_index
-                ):
-                    positions.append({
-                        'offset': length,
-                        'track_section': train_track['id'],
-                        'path_offset': path_offset,
-                        'time': np.interp([path_offset], o, t).item(),
-                    })
-                    
-        positions.sort(key=lambda x: x['path_offset'])
-
-        for p in positions:
-            coords.append(coords_from_position_on_track(
-                self,
-                p['track_section'],
-                p['offset']
-            ))
-            times.append(today_timestamp + 1_000 * p['time'])
+    today = datetime.combine(datetime.today(), datetime.min.time())
+    today_timestamp = today.timestamp() * 1_000
+
+    for train_index, _ in enumerate(self.trains):
 
+        positions_times, coords = _train_geo_positions(
+            self,
+            train_index,
+            eco_or_base
+        )
+        times = [today_timestamp + 1_000 * t for t in positions_times]
 
-        duration = positions[-1]['time'] - positions[0]['time']
+        duration = positions_times[-1] - positions_times[0]
 
         times_interp = np.linspace(min(times), max(times), int(duration/period))
         lats = [c[1] for c in coords]
@@ -143,16 +145,56 @@ def res2geojson(
                 np.interp(times_interp, times, lats)
             )
         )
-        coords_interp[-1] = (None, None)
-        features.append(
-            {
+
+        kept = np.arange(len(times_interp))
+        if min_move is not None and len(kept) > 2:
+            # coords_interp are (lat, lng)
+            lng_lat = np.array(coords_interp)[:, ::-1]
+            traveled = np.concatenate([
+                [0.],
+                np.cumsum(haversine_distances(lng_lat[:-1], lng_lat[1:]))
+            ])
+            steps = np.floor(traveled / min_move)
+            moved = np.concatenate([[True], steps[1:] != steps[:-1]])
+            moved[-1] = True
+            kept = kept[moved]
+
+        if chunk is None:
+            chunks = [kept]
+        else:
+            chunk_ids = (
+                (times_interp[kept] - times_interp[0]) // (1_000 * chunk)
+            )
+            chunks = np.split(
+                kept,
+                np.flatnonzero(np.diff(chunk_ids)) + 1
+            )
+
+        if ref_sim is not None:
+            times_orig = [
+                today_timestamp + 1_000 * r['time']
+                for r in self._head_position(train_index, eco_or_base)
+            ]
+            delays = calculate_delay_f_time(self, ref_sim, train_index, eco_or_base)
+            delays_interp = np.interp(times_interp, times_orig, delays)
+
+        for i, indices in enumerate(chunks):
+            # Each chunk ends where the next one starts, the train being
+            # hidden there by a null position
+            if i < len(chunks) - 1:
+                indices = np.append(indices, chunks[i+1][0])
+            chunk_coords = [coords_interp[j] for j in indices]
+            chunk_coords[-1] = (None, None)
+            chunk_times = list(times_interp[indices])
+
+            yield {
                 "type": "Feature",
                 "geometry": {
                     "type": "LineString",
-                    "coordinates": [(c[1], c[0]) for c in coords_interp]
+                    "coordinates": [(c[1], c[0]) for c in chunk_coords]
                     },
                 "properties": {
-                    "times": list(times_interp),
+                    "times": chunk_times,
                     "icon": "circle",
                     "iconstyle": {
                         "fillColor": "black",
@@ -162,49 +204,126 @@ def res2geojson(
                     },
                     "style": {"weight": 0},
                 },
-            },
-        )
+            }
 
-        if ref_sim is not None:
-            times_orig = [
-                today_timestamp + 1_000 * r['time']
-                for r in self._head_position(train_index, eco_or_base)
-            ]
-            delays = calculate_delay_f_time(self, ref_sim, train_index, eco_or_base)
-            delays_interp = np.interp(times_interp, times_orig, delays)
-            features.append(
-                {
-                    "type": "Feature",
-                    "geometry": {
-                        "type": "LineString",
-                        "coordinates": [
-                            (c[1], c[0])
-                            for i, c in enumerate(coords_interp)
-                            if delays_interp[i] > 0
-                        ][:-1] + [(None, None)]
-                        },
-                    "properties": {
-                        "times": [
-                            t
-                            for i, t in enumerate(times_interp)
-                            if delays_interp[i] > 0 
-                        ],
-                        "icon": "circle",
-                        "iconstyle": {
-                            "fillColor": 'red',
-                            "fillOpacity":.5,
-                            "stroke": "false",
-                            "radius": 12,
-                        },
-                        "style": {"weight": 0},
+            if ref_sim is None:
+                continue
+            delayed = delays_interp[indices] > 0
+            if chunk is not None and not delayed.any():
+                continue
+            yield {
+                "type": "Feature",
+                "geometry": {
+                    "type": "LineString",
+                    "coordinates": [
+                        (c[1], c[0])
+                        for c, d in zip(chunk_coords, delayed)
+                        if d
+                    ][:-1] + [(None, None)]
                     },
+                "properties": {
+                    "times": [
+                        t
+                        for t, d in zip(chunk_times, delayed)
+                        if d
+                    ],
+                    "icon": "circle",
+                    "iconstyle": {
+                        "fillColor": 'red',
+                        "fillOpacity":.5,
+                        "stroke": "false",
+                        "radius": 12,
+                    },
+                    "style": {"weight": 0},
                 },
-            )
-        
+            }
+
+
+def res2geojson(
+    self,
+    ref_sim = None,
+    eco_or_base: str = 'base',
+    period: int = 5,
+    min_move: float | None = None,
+) -> dict[str, Any]:
+    """Trains positions as a GeoJSON FeatureCollection
+
+    See iter_res2geojson for the parameters.
+    """
+
     positions = {
         "type": "FeatureCollection",
-        "features": features
+        "features": list(
+            iter_res2geojson(
+                self,
+                ref_sim=ref_sim,
+                eco_or_base=eco_or_base,
+                period=period,
+                min_move=min_move,
+            )
+        )
     }
 
 
-    return positions
\ No newline at end of file
+    return positions
+
+
+def write_res2geojson(
+    self,
+    path: str,
+    ref_sim = None,
+    eco_or_base: str = 'base',
+    period: int = 5,
+    chunk: float | None = 3_600,
+    min_move: float | None = None,
+    ndjson: bool | None = None,
+) -> int:
+    """Write the trains positions to a file, feature by feature
+
+    Features are written as soon as they are computed, so that only one
+    train is held in memory.
+
+    Parameters
+    ----------
+    path : str
+        Output file
+    chunk : float | None, optional
+        Duration of the chunks in seconds, by default 3600
+    ndjson : bool | None, optional
+        Write one feature per line (newline delimited JSON) instead of
+        a FeatureCollection, by default if path ends with .ndjson
+
+    See iter_res2geojson for the other parameters.
+
+    Returns
+    -------
+    int
+        Number of features written
+    """
+
+    if ndjson is None:
+        ndjson = path.endswith('.ndjson')
+
+    features = iter_res2geojson(
+        self,
+        ref_sim=ref_sim,
+        eco_or_base=eco_or_base,
+        period=period,
+        chunk=chunk,
+        min_move=min_move,
+    )
+
+    n = 0
+    with open(path, 'w') as f:
+        if not ndjson:
+            f.write('{"type": "FeatureCollection", "features": [\n')
+        for feature in features:
+            if n > 0 and not ndjson:
+                f.write(',\n')
+            f.write(json.dumps(feature))
+            if ndjson:
+                f.write('\n')
+            n += 1
+        if not ndjson:
+            f.write('\n]}\n')
+    return n
@@ -0,0 +1,112 @@
+"""Simplification of polylines and curves for the display of large infras
+and long simulations
+
+>>> tolerance = zoom_tolerance(12)
+>>> simplify_line(track['geo']['coordinates'], tolerance)
+>>> kept = minmax_downsample(times, offsets, 500)
+"""
+import numpy as np
+
+
+def zoom_tolerance(
+    zoom: int,
+    pixels: float = 1.,
+) -> float:
+    """Size in degrees of longitude of some pixels of a web map tile
+    at a zoom level"""
+    return pixels * 360 / (256 * 2**zoom)
+
+
+def simplify_line(
+    points: list[list[float]] | np.ndarray,
+    tolerance: float,
+) -> np.ndarray:
+    """Douglas-Peucker simplification of a polyline
+
+    Parameters
+    ----------
+    points : list[list[float]] | np.ndarray
+        (N, 2) points of the polyline
+    tolerance : float
+        Maximal distance between the polyline and its simplification,
+        in the unit of the points
+
+    Returns
+    -------
+    np.ndarray
+        Points kept, including the first and the last ones
+    """
+
+    points = np.asarray(points, dtype=float)
+    if len(points) < 3 or tolerance <= 0:
+        return points
+
+    keep = np.zeros(len(points), dtype=bool)
+    keep[[0, -1]] = True
+    stack = [(0, len(points) - 1)]
+    while stack:
+        first, last = stack.pop()
+        if last - first < 2:
+            continue
+        a, b = points[first], points[last]
+        inner = points[first + 1:last] - a
+        ab = b - a
+        norm = np.hypot(*ab)
+        if norm == 0:
+            distances = np.hypot(inner[:, 0], inner[:, 1])
+        else:
+            distances = np.abs(
+                ab[0] * inner[:, 1] - ab[1] * inner[:, 0]
+            ) / norm
+        i = int(np.argmax(distances))
+        if distances[i] > tolerance:
+            farthest = first + 1 + i
+            keep[farthest] = True
+            stack += [(first, farthest), (farthest, last)]
+
+    return points[keep]
+
+
+def minmax_downsample(
+    x: np.ndarray,
+    y: np.ndarray,
+    buckets: int,
+) -> np.ndarray:
+    """Indices of the samples kept to draw a curve with few points
+
+    x is split in buckets of equal width, in which the first, last,
+    minimal and maximal samples are kept, so that the drawn curve keeps
+    the extrema of the original one. NaN values of y, which break the
+    curve, are kept where they follow a number.
+
+    Parameters
+    ----------
+    x : np.ndarray
+        Sorted abscissas
+    y : np.ndarray
+        Ordinates, possibly NaN
+    buckets : int
+        Number of buckets, about a quarter of the number of samples kept
+
+    Returns
+    -------
+    np.ndarray
+        Sorted indices of the kept samples
+    """
+
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+    if len(x) <= 4 * buckets:
+        return np.arange(len(x))
+
+    edges = np.linspace(x[0], x[-1], buckets + 1)
+    bucket = np.clip(np.searchsorted(edges, x, 'right') - 1, 0, buckets - 1)
+    starts = np.flatnonzero(np.diff(bucket, prepend=-1))
+    ends = np.append(starts[1:], len(x)) - 1
+
+    nan = np.isnan(y)
+    minima = np.lexsort((np.where(nan, np.inf, y), bucket))[starts]
+    maxima = np.lexsort((np.where(nan, -np.inf, y), bucket))[ends]
+    gaps = np.flatnonzero(nan & ~np.roll(nan, 1))
+
+    return np.unique(np.concatenate([starts, ends, minima, maxima, gaps]))
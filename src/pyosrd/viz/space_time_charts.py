@@ -1,9 +1,11 @@
 import matplotlib.pyplot as plt
 from matplotlib.axes._axes import Axes
+import numpy as np
 from plotly import graph_objects as go
 
-from pyosrd.osrd import Point
 from pyosrd.utils import seconds_to_hour
+from pyosrd.viz.simplify import minmax_downsample
+from pyosrd.viz.space_time_data import SpaceTimeData, space_time_data
 
 
 def _data_and_points_to_plot(
@@ -13,87 +15,8 @@ def _data_and_points_to_plot(
     points_to_show: list[str],
 ) -> tuple[list, dict]:
 
-    data = []
-    for i, train_id in enumerate(self.trains):
-        t = [
-            record['time']
-            for record in self._head_position(i, eco_or_base)
-        ]
-        offset = [
-            self.offset_in_path_of_train(
-                Point(
-                    id='',
-                    track_section=record['track_section'],
-                    type='record',
-                    position=record['offset']
-                ),
-                train
-            )
-            for record in self._head_position(i, eco_or_base)
-        ]
-
-        track_sections = self.train_track_sections(train_id)
-        track_section_ids = [
-            t['id'] for t in track_sections
-        ]
-        for p in self.points_encountered_by_train(train_id):
-            if p ['type'] == 'switch':
-                switch = next(
-                    s for s in self.infra['switches']
-                    if s['id'] == p['id']
-                )
-                port_key = next(
-                    p for p, v in switch['ports'].items()
-                    if v['track'] in track_section_ids
-                )
-                port = switch['ports'][port_key]
-                position = 0 if port['endpoint'] == 'BEGIN' else self.track_section_lengths[port['track']]
-                t.append(p['t_'+eco_or_base])
-                offset.append(
-                    self.offset_in_path_of_train(
-                        Point(
-                            id='',
-                            track_section=port['track'],
-                            type='record',
-                            position=position
-                        ),
-                        train
-                    )
-                )
-        tuples = [
-            t for t in zip(t, offset)
-            if offset is not None
-        ]
-        tuples.sort(key=lambda t: t[0])
-        t_sorted = [t[0] for t in tuples]
-        offset_sorted = [t[1] for t in tuples]            
-        data.append({"x": t_sorted, "y": offset_sorted, "label": train_id})
-
-    points = {
-        point['id']: point['offset']
-        for point in self.points_encountered_by_train(train)
-        if point['type'] in points_to_show
-    }
-
-    station_names = dict()
-    for point in self.points_encountered_by_train(train):
-        if point['type'] == 'station':
-            try:
-                op = next(
-                    o for o in self.infra['operational_points']
-                    if o['id'] == point['id']
-                )
-                name = op['extensions']['identifier']['name']
-                station_names[point['id']] = name
-            except (StopIteration, KeyError):
-                pass
-
-    points_with_station_names = {
-        (k if k not in station_names else station_names[k]): v
-        for k, v in points.items()
-    }
-
-    return data, points_with_station_names
+    data = space_time_data(self, train, eco_or_base)
+    return data.curves(), data.points_to_plot(points_to_show)
 
 
 def space_time_chart(
@@ -170,17 +93,74 @@ def space_time_chart(
     return ax
 
 
+def _plotly_curves(
+    data: SpaceTimeData,
+    max_points: int | None,
+    x_range: tuple[float, float] | None,
+) -> list[dict]:
+    """Curves restricted to x_range (and the samples around it) and
+    downsampled to about max_points samples per train"""
+
+    curves = []
+    for curve in data.curves():
+        x, y = curve['x'], curve['y']
+        if x_range is not None:
+            start, end = np.searchsorted(x, x_range)
+            x, y = x[max(start-1, 0):end+1], y[max(start-1, 0):end+1]
+        if max_points is not None:
+            kept = minmax_downsample(x, y, max(max_points // 4, 1))
+            x, y = x[kept], y[kept]
+        curves.append({'x': x, 'y': y, 'label': curve['label']})
+    return curves
+
+
+def _plotly_layout(
+    fig: go.Figure,
+    points: dict[str, float],
+    curves: list[dict],
+) -> None:
+    """Lines and ticks of the points, time ticks"""
+
+    for offset in points.values():
+        fig.add_hline(
+            y=offset,
+            line_width=.5,
+            # line_dash="dash",
+            line_color="black"
+        )
+    xmax = round(max([d['x'][-1] for d in curves if len(d['x'])]))
+    xticks = list(range(0, xmax + xmax // 5, xmax // 5))
+
+    fig.update_layout(
+        yaxis=dict(
+            tickmode='array',
+            tickvals=[offset for offset in points.values()],
+            ticktext=[p for p in points]
+        ),
+        xaxis=dict(
+            tickmode='array',
+            tickvals=xticks,
+            ticktext=[seconds_to_hour(xtick) for xtick in xticks]
+        )
+    )
+
+
 def space_time_chart_plotly(
     self,
     train: int | str,
     eco_or_base: str = 'base',
     points_to_show: list[str] =
         ['station', 'switch', 'departure', 'arrival'],
+    webgl: bool = False,
+    max_points: int | None = None,
 ) -> go.Figure:
     """Draw space-time graph for a given train
 
     >>> ax = sim.space_time_chart(train=0, ...)
 
+    Figures are cached per reference train, simulation and options, and
+    a copy of the cached figure is returned, that can be modified.
+
     Parameters
     ----------
     train : int | str
@@ -192,6 +172,14 @@ def space_time_chart_plotly(
         Possible choices are 'signal', 'detector', 'station', 'switch',
         'arrival', 'departure'.
         by default ['station', 'switch', 'departure', 'arrival']
+    webgl : bool, optional
+        Draw the trains with WebGL (go.Scattergl), faster for many trains,
+        by default False
+    max_points : int | None, optional
+        If given, each train is downsampled to about max_points samples,
+        keeping the extrema of its offsets (see
+        `update_space_time_chart_plotly` to refine them when zooming),
+        by default None
 
     Returns
     -------
@@ -199,47 +187,96 @@ def space_time_chart_plotly(
         Plotly Graph Object
     """
 
-    data, points = _data_and_points_to_plot(
-        self,
-        train=train,
-        eco_or_base=eco_or_base,
-        points_to_show=points_to_show,
-    )
+    if isinstance(train, str):
+        train = self.trains.index(train)
+
+    data = space_time_data(self, train, eco_or_base)
+    key = ('plotly', train, tuple(points_to_show), webgl, max_points)
+    if key in data.figures:
+        return go.Figure(data.figures[key])
+
+    curves = _plotly_curves(data, max_points, None)
+    Scatter = go.Scattergl if webgl else go.Scatter
 
     fig = go.Figure(
         data=[
-            go.Scatter(x=t['x'], y=t['y'], name=t['label'])
-            for t in data
+            Scatter(x=t['x'], y=t['y'], name=t['label'])
+            for t in curves
         ],
         layout={
             "title": f'train {train} ({eco_or_base})',
             "template": "simple_white",
             # "xaxis_title": 'Time',
-            "hovermode": "x unified"
+            "hovermode": "x unified",
+            "meta": {'train': train, 'eco_or_base': eco_or_base},
         },
     )
+    _plotly_layout(fig, data.points_to_plot(points_to_show), curves)
 
-    for offset in points.values():
-        fig.add_hline(
-            y=offset,
-            line_width=.5,
-            # line_dash="dash",
-            line_color="black"
-        )
-    xmax = round(max([d['x'][-1] for d in data]))
-    xticks = list(range(0, xmax + xmax // 5, xmax // 5))
+    data.figures[key] = fig
+    return go.Figure(fig)
 
-    fig.update_layout(
-        yaxis=dict(
-            tickmode='array',
-            tickvals=[offset for offset in points.values()],
-            ticktext=[p for p in points]
-        ),
-        xaxis=dict(
-            tickmode='array',
-            tickvals=xticks,
-            ticktext=[seconds_to_hour(xtick) for xtick in xticks]
+
+def update_space_time_chart_plotly(
+    self,
+    fig: go.Figure,
+    train: int | str,
+    eco_or_base: str = 'base',
+    points_to_show: list[str] =
+        ['station', 'switch', 'departure', 'arrival'],
+    max_points: int | None = None,
+    x_range: tuple[float, float] | None = None,
+) -> go.Figure:
+    """Update in place the traces of a space-time chart drawn by
+    `space_time_chart_plotly`
+
+    Only the samples of the traces (and the lines and ticks of the points
+    if the reference train changes) are replaced, so that interactive
+    apps can switch trains or refine the level of detail without
+    building a new figure.
+
+    Parameters
+    ----------
+    fig : go.Figure
+        Figure with one trace per train
+    train : int | str
+        Train index or label
+    eco_or_base : str, optional
+        Draw eco or base simulation ?, by default 'base'
+    points_to_show : list[str], optional
+        list of points types shown on y-axis,
+        by default ['station', 'switch', 'departure', 'arrival']
+    max_points : int | None, optional
+        Samples per train, by default all
+    x_range : tuple[float, float] | None, optional
+        Visible times (s): samples are taken in this range only,
+        by default the whole simulation
+
+    Returns
+    -------
+    go.Figure
+        The updated figure
+    """
+
+    if isinstance(train, str):
+        train = self.trains.index(train)
+
+    data = space_time_data(self, train, eco_or_base)
+    curves = _plotly_curves(data, max_points, x_range)
+    meta = {'train': train, 'eco_or_base': eco_or_base}
+
+    with fig.batch_update():
+        for trace, curve in zip(fig.data, curves):
+            trace.x, trace.y = curve['x'], curve['y']
+        fig.layout.xaxis.range = x_range
+    if fig.layout.meta != meta:
+        fig.layout.meta = meta
+        fig.layout.title.text = f'train {train} ({eco_or_base})'
+        fig.layout.shapes = []
+        _plotly_layout(
+            fig,
+            data.points_to_plot(points_to_show),
+            data.curves()
         )
-    )
 
     return fig
@@ -0,0 +1,288 @@
+"""Data of the space-time charts
+
+The head positions of all trains are projected on the path of a
+reference train in one pass per train: each track section of the
+reference path is mapped to an affine function (origin + sign * position)
+giving the offset in the path. Projections are cached per reference
+train and simulation ('eco' or 'base') and shared by the matplotlib and
+plotly charts.
+
+>>> data = sim.space_time_data(0)
+>>> data.curves()  # [{'x': times, 'y': offsets, 'label': train}, ...]
+>>> data.points_to_plot(['station', 'switch'])
+"""
+from dataclasses import dataclass, field
+from typing import Any
+
+import numpy as np
+
+
+@dataclass
+class SpaceTimeData:
+    """Trains positions projected on the path of a reference train
+
+    Attributes
+    ----------
+    train : int
+        Index of the reference train
+    eco_or_base : str
+        Simulation used
+    trains : list[str]
+        Trains labels
+    times : list[np.ndarray]
+        Times of the positions of each train, sorted
+    offsets : list[np.ndarray]
+        Offsets of these positions in the path of the reference train,
+        NaN outside of it
+    points : list[dict[str, Any]]
+        Points encountered by the reference train (id, offset, type)
+    station_names : dict[str, str]
+        Names of the operational points among these points
+    figures : dict
+        Charts drawn from these data, by drawing options
+    """
+
+    train: int
+    eco_or_base: str
+    trains: list[str]
+    times: list[np.ndarray]
+    offsets: list[np.ndarray]
+    points: list[dict[str, Any]] = field(default_factory=list)
+    station_names: dict[str, str] = field(default_factory=dict)
+    figures: dict = field(default_factory=dict, repr=False)
+
+    def curves(self) -> list[dict[str, Any]]:
+        """x (times), y (offsets) and label of each train"""
+        return [
+            {"x": t, "y": o, "label": label}
+            for t, o, label in zip(self.times, self.offsets, self.trains)
+        ]
+
+    def points_to_plot(
+        self,
+        points_to_show: list[str],
+    ) -> dict[str, float]:
+        """Offsets of the points of the given types, by name"""
+        return {
+            self.station_names.get(point['id'], point['id']): point['offset']
+            for point in self.points
+            if point['type'] in points_to_show
+        }
+
+
+def _path_projection(
+    self,
+    train: int,
+    track_index: dict[str, int],
+) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Origin, sign and first-track flag of each track section such that
+    origin + sign * position is the offset in the path of a train (as in
+    OSRD.offset_in_path_of_train), origin being NaN outside of it"""
+
+    lengths = self.track_section_lengths
+    tracks = self.train_track_sections(train)
+    departure = self.train_departure(train)
+
+    origins = np.full(len(track_index), np.nan)
+    signs = np.zeros(len(track_index))
+    first = np.zeros(len(track_index), dtype=bool)
+
+    forward = tracks[0]['direction'] == 'START_TO_STOP'
+    offset = (
+        lengths[departure.track_section] - departure.position
+        if forward
+        else departure.position
+    )
+    for k, track in enumerate(tracks):
+        i = track_index[track['id']]
+        if k > 0:
+            offset += lengths[tracks[k-1]['id']] if k > 1 else 0.
+        if not np.isnan(origins[i]):
+            continue  # offsets are given on the first passage
+        if k == 0:
+            origins[i] = (
+                -departure.position if forward else departure.position
+            )
+            signs[i] = 1. if forward else -1.
+            first[i] = True
+        elif track['direction'] == 'START_TO_STOP':
+            origins[i] = offset
+            signs[i] = 1.
+        else:
+            origins[i] = offset + lengths[track['id']]
+            signs[i] = -1.
+
+    return origins, signs, first
+
+
+def _project(
+    projection: tuple[np.ndarray, np.ndarray, np.ndarray],
+    tracks: np.ndarray,
+    positions: np.ndarray,
+) -> np.ndarray:
+    """Offsets in a path of positions on track sections (indices)"""
+    origins, signs, first = projection
+    offsets = origins[tracks] + signs[tracks] * positions
+    offsets[first[tracks] & (offsets < 0)] = np.nan
+    return offsets
+
+
+def _switches_ports(
+    self,
+    track_index: dict[str, int],
+) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Index of the switch (links excluded), index of the track section
+    and position of all the switches ports"""
+
+    switches = [
+        s for s in self.infra['switches'] if s['switch_type'] != 'link'
+    ]
+    lengths = self.track_section_lengths
+    owners, tracks, positions = [], [], []
+    for i, switch in enumerate(switches):
+        for port in switch['ports'].values():
+            owners.append(i)
+            tracks.append(track_index[port['track']])
+            positions.append(
+                0 if port['endpoint'] == 'BEGIN' else lengths[port['track']]
+            )
+    return (
+        np.array(owners, dtype=int),
+        np.array(tracks, dtype=int),
+        np.array(positions, dtype=float),
+    )
+
+
+def space_time_data(
+    self,
+    train: int | str,
+    eco_or_base: str = 'base',
+) -> SpaceTimeData:
+    """Positions of all trains in the path of a train, computed once per
+    train and simulation
+
+    Positions are the head positions of each train and the times at which
+    it crosses switches (non link) of its path, projected on the path of
+    the reference train.
+
+    Parameters
+    ----------
+    train : int | str
+        Reference train index or label
+    eco_or_base : str, optional
+        Simulation used, by default 'base'
+
+    Returns
+    -------
+    SpaceTimeData
+        Projected positions and points of the reference train
+    """
+
+    if isinstance(train, str):
+        train = self.trains.index(train)
+
+    cached = getattr(self, '_space_time_data', None)
+    if cached is None or cached[0] is not self.results:
+        cached = self._space_time_data = (self.results, dict())
+    if (train, eco_or_base) in cached[1]:
+        return cached[1][(train, eco_or_base)]
+
+    track_index = {
+        t['id']: i for i, t in enumerate(self.infra['track_sections'])
+    }
+    reference = _path_projection(self, train, track_index)
+    owners, port_tracks, port_positions = _switches_ports(
+        self,
+        track_index
+    )
+    ports = np.arange(len(owners))
+    starts = np.flatnonzero(np.diff(owners, prepend=-1))
+
+    times, offsets = [], []
+    for i, _ in enumerate(self.trains):
+        head_position = self._head_position(i, eco_or_base)
+        t = np.array([r['time'] for r in head_position], dtype=float)
+        path_offset = np.array(
+            [r['path_offset'] for r in head_position],
+            dtype=float
+        )
+        offset = _project(
+            reference,
+            np.array([
+                track_index[r['track_section']] for r in head_position
+            ]),
+            np.array([r['offset'] for r in head_position], dtype=float),
+        )
+
+        if len(ports):
+            # Switches crossed by the train, located (as in
+            # points_encountered_by_train) by their last port on its
+            # path, and projected by their first port on its path
+            own = _path_projection(self, i, track_index)
+            on_path = ~np.isnan(own[0][port_tracks])
+            last = np.maximum.reduceat(np.where(on_path, ports, -1), starts)
+            first = np.minimum.reduceat(
+                np.where(on_path, ports, len(ports)),
+                starts
+            )
+            crossed = last >= 0
+            last, first = last[crossed], first[crossed]
+            own_offsets = _project(
+                own,
+                port_tracks[last],
+                port_positions[last]
+            )
+            arrival = self.train_arrival(i)
+            arrival_offset = _project(
+                own,
+                np.array([track_index[arrival.track_section]]),
+                np.array([arrival.position]),
+            )[0]
+            before_arrival = ~np.isnan(own_offsets)
+            if not np.isnan(arrival_offset):
+                before_arrival[before_arrival] = (
+                    own_offsets[before_arrival] <= arrival_offset
+                )
+            t = np.concatenate([
+                t,
+                np.interp(own_offsets[before_arrival], path_offset, t),
+            ])
+            offset = np.concatenate([
+                offset,
+                _project(
+                    reference,
+                    port_tracks[first[before_arrival]],
+                    port_positions[first[before_arrival]],
+                )
+            ])
+
+        order = np.argsort(t, kind='stable')
+        times.append(t[order])
+        offsets.append(offset[order])
+
+    points = self.points_encountered_by_train(train)
+    operational_points = {
+        op['id']: op for op in self.infra['operational_points']
+    }
+    station_names = dict()
+    for point in points:
+        if point['type'] == 'station':
+            try:
+                station_names[point['id']] = (
+                    operational_points[point['id']]
+                    ['extensions']['identifier']['name']
+                )
+            except KeyError:
+                pass
+
+    data = SpaceTimeData(
+        train=train,
+        eco_or_base=eco_or_base,
+        trains=list(self.trains),
+        times=times,
+        offsets=offsets,
+        points=points,
+        station_names=station_names,
+    )
+    cached[1][(train, eco_or_base)] = data
+    return data
@@ -0,0 +1,100 @@
+import pandas as pd
+
+from pyosrd.schedules import Schedule
+from pyosrd.agents.scheduler_agent import SchedulerAgent
+from pyosrd.agents.benchmark import (
+    benchmark_agents,
+    generate_scenarii,
+    regressions,
+)
+
+
+def test_generate_scenarii():
+
+    scenarii = generate_scenarii(
+        num_trains=[2, 3],
+        num_stations=[1, 2],
+        seeds=[1],
+    )
+
+    assert len(scenarii) == 5
+    assert scenarii[0] == {
+        'scenario': 'multistation_multitrains_randomdelay_2tr_1st_seed1',
+        'with_delay': 'multistation_multitrains_randomdelay',
+        'params_use_case': {
+            'num_trains': 2,
+            'num_stations': 1,
+            'delay_seed': 1
+        },
+    }
+    assert scenarii[-1]['scenario'] == 'c2y11s_conflict_20_trains'
+
+
+def test_benchmark_agents(tmp_path):
+
+    class DoNothing(SchedulerAgent):
+        @property
+        def regulated_schedule(self) -> Schedule:
+            return self.delayed_schedule
+
+    report = tmp_path / 'bench.csv'
+    df = benchmark_agents(
+        DoNothing('nothing'),
+        generate_scenarii(with_delays=['c1_2trains_delay_train1']),
+        report=str(report),
+    )
+
+    assert df.columns.tolist() == [
+        'scenario',
+        'agent',
+        'num_trains',
+        'wall_time',
+        'nodes_explored',
+        'peak_memory',
+        'total_weighted_delay',
+    ]
+    assert df.scenario.tolist() == ['c1_2trains_delay_train1']
+    assert df.total_weighted_delay.iloc[0] > 0
+    assert df.peak_memory.iloc[0] > 0
+    assert report.exists()
+
+
+def test_benchmark_agents_without_memory():
+
+    class CountRegulations(SchedulerAgent):
+        regulations = 0
+
+        @property
+        def regulated_schedule(self) -> Schedule:
+            CountRegulations.regulations += 1
+            return self.delayed_schedule
+
+    df = benchmark_agents(
+        CountRegulations('count'),
+        generate_scenarii(with_delays=['c1_2trains_delay_train1']),
+        memory=False,
+    )
+
+    assert df.peak_memory.isna().all()
+    assert CountRegulations.regulations == 1
+
+
+def test_regressions():
+
+    baseline = pd.DataFrame({
+        'scenario': ['s1', 's1', 's2'],
+        'agent': ['a', 'b', 'a'],
+        'wall_time': [1., 1., 1.],
+        'total_weighted_delay': [10., 10., 10.],
+    })
+    report = baseline.copy()
+    report.loc[1, 'wall_time'] = 2.
+    report.loc[2, 'total_weighted_delay'] = 20.
+
+    df = regressions(report, baseline)
+
+    assert df[['scenario', 'agent']].values.tolist() == [
+        ['s1', 'b'],
+        ['s2', 'a'],
+    ]
+    assert regressions(baseline, baseline).empty
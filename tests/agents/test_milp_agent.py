@@ -0,0 +1,120 @@
+import time
+
+from pyosrd.agents.milp_agent import MILPAgent
+from pyosrd.schedules import Schedule
+
+
+def test_milp_agent_solves_conflict(two_trains):
+
+    delayed = two_trains.add_delay(0, 0, 1)
+    assert not delayed.no_conflict()
+
+    agent = MILPAgent(
+        'milp',
+        ref_schedule=two_trains,
+        delayed_schedule=delayed
+    )
+    regulated = agent.regulated_schedule
+
+    assert regulated.no_conflict()
+    assert agent.solver_status == 'OPTIMAL'
+    assert (regulated.starts >= delayed.starts).where(
+        delayed.starts.notna(), True
+    ).all().all()
+
+
+def test_milp_agent_no_conflict_keeps_delayed_schedule(two_trains):
+
+    agent = MILPAgent(
+        'milp',
+        ref_schedule=two_trains,
+        delayed_schedule=two_trains
+    )
+
+    assert agent.regulated_schedule.df.equals(two_trains.df)
+    assert agent.departures_to_shift() == {}
+    assert agent.delays_to_add() == {}
+
+
+def test_milp_agent_fixed_duration(two_trains):
+
+    delayed = two_trains.add_delay(0, 0, 1)
+    fixed = delayed.durations.notna()
+
+    agent = MILPAgent(
+        'milp',
+        ref_schedule=two_trains,
+        delayed_schedule=delayed,
+        step_has_fixed_duration=fixed,
+    )
+    regulated = agent.regulated_schedule
+
+    assert regulated.no_conflict()
+    assert (
+        (regulated.durations - delayed.durations).fillna(0) == 0
+    ).all().all()
+
+
+def test_milp_agent_frozen_steps(two_trains):
+
+    delayed = two_trains.add_delay(0, 0, 1)
+    frozen = delayed.starts.notna() & False
+    frozen.loc[2, delayed.trains[1]] = True
+
+    agent = MILPAgent(
+        'milp',
+        ref_schedule=two_trains,
+        delayed_schedule=delayed,
+        frozen_steps=frozen,
+    )
+    regulated = agent.regulated_schedule
+
+    assert regulated.no_conflict()
+    for times in ['starts', 'ends']:
+        assert (
+            getattr(regulated, times).loc[2, delayed.trains[1]]
+            == getattr(delayed, times).loc[2, delayed.trains[1]]
+        )
+
+
+def test_milp_agent_solution_callback(two_trains):
+
+    solutions = []
+    agent = MILPAgent(
+        'milp',
+        ref_schedule=two_trains,
+        delayed_schedule=two_trains.add_delay(0, 0, 1),
+        solution_callback=lambda s, obj: solutions.append(obj),
+        num_workers=1,
+    )
+    agent.regulated_schedule
+
+    assert solutions
+    assert solutions == sorted(solutions, reverse=True)
+
+
+def test_milp_agent_stop_requested():
+
+    num_trains, num_zones = 40, 6
+    schedule = Schedule(num_zones, num_trains)
+    for train in range(num_trains):
+        for zone in range(num_zones):
+            start = train * 0.5 + zone
+            schedule.df.at[zone, train] = [start, start + 1 + train % 3]
+
+    agent = MILPAgent(
+        'milp',
+        ref_schedule=schedule,
+        delayed_schedule=schedule.add_delay(0, 0, 3),
+        time_limit=60.,
+        stop_requested=lambda: True,
+        stop_poll_interval=0.05,
+    )
+    tic = time.perf_counter()
+    try:
+        agent.regulated_schedule
+    except RuntimeError:
+        pass  # stopped before any solution was found
+
+    assert time.perf_counter() - tic < 30.
+    assert agent.solver_status in ['FEASIBLE', 'UNKNOWN']
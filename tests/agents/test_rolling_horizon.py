@@ -0,0 +1,135 @@
+from dataclasses import dataclass, field
+
+import pytest
+
+from pyosrd.agents.milp_agent import MILPAgent
+from pyosrd.agents.rolling_horizon import RollingHorizonAgent
+from pyosrd.agents.scheduler_agent import SchedulerAgent
+from pyosrd.schedules import Schedule
+
+
+@dataclass
+class _RecordingMILPAgent(MILPAgent):
+    """MILPAgent keeping the delayed schedule, frozen steps and regulated
+    schedule of each window"""
+
+    windows: list = field(default_factory=list)
+
+    @property
+    def regulated_schedule(self) -> Schedule:
+        regulated = super().regulated_schedule
+        self.windows.append(
+            (self.delayed_schedule, self.frozen_steps, regulated)
+        )
+        return regulated
+
+
+@dataclass
+class _DelayedAgent(SchedulerAgent):
+    """Agent keeping the delayed schedule, without search statistics"""
+
+    @property
+    def regulated_schedule(self) -> Schedule:
+        return self.delayed_schedule
+
+
+def test_rolling_horizon_solves_conflicts(three_trains):
+
+    delayed = three_trains.add_delay(0, 0, 1)
+    agent = RollingHorizonAgent(
+        'rolling',
+        ref_schedule=three_trains,
+        delayed_schedule=delayed,
+        agent=MILPAgent('milp'),
+        window=3,
+        overlap=1,
+    )
+    regulated = agent.regulated_schedule
+
+    assert not delayed.no_conflict()
+    assert regulated.no_conflict()
+    assert len(agent.window_stats) == 3
+    assert agent.window_stats.start.tolist() == [0, 2, 4]
+    assert (agent.window_stats.solve_time > 0).all()
+
+
+def test_rolling_horizon_single_window(three_trains):
+
+    delayed = three_trains.add_delay(0, 0, 1)
+    weights = three_trains.starts.notna().astype(int)
+    milp = MILPAgent(
+        'milp',
+        ref_schedule=three_trains,
+        delayed_schedule=delayed
+    )
+    agent = RollingHorizonAgent(
+        'rolling',
+        ref_schedule=three_trains,
+        delayed_schedule=delayed,
+        agent=MILPAgent('milp'),
+        window=100,
+        overlap=10,
+    )
+
+    assert (
+        agent.regulated_schedule.total_weighted_delay(three_trains, weights)
+        == milp.regulated_schedule.total_weighted_delay(three_trains, weights)
+    )
+    assert len(agent.window_stats) == 1
+
+
+def test_rolling_horizon_overlap_too_long(three_trains):
+
+    agent = RollingHorizonAgent(
+        'rolling',
+        ref_schedule=three_trains,
+        delayed_schedule=three_trains,
+        agent=MILPAgent('milp'),
+        window=10,
+        overlap=10,
+    )
+    with pytest.raises(ValueError, match="overlap must be shorter"):
+        agent.regulated_schedule
+
+
+def test_rolling_horizon_freezes_committed_steps(three_trains):
+
+    delayed = three_trains.add_delay(0, 0, 1)
+    milp = _RecordingMILPAgent('milp')
+    agent = RollingHorizonAgent(
+        'rolling',
+        ref_schedule=three_trains,
+        delayed_schedule=delayed,
+        agent=milp,
+        window=3,
+        overlap=2,
+    )
+    regulated = agent.regulated_schedule
+
+    assert regulated.no_conflict()
+    assert agent.window_stats.num_frozen_steps.sum() > 0
+    for window_delayed, frozen, window_regulated in milp.windows:
+        for zone, train in frozen.stack()[lambda f: f].index:
+            assert (
+                window_regulated.ends.loc[zone, train]
+                == window_delayed.ends.loc[zone, train]
+                == regulated.ends.loc[zone, train]
+            )
+
+
+def test_rolling_horizon_nodes_explored(three_trains):
+
+    agent = RollingHorizonAgent(
+        'rolling',
+        ref_schedule=three_trains,
+        delayed_schedule=three_trains,
+        agent=_DelayedAgent('delayed'),
+        window=3,
+        overlap=1,
+    )
+    agent.regulated_schedule
+    assert agent.nodes_explored is None
+
+    agent.agent = MILPAgent('milp')
+    agent.regulated_schedule
+    assert agent.nodes_explored == agent.window_stats.nodes_explored.sum()
@@ -7,6 +7,7 @@ import pytest
 
 from pyosrd import OSRD
 from pyosrd.schedules import Schedule
+from pyosrd.agents.milp_agent import MILPAgent
 from pyosrd.agents.scheduler_agent import SchedulerAgent
 from pyosrd.agents.scheduler_agent import regulate_scenarii_with_agents
 
@@ -57,6 +58,46 @@ def test_scheduler_agent_autonomous(two_trains):
     )
 
 
+def test_scheduler_agent_result_computed_once(two_trains):
+
+    class CountingAgent(SchedulerAgent):
+        num_calls: int = 0
+
+        @property
+        def regulated_schedule(self) -> Schedule:
+            self.num_calls += 1
+            return self.delayed_schedule.add_delay(0, 2, 5)
+
+    agent = CountingAgent(
+        'counting',
+        ref_schedule=two_trains,
+        delayed_schedule=two_trains.add_delay(0, 0, 10),
+    )
+
+    assert agent.departures_to_shift() == {}
+    assert agent.delays_to_add() == {'train1': {2: 5.}}
+    assert agent.result.stats['wall_time'] >= 0
+    assert agent.num_calls == 1
+
+    agent.delayed_schedule = two_trains
+    agent.delays_to_add()
+    assert agent.num_calls == 2
+
+
+def test_scheduler_agent_result_reset_by_parameters(two_trains):
+
+    agent = MILPAgent(
+        'milp',
+        ref_schedule=two_trains,
+        delayed_schedule=two_trains.add_delay(0, 0, 1),
+    )
+    result = agent.result
+    assert agent.result is result
+
+    agent.time_limit = 5.
+    assert agent.result is not result
+
+
 def test_scheduler_agent_in_regulate(test_agent):
 
     sim = OSRD(simulation='station_capacity2', dir='tmp2')
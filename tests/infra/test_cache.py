@@ -0,0 +1,98 @@
+import json
+import os
+import shutil
+
+import pytest
+
+from pyosrd.infra.cache import cache_path, load_infra
+
+
+@pytest.fixture
+def infra_path(tmp_path):
+    path = tmp_path / 'case' / 'infra.json'
+    path.parent.mkdir()
+    shutil.copy('cases/hamelinfra/infra.json', path)
+    return str(path)
+
+
+@pytest.fixture
+def directory(tmp_path):
+    return str(tmp_path / 'cache')
+
+
+def test_load_infra_writes_cache(infra_path, directory):
+
+    with open(infra_path) as f:
+        expected = json.load(f)
+
+    assert load_infra(infra_path, directory=directory) == expected
+    assert os.path.exists(cache_path(infra_path, directory))
+    assert os.listdir(os.path.dirname(infra_path)) == ['infra.json']
+    assert load_infra(infra_path, directory=directory) == expected
+
+
+def test_load_infra_outdated_cache(infra_path, directory):
+
+    infra = load_infra(infra_path, directory=directory)
+    infra['version'] = 'modified'
+    with open(infra_path, 'w') as f:
+        json.dump(infra, f)
+
+    assert load_infra(infra_path, directory=directory)['version'] == (
+        'modified'
+    )
+
+
+def test_load_infra_touched_file(infra_path, directory):
+
+    infra = load_infra(infra_path, directory=directory)
+    os.utime(infra_path, ns=(0, 0))
+
+    assert load_infra(infra_path, directory=directory) == infra
+
+
+def test_load_infra_invalid_json(tmp_path, directory):
+
+    path = tmp_path / 'infra.json'
+    path.write_text('not json')
+
+    assert load_infra(str(path), directory=directory) == {}
+    assert not os.path.exists(directory)
+
+
+def test_load_infra_without_cache(infra_path, directory):
+
+    load_infra(infra_path, use_cache=False, directory=directory)
+    assert not os.path.exists(directory)
+
+
+def test_load_infra_cache_disabled(infra_path, monkeypatch):
+
+    monkeypatch.setenv('PYOSRD_CACHE_DIR', '0')
+    assert load_infra(infra_path)['track_sections']
+    assert os.listdir(os.path.dirname(infra_path)) == ['infra.json']
+
+
+def test_load_infra_read_only_cache(infra_path, tmp_path):
+
+    directory = tmp_path / 'read_only'
+    directory.write_text('not a directory')
+
+    with pytest.warns(UserWarning, match='not written'):
+        assert load_infra(infra_path, directory=str(directory))
+
+
+def test_load_infra_evicts_least_recently_used(infra_path, directory):
+
+    load_infra(infra_path, directory=directory)
+    first = cache_path(infra_path, directory)
+    size = os.path.getsize(first)
+
+    infra = load_infra(infra_path, directory=directory)
+    infra['version'] = 'modified'
+    with open(infra_path, 'w') as f:
+        json.dump(infra, f)
+    load_infra(infra_path, directory=directory, max_size=size + 1_000)
+
+    assert not os.path.exists(first)
+    assert os.path.exists(cache_path(infra_path, directory))
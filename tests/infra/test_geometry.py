@@ -0,0 +1,69 @@
+import json
+
+import numpy as np
+import pytest
+
+from haversine import haversine
+
+from pyosrd.infra.geometry import TrackGeometry, haversine_distances
+
+
+@pytest.fixture(scope='module')
+def hamelinfra() -> dict:
+    with open('cases/hamelinfra/infra.json') as f:
+        return json.load(f)
+
+
+def test_haversine_distances():
+
+    a = np.array([[-0.4, 49.5], [2.35, 48.85]])
+    b = np.array([[-0.41, 49.51], [2.35, 48.86]])
+
+    np.testing.assert_allclose(
+        haversine_distances(a, b),
+        [
+            haversine(p[::-1], q[::-1], unit='m')
+            for p, q in zip(a, b)
+        ],
+    )
+
+
+def test_track_geometry_ends(hamelinfra):
+
+    geometry = TrackGeometry(hamelinfra)
+    tracks = hamelinfra['track_sections']
+
+    coords = geometry.coordinates(
+        [t['id'] for t in tracks] * 2,
+        [0.] * len(tracks) + [t['length'] for t in tracks],
+    )
+
+    np.testing.assert_allclose(
+        coords,
+        [t['geo']['coordinates'][0][::-1] for t in tracks]
+        + [t['geo']['coordinates'][-1][::-1] for t in tracks],
+    )
+
+
+def test_track_geometry_interpolation():
+
+    infra = {'track_sections': [
+        {'id': 'T0', 'length': 100., 'geo': {'coordinates': [[0., 0.]]}},
+        {
+            'id': 'T1',
+            'length': 300.,
+            'geo': {'coordinates': [[0., 0.], [0., 0.001], [0., 0.003]]},
+        },
+    ]}
+    geometry = TrackGeometry(infra)
+
+    arc_lengths = geometry.track_arc_lengths('T1')
+    assert arc_lengths[0] == 0.
+    np.testing.assert_allclose(arc_lengths[2], 3 * arc_lengths[1], 1e-3)
+
+    np.testing.assert_allclose(
+        geometry.coordinates(['T1', 'T1', 'T0', 'T1'], [50., 200., 50., 1e4]),
+        [[0.0005, 0.], [0.002, 0.], [0., 0.], [0.003, 0.]],
+        atol=1e-7,
+    )
+    assert geometry.coordinates([], []).shape == (0, 2)
@@ -0,0 +1,70 @@
+import json
+
+import pytest
+
+from pyosrd.infra.routes import (
+    infra_indexes,
+    read_infra_indexes,
+    route_index,
+)
+
+
+@pytest.fixture(scope='module')
+def hamelinfra() -> dict:
+    with open('cases/hamelinfra/infra.json') as f:
+        return json.load(f)
+
+
+def test_infra_indexes_routes(hamelinfra):
+
+    routes = infra_indexes(hamelinfra)['routes']
+
+    assert len(routes) == len(hamelinfra['routes'])
+    assert routes['rt.D.track.014.end->D.track.038.1'] == {
+        'track_sections': [
+            {'id': 'track.014', 'direction': 'START_TO_STOP'},
+            {'id': 'track.016', 'direction': 'START_TO_STOP'},
+            {'id': 'track.038', 'direction': 'START_TO_STOP'},
+        ],
+        'offsets': [0., 9250., 9290.],
+    }
+
+
+def test_infra_indexes_waypoints_and_switches(hamelinfra):
+
+    indexes = infra_indexes(hamelinfra)
+
+    assert indexes['waypoints_tracks']['D.track.014.end'] == 'track.014'
+    switch, port = indexes['switches_ports']['track.014']['switch.6376']
+    assert switch['ports'][port]['track'] == 'track.014'
+
+
+def test_infra_indexes_invalid_routes(hamelinfra):
+
+    infra = dict(hamelinfra)
+    route = dict(hamelinfra['routes'][0])
+    infra['routes'] = [
+        route | {'id': 'no_waypoint', 'entry_point': {'id': 'D.missing'}},
+        route | {
+            'id': 'no_switch',
+            'switches_directions': {'switch.missing': 'A_B1'},
+        },
+    ]
+
+    indexes = infra_indexes(infra)
+
+    assert indexes['routes'] == {}
+    assert 'D.missing' in indexes['invalid_routes']['no_waypoint']
+    assert 'switch.missing' in indexes['invalid_routes']['no_switch']
+    with pytest.raises(ValueError, match='no_switch.*switch.missing'):
+        route_index(indexes, 'no_switch')
+    with pytest.raises(ValueError, match='unknown.*not in the infra'):
+        route_index(indexes, 'unknown')
+
+
+def test_read_infra_indexes(hamelinfra):
+
+    assert (
+        read_infra_indexes('cases/hamelinfra/infra.json')
+        == infra_indexes(hamelinfra)
+    )
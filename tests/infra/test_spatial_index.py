@@ -0,0 +1,91 @@
+import os
+import shutil
+
+import pytest
+
+from pyosrd import OSRD
+from pyosrd.infra.spatial_index import SpatialIndex
+
+
+@pytest.fixture
+def index() -> SpatialIndex:
+    # Coordinates as [lng, lat]
+    infra = {'track_sections': [
+        {'id': 'T0', 'geo': {'coordinates': [[2.0, 48.0], [2.1, 48.0]]}},
+        {'id': 'T1', 'geo': {'coordinates': [[2.0, 48.5], [2.5, 49.0]]}},
+        {'id': 'T2', 'geo': {'coordinates': [[3.0, 50.0], [3.0, 50.2]]}},
+        {
+            'id': 'T3',
+            'geo': {'coordinates': [[1.0, 48.0], [1.0, 49.0], [1.5, 49.0]]}
+        },
+    ]}
+    return SpatialIndex.from_infra(infra, cell_size=0.25)
+
+
+def test_spatial_index_rectangle(index):
+    assert index.rectangle(47.9, 48.1, 1.9, 2.05) == ['T0']
+    assert index.rectangle(48, 50, 2, 3) == ['T0', 'T1', 'T2']
+    assert index.rectangle(0, 1, 0, 1) == []
+
+
+def test_spatial_index_radius(index):
+    # T0 is ~7.4 km long, on the parallel 48
+    assert index.radius(48.01, 2.05, 1_200) == ['T0']
+    assert index.radius(48.02, 2.05, 1_200) == []
+
+
+def test_spatial_index_polygon(index):
+    # Triangle crossed by T1 without any of its points inside
+    assert index.polygon([(48.6, 2.2), (48.9, 2.2), (48.9, 2.0)]) == ['T1']
+    # Polygon inside the bbox of T3 but away from its points
+    assert index.polygon([(48.2, 1.2), (48.8, 1.2), (48.8, 1.4)]) == []
+
+
+def test_spatial_index_save_load(index, tmp_path):
+    index.save(tmp_path / 'index.npz')
+    loaded = SpatialIndex.load(tmp_path / 'index.npz')
+    assert loaded.ids == index.ids
+    assert loaded.rectangle(48, 50, 2, 3) == index.rectangle(48, 50, 2, 3)
+
+
+def test_osrd_spatial_index_cache(tmp_path, monkeypatch):
+
+    monkeypatch.setenv('PYOSRD_CACHE_DIR', str(tmp_path / 'cache'))
+    case = tmp_path / 'case'
+    case.mkdir()
+    shutil.copy('cases/hamelinfra/infra.json', case / 'infra.json')
+
+    index = OSRD(dir=str(case)).spatial_index()
+
+    assert sorted(os.listdir(case)) == ['infra.json']
+    assert len(os.listdir(tmp_path / 'cache' / 'spatial_index')) == 1
+    loaded = OSRD(dir=str(case)).spatial_index()
+    assert loaded.ids == index.ids
+    assert loaded.cell_size == index.cell_size
+
+
+def test_osrd_spatial_index_per_infra(tmp_path, monkeypatch):
+
+    monkeypatch.setenv('PYOSRD_CACHE_DIR', '0')
+    sim = OSRD(dir='cases/hamelinfra')
+    index = sim.spatial_index()
+    assert sim.spatial_index() is index
+
+    sim.infra = {
+        **sim.infra,
+        'track_sections': sim.infra['track_sections'][:10],
+    }
+    assert len(sim.spatial_index().ids) == 10
+
+
+def test_osrd_spatial_index_cache_size(tmp_path, monkeypatch):
+
+    monkeypatch.setenv('PYOSRD_CACHE_DIR', str(tmp_path / 'cache'))
+    monkeypatch.setenv('PYOSRD_SPATIAL_INDEX_CACHE_SIZE', '1')
+    case = tmp_path / 'case'
+    case.mkdir()
+    shutil.copy('cases/hamelinfra/infra.json', case / 'infra.json')
+
+    OSRD(dir=str(case)).spatial_index()
+
+    assert os.listdir(tmp_path / 'cache' / 'spatial_index') == []
@@ -1,4 +1,14 @@
-from pyosrd.infra.split import filter_by_track_section_ids
+import copy
+import json
+import shutil
+
+import pytest
+
+from pyosrd.infra.split import (
+    filter_by_track_section_ids,
+    filter_many,
+    _missing_track_ids,
+)
 
 
 def test_split_point_switch(infra_point_switch):
@@ -148,3 +158,45 @@ def test_split_missing_track(infra_station_c2):
     )
     track_sections = [t['id'] for t in sub.infra['track_sections']]
     assert 'T1' in track_sections
+
+
+def test_split_missing_track_ids(infra_station_c2):
+
+    assert 'T1' in _missing_track_ids(
+        infra_station_c2.infra,
+        {'T0',  'T3', 'T5'},
+    )
+
+
+def test_split_keeps_parent_infra(infra_station_c2):
+
+    infra = copy.deepcopy(infra_station_c2.infra)
+    track_section_ids = ['T0',  'T3', 'T5']
+    filter_by_track_section_ids(infra_station_c2, track_section_ids)
+    assert infra_station_c2.infra == infra
+    assert track_section_ids == ['T0',  'T3', 'T5']
+
+
+@pytest.mark.parametrize('max_workers', [1, 2])
+def test_split_filter_many(infra_station_c2, max_workers):
+
+    cuts = [['T0', 'T3', 'T5'], ['T1'], ['T0', 'T1']]
+    subs = filter_many(
+        infra_station_c2,
+        cuts,
+        dirs=[f'tmp_station_c2_many{i}' for i in range(len(cuts))],
+        max_workers=max_workers,
+    )
+    for cut, sub in zip(cuts, subs):
+        expected = filter_by_track_section_ids(infra_station_c2, cut)
+        assert (
+            json.dumps(sub.infra, sort_keys=True)
+            == json.dumps(expected.infra, sort_keys=True)
+        )
+        shutil.rmtree(sub.dir, ignore_errors=True)
+
+
+def test_split_filter_many_wrong_dirs(infra_station_c2):
+
+    with pytest.raises(ValueError, match="2 directories given for 1"):
+        filter_many(infra_station_c2, [['T0']], dirs=['a', 'b'])
@@ -0,0 +1,295 @@
+"""Comparison of the split of infras with its previous algorithm
+
+The _baseline_* functions are the route walk of filter_by_track_section_ids
+and generate_updated_routes before they used hashed lookups and
+`infra_indexes()`, kept unchanged as a reference.
+"""
+import copy
+import json
+import random
+
+import pytest
+
+from pyosrd.infra.routes import SWITCH_EXIT
+from pyosrd.infra.split import (
+    SWITCHES_TYPES_DIRECTIONS,
+    _missing_track_ids,
+    generate_updated_routes,
+)
+
+
+def _baseline_missing_track_ids(
+    infra: dict,
+    track_section_ids: list[str],
+) -> set[str]:
+
+    detector_ids = [
+        detector['id']
+        for detector in infra['detectors']
+        if detector['track'] in track_section_ids
+    ]
+
+    buffer_stop_ids = [
+        buffer_stop['id']
+        for buffer_stop in infra['buffer_stops']
+        if buffer_stop['track'] in track_section_ids
+    ]
+
+    missing_track_ids = set()
+
+    SWITCHES_TRACKS = {
+        s['id']: [e['track'] for e in s['ports'].values()]
+        for s in infra['switches']
+    }
+
+    for route in infra['routes']:
+        if (
+            route['entry_point']['id'] in detector_ids+buffer_stop_ids
+            and
+            route['exit_point']['id'] in detector_ids+buffer_stop_ids
+        ):
+            not_visited = set(route['switches_directions'].keys())
+
+            curr_track = next(
+                p['track']
+                for p in infra['detectors'] + infra['buffer_stops']
+                if p['id'] == route['entry_point']['id']
+            )
+            while not_visited:
+                sw = next(
+                    switch
+                    for switch in infra['switches']
+                    if curr_track in SWITCHES_TRACKS[switch['id']]
+                    and switch['id'] in not_visited
+                )
+                sw_id = sw['id']
+                entry_port = next(
+                    p
+                    for p, details in sw['ports'].items()
+                    if details['track'] == curr_track
+                )
+                direction = route['switches_directions'][sw_id]
+                exit_port =\
+                    SWITCH_EXIT[sw['switch_type']][direction][entry_port]
+                curr_track = sw['ports'][exit_port]['track']
+                not_visited.remove(sw_id)
+                if curr_track not in track_section_ids:
+                    missing_track_ids.add(curr_track)
+
+    return missing_track_ids
+
+
+def _baseline_generate_updated_routes(
+      original_infra: dict,
+      splitted_infra: dict,
+      switches_to_buffer_stops: dict[str, dict],
+      modified_switches: dict[str, dict],
+) -> list:
+
+    detectors = [d['id'] for d in splitted_infra['detectors']]
+    buffer_stops = [d['id'] for d in splitted_infra['buffer_stops']]
+    switches = {s['id']: s['switch_type'] for s in splitted_infra['switches']}
+    waypoints = detectors + buffer_stops
+
+    updated_routes = []
+    for route in original_infra['routes']:
+        entry = route['entry_point']['id']
+        exit = route['exit_point']['id']
+        if entry in waypoints and exit in waypoints:
+            new_route = copy.deepcopy(route)
+            release_detectors = [
+                d for d in route['release_detectors']
+                if d in detectors
+            ]
+            new_route['release_detectors'] = release_detectors
+            switches_directions = {}
+            for sw, dir in route['switches_directions'].items():
+                if sw in switches:
+                    if sw in modified_switches:
+                        switches_directions[sw] = modified_switches[sw][dir]
+                    else:
+                        switches_directions[sw] = dir
+            new_route['switches_directions'] = switches_directions
+            updated_routes.append(new_route)
+        if entry in waypoints and exit not in waypoints:
+            replaced = [
+                switch_id for switch_id in route['switches_directions']
+                if switch_id in switches_to_buffer_stops
+            ]
+            if replaced:
+                new_route = copy.deepcopy(route)
+                port =\
+                    route['switches_directions'][replaced[0]].replace('A_', '')
+                if port in switches_to_buffer_stops[replaced[0]]:
+                    bs = switches_to_buffer_stops[replaced[0]][port]
+                    exit_point = {'type': 'BufferStop', 'id': bs}
+                    new_route['exit_point'] = exit_point
+                    new_route['id'] = route['id'].replace(exit, bs)
+                    switches_directions = {}
+                    for sw, dir in route['switches_directions'].items():
+                        if sw in switches:
+                            if sw in modified_switches:
+                                switches_directions[sw] =\
+                                    modified_switches[sw][dir]
+                            else:
+                                switches_directions[sw] = dir
+                    new_route['switches_directions'] = switches_directions
+                    release_detectors = [
+                        d for d in route['release_detectors']
+                        if d in detectors
+                    ]
+                    new_route['release_detectors'] = release_detectors
+                    buffer_stop_exit = next(
+                        b for b in splitted_infra['buffer_stops']
+                        if b['id'] == bs
+                    )
+                    if buffer_stop_exit['position'] != 0:
+                        new_route['entry_point_direction'] = "START_TO_STOP"
+                    else:
+                        new_route['entry_point_direction'] = "STOP_TO_START"
+                    if not (
+                        new_route['entry_point']['type']
+                        == new_route['exit_point']['type']
+                        == 'BufferStop'
+                    ):
+                        updated_routes.append(new_route)
+
+        if entry not in waypoints and exit in waypoints:
+
+            replaced = [
+                switch_id for switch_id in route['switches_directions']
+                if switch_id in switches_to_buffer_stops
+            ]
+
+            if replaced:
+                new_route = copy.deepcopy(route)
+                port = (
+                    route['switches_directions'][replaced[-1]]
+                    .replace('A_', '')
+                )
+                if port in switches_to_buffer_stops[replaced[-1]]:
+
+                    bs = switches_to_buffer_stops[replaced[-1]][port]
+                    entry_point = {
+                        'type': 'BufferStop',
+                        'id': bs
+                    }
+                    new_route['entry_point'] = entry_point
+                    new_route['id'] = route['id'].replace(entry, bs)
+                    switches_directions = {}
+                    for sw, dir in route['switches_directions'].items():
+                        if sw in switches:
+                            if sw in modified_switches:
+                                switches_directions[sw] =\
+                                    modified_switches[sw][dir]
+                            else:
+                                switches_directions[sw] = dir
+                    new_route['switches_directions'] = switches_directions
+                    release_detectors = [
+                        d for d in route['release_detectors']
+                        if d in detectors
+                    ]
+                    buffer_stop_entry = next(
+                        b for b in splitted_infra['buffer_stops']
+                        if b['id'] == bs
+                    )
+                    if buffer_stop_entry['position'] == 0:
+                        new_route['entry_point_direction'] = "START_TO_STOP"
+                    else:
+                        new_route['entry_point_direction'] = "STOP_TO_START"
+                    new_route['release_detectors'] = release_detectors
+
+                    if not (
+                        new_route['entry_point']['type']
+                        == new_route['exit_point']['type']
+                        == 'BufferStop'
+                    ):
+                        updated_routes.append(new_route)
+
+    return updated_routes
+
+
+def _split_inputs(
+    infra: dict,
+    track_section_ids: set[str],
+) -> tuple[dict, dict, dict]:
+    """Sub-infra, switches replaced by buffer stops and switches replaced
+    by links, as built by filter_by_track_section_ids"""
+
+    lengths = {t['id']: t['length'] for t in infra['track_sections']}
+    splitted = {
+        'detectors': [
+            d for d in infra['detectors'] if d['track'] in track_section_ids
+        ],
+        'buffer_stops': [
+            b for b in infra['buffer_stops']
+            if b['track'] in track_section_ids
+        ],
+        'switches': [],
+    }
+    switches_to_buffer_stops, modified_switches = dict(), dict()
+    for switch in infra['switches']:
+        keep_ports = {
+            port: details for port, details in switch['ports'].items()
+            if details['track'] in track_section_ids
+        }
+        if not keep_ports:
+            continue
+        switches_to_buffer_stops[switch['id']] = dict()
+        if len(keep_ports) == len(switch['ports']):
+            splitted['switches'].append(switch)
+        elif len(keep_ports) == 1:
+            port, details = next(iter(keep_ports.items()))
+            bs = f"bs.{len(splitted['buffer_stops'])}"
+            splitted['buffer_stops'].append({
+                'id': bs,
+                'track': details['track'],
+                'position': (
+                    0 if details['endpoint'] == 'BEGIN'
+                    else lengths[details['track']]
+                ),
+            })
+            if switch['switch_type'] in ['link', 'crossing']:
+                port = 'STATIC'
+            switches_to_buffer_stops[switch['id']][port] = bs
+        elif switch['switch_type'] == 'point_switch' and 'A' in keep_ports:
+            splitted['switches'].append(switch | {'switch_type': 'link'})
+            modified_switches[switch['id']] = {
+                p: 'STATIC'
+                for p in SWITCHES_TYPES_DIRECTIONS[switch['switch_type']]
+            }
+    return splitted, switches_to_buffer_stops, modified_switches
+
+
+@pytest.fixture(scope='module')
+def hamelinfra() -> dict:
+    with open('cases/hamelinfra/infra.json') as f:
+        return json.load(f)
+
+
+@pytest.mark.parametrize('seed', range(10))
+def test_split_same_as_baseline(hamelinfra, seed):
+
+    infra = copy.deepcopy(hamelinfra)
+    rng = random.Random(seed)
+    tracks = [t['id'] for t in infra['track_sections']]
+    track_section_ids = rng.sample(tracks, rng.randint(1, len(tracks)))
+
+    missing = _missing_track_ids(infra, set(track_section_ids))
+    assert missing == _baseline_missing_track_ids(infra, track_section_ids)
+
+    inputs = _split_inputs(infra, set(track_section_ids) | missing)
+    routes = generate_updated_routes(infra, *inputs)
+    assert routes == _baseline_generate_updated_routes(infra, *inputs)
+    assert infra == hamelinfra
+
+
+def test_split_invalid_route(hamelinfra):
+
+    infra = copy.deepcopy(hamelinfra)
+    route = next(r for r in infra['routes'] if r['switches_directions'])
+    route['switches_directions'] = {'switch.missing': 'A_B1'}
+    tracks = {t['id'] for t in infra['track_sections']}
+
+    with pytest.raises(ValueError, match=f"{route['id']}.*switch.missing"):
+        _missing_track_ids(infra, tracks)
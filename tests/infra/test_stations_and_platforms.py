@@ -0,0 +1,96 @@
+from types import SimpleNamespace
+
+import pytest
+
+from pyosrd.infra.stations_and_platforms import (
+    platform_location,
+    platform_locations,
+    platforms,
+    station_catalog,
+    stations,
+)
+
+
+def _track(id: str, track_name: str, line_code: int) -> dict:
+    return {
+        'id': id,
+        'extensions': {'sncf': {
+            'track_name': track_name,
+            'line_code': line_code,
+            'line_name': f'Line {line_code}',
+        }},
+    }
+
+
+def _op(id: str, name: str, ch: str, parts: list[tuple[str, float]]):
+    return {
+        'id': id,
+        'parts': [{'track': t, 'position': p} for t, p in parts],
+        'extensions': {
+            'identifier': {'name': name},
+            'sncf': {'ch': ch},
+        },
+    }
+
+
+@pytest.fixture
+def sim():
+    return SimpleNamespace(infra={
+        'track_sections': [
+            _track('T0', 'V1', 1),
+            _track('T1', 'V2', 1),
+            _track('T2', 'V1', 2),
+        ],
+        'operational_points': [
+            _op('op0', 'Évry-Courcouronnes', 'BV', [('T0', 10), ('T1', 20)]),
+            _op('op1', 'Saint-Lô', '00', [('T2', 30)]),
+            _op('op2', 'Saint-Lô', 'XX', [('T2', 40)]),
+        ],
+    })
+
+
+def test_stations(sim):
+    assert stations(sim) == ['Saint-Lô', 'Évry-Courcouronnes']
+
+
+def test_platforms(sim):
+    assert platforms(sim, 'Évry-Courcouronnes') == {
+        'V1': {'track_section': 'T0', 'offset': 10, 'line_code': 1},
+        'V2': {'track_section': 'T1', 'offset': 20, 'line_code': 1},
+    }
+    assert platform_location(sim, 'Saint-Lô', 'V1') == ('T2', 30)
+
+
+def test_platform_locations(sim):
+    df = platform_locations(
+        sim,
+        [('Saint-Lô', 'V1'), ('Nowhere', 'V1'), ('Évry-Courcouronnes', 'V2')]
+    )
+    assert df.track_section.tolist()[::2] == ['T2', 'T1']
+    assert df.offset.isna().tolist() == [False, True, False]
+
+
+def test_station_catalog_find(sim):
+    catalog = station_catalog(sim)
+    assert catalog.find('evry courcouronnes') == ['Évry-Courcouronnes']
+    assert catalog.find('saint') == ['Saint-Lô']
+    assert catalog.find('Saint Lo') == ['Saint-Lô']
+    assert station_catalog(sim) is catalog
+
+
+def test_station_catalog_missing_extensions_and_duplicates(sim):
+
+    sim.infra['operational_points'] += [
+        {'id': 'op3', 'parts': [{'track': 'T0', 'position': 5}]},
+        {
+            'id': 'op4',
+            'parts': [{'track': 'T1', 'position': 5}],
+            'extensions': {'identifier': {'name': 'Nowhere'}},
+        },
+        _op('op5', 'Saint-Lô', '00', [('T2', 50)]),
+    ]
+    sim.infra['track_sections'].append({'id': 'T3'})
+
+    assert stations(sim) == ['Saint-Lô', 'Évry-Courcouronnes']
+    assert station_catalog(sim).find('Nowhere') == ['Nowhere']
+    assert platform_location(sim, 'Saint-Lô', 'V1') == ('T2', 30)
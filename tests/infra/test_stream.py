@@ -0,0 +1,95 @@
+import json
+
+import pytest
+
+from pyosrd.infra.spatial_index import SpatialIndex
+from pyosrd.infra.stream import (
+    SPLIT_SECTIONS,
+    _ChunkedReader,
+    _iter_top_level,
+    iter_section,
+    iter_sections,
+    read_infra,
+    read_track_section_lengths,
+)
+
+HAMELINFRA = 'cases/hamelinfra/infra.json'
+
+
+def test_read_infra_sections():
+
+    with open(HAMELINFRA) as f:
+        infra = json.load(f)
+    sub = read_infra(HAMELINFRA, SPLIT_SECTIONS)
+
+    assert set(sub) == set(SPLIT_SECTIONS)
+    assert all(sub[section] == infra[section] for section in sub)
+    assert read_infra(HAMELINFRA) == infra
+
+
+def test_iter_section():
+
+    with open(HAMELINFRA) as f:
+        routes = json.load(f)['routes']
+
+    assert list(iter_section(HAMELINFRA, 'routes')) == routes
+    assert list(iter_section(HAMELINFRA, 'missing')) == []
+
+
+def test_iter_sections():
+
+    with open(HAMELINFRA) as f:
+        infra = json.load(f)
+    items = list(iter_sections(HAMELINFRA, ['routes', 'switches']))
+
+    for section in ['routes', 'switches']:
+        assert [
+            item for key, item in items if key == section
+        ] == infra[section]
+    assert {key for key, _ in items} == {'routes', 'switches'}
+
+
+def test_read_track_section_lengths():
+
+    with open(HAMELINFRA) as f:
+        tracks = json.load(f)['track_sections']
+
+    assert read_track_section_lengths(HAMELINFRA) == {
+        t['id']: t['length'] for t in tracks
+    }
+
+
+@pytest.mark.parametrize('chunk_size', [1, 2, 3, 5, 8])
+def test_stream_small_chunks(tmp_path, chunk_size):
+
+    doc = {
+        'skipped': ['x\\"]}', {'b': [1, 2.5e3, -3]}],
+        'routes': [{'id': 'r"1'}, {'id': 'é'}],
+        'number': 12345,
+        'empty': [],
+    }
+    path = tmp_path / 'infra.json'
+    path.write_text(json.dumps(doc, ensure_ascii=False))
+
+    with open(path) as f:
+        read = list(_iter_top_level(
+            _ChunkedReader(f, chunk_size),
+            {'routes', 'number', 'empty'}
+        ))
+
+    assert read == [
+        ('routes', {'id': 'r"1'}, True),
+        ('routes', {'id': 'é'}, True),
+        ('number', 12345, False),
+        ('empty', [], False),
+    ]
+
+
+def test_spatial_index_from_file():
+
+    index = SpatialIndex.from_file(HAMELINFRA)
+    with open(HAMELINFRA) as f:
+        expected = SpatialIndex.from_infra(json.load(f))
+
+    assert index.ids == expected.ids
+    assert (index.bboxes == expected.bboxes).all()
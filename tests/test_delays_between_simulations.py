@@ -0,0 +1,38 @@
+import numpy as np
+
+from pyosrd.delays_between_simulations import (
+    calculate_delay_f_time,
+    delays_f_time,
+)
+
+
+def test_delays_f_time_same_simulation(simulation_cvg_dvg):
+
+    time, delays = delays_f_time(simulation_cvg_dvg, simulation_cvg_dvg)
+
+    assert delays.shape == (len(time), len(simulation_cvg_dvg.trains))
+    assert time[0] == min(simulation_cvg_dvg.departure_times)
+    assert np.all(delays == 0)
+    assert calculate_delay_f_time(
+        simulation_cvg_dvg,
+        simulation_cvg_dvg,
+        0,
+        'base'
+    ) == [0.] * len(simulation_cvg_dvg._head_position(0, 'base'))
+
+
+def test_delays_f_time_resolution(simulation_cvg_dvg):
+
+    time, _ = delays_f_time(simulation_cvg_dvg, simulation_cvg_dvg)
+    coarse, delays = delays_f_time(
+        simulation_cvg_dvg,
+        simulation_cvg_dvg,
+        resolution=10,
+    )
+
+    assert np.allclose(np.diff(coarse[:-1]), 10)
+    assert 0 < coarse[-1] - coarse[-2] <= 10
+    assert coarse[0] == time[0]
+    assert coarse[-1] == time[-1]
+    assert coarse[-1] == round(max(simulation_cvg_dvg.last_arrival_times))
+    assert delays.shape == (len(coarse), len(simulation_cvg_dvg.trains))
@@ -0,0 +1,52 @@
+import subprocess
+import sys
+
+# Only imported when the features using them are
+HEAVY_MODULES = [
+    'branca',
+    'folium',
+    'gymnasium',
+    'matplotlib',
+    'networkx',
+    'ortools',
+    'pandas',
+    'PIL',
+    'plotly',
+    'railjson_generator',
+    'requests',
+]
+
+IMPORT_TIME_BUDGET = 1.  # seconds
+
+
+def _run(code: str) -> subprocess.CompletedProcess:
+    return subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', code],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+
+
+def test_import_pyosrd_is_light():
+
+    output = _run("import sys, pyosrd; print(' '.join(sys.modules))")
+    modules = {m.split('.')[0] for m in output.stdout.split()}
+
+    assert [m for m in HEAVY_MODULES if m in modules] == []
+
+    # last line of -X importtime: 'import time: self | cumulative | pyosrd'
+    cumulative = int(output.stderr.strip().splitlines()[-1].split('|')[1])
+    assert cumulative / 1e6 < IMPORT_TIME_BUDGET
+
+
+def test_lazy_methods():
+
+    output = _run(
+        "import sys; from pyosrd import OSRD; "
+        "f = OSRD.delays_chart_plotly; "
+        "print(f.__module__, 'plotly' in sys.modules, "
+        "OSRD.__dict__['delays_chart_plotly'] is f)"
+    )
+
+    assert output.stdout.split() == ['pyosrd.viz.delays_chart', 'True', 'True']
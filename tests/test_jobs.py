@@ -0,0 +1,65 @@
+import asyncio
+import time
+
+import pytest
+
+from pyosrd.jobs import JobManager
+
+
+def count(n, progress, sleep=0.):
+    for i in range(n):
+        time.sleep(sleep)
+        progress(done=i + 1, total=n)
+    return n
+
+
+def fail(progress):
+    raise ValueError('no simulation')
+
+
+@pytest.fixture
+def jobs():
+    jobs = JobManager(max_workers=1)
+    yield jobs
+    jobs.shutdown()
+
+
+def test_job_progress_and_result(jobs):
+
+    job = jobs.submit('count', count, 3)
+    assert job.status == 'pending'
+
+    assert asyncio.run(jobs.wait(job)) == 3
+    assert job.status == 'done'
+    assert job.progress == [
+        {'status': 'running'},
+        {'done': 1, 'total': 3},
+        {'done': 2, 'total': 3},
+        {'done': 3, 'total': 3},
+    ]
+    assert job.started <= job.finished
+
+
+def test_job_failure(jobs):
+
+    job = jobs.submit('fail', fail)
+
+    assert asyncio.run(jobs.wait(job)) is None
+    assert job.status == 'failed'
+    assert job.error == 'ValueError: no simulation'
+
+
+def test_job_cancel(jobs):
+
+    running = jobs.submit('running', count, 100, sleep=0.05)
+    pending = jobs.submit('pending', count, 1)
+    while running.status != 'running':
+        jobs.poll()
+    jobs.cancel(running)
+    jobs.cancel(pending)
+
+    assert asyncio.run(jobs.wait(running)) is None
+    assert asyncio.run(jobs.wait(pending)) is None
+    assert running.status == pending.status == 'cancelled'
+    assert not pending.progress
+    assert {j.id for j in jobs.poll()} <= {running.id, pending.id}
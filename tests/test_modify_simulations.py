@@ -1,3 +1,5 @@
+import json
+import os
 import shutil
 import pytest
 
@@ -72,6 +74,86 @@ def test_add_train_existing_label(modify_sim):
         )
 
 
+def test_add_trains(modify_sim):
+    modify_sim.add_trains([
+        {
+            'label': 'new_train0',
+            'locations': [('T0', 300), ('T4', 490)],
+            'departure_time': 400,
+        },
+        {
+            'label': 'new_train1',
+            'locations': [('T0', 300), ('T4', 490)],
+            'departure_time': '00:10:00',
+            'rolling_stock': 'short_fast_rolling_stock',
+        },
+    ])
+    modify_sim.run()
+    assert modify_sim.trains == [
+        'train0', 'train1', 'new_train0', 'new_train1'
+    ]
+    assert modify_sim.departure_times[-1] == 600
+
+
+def test_add_trains_same_as_add_train(tmp_path, monkeypatch):
+    trains = [
+        {
+            'label': f'new_train{i}',
+            'locations': [('T0', 300), ('T4', 490)],
+            'departure_time': 400 + 60 * i,
+            'rolling_stock': 'short_fast_rolling_stock',
+        }
+        for i in range(3)
+    ]
+    one_by_one = OSRD(dir=str(tmp_path / 'one_by_one'), simulation='cvg_dvg')
+    for train in trains:
+        one_by_one.add_train(**train)
+
+    batch = OSRD(dir=str(tmp_path / 'batch'), simulation='cvg_dvg')
+    writes = []
+    dump = json.dump
+    monkeypatch.setattr(
+        json,
+        'dump',
+        lambda obj, f, **kwargs: writes.append(f.name) or dump(obj, f)
+    )
+    batch.add_trains(trains)
+    monkeypatch.undo()
+
+    def without_group_ids(simulation: dict) -> dict:
+        return simulation | {
+            'train_schedule_groups': [
+                {k: v for k, v in group.items() if k != 'id'}
+                for group in simulation['train_schedule_groups']
+            ]
+        }
+
+    assert writes == [os.path.join(batch.dir, batch.simulation_json)]
+    assert (
+        without_group_ids(batch.simulation)
+        == without_group_ids(one_by_one.simulation)
+    )
+    with open(writes[0]) as f:
+        assert json.load(f) == batch.simulation
+
+
+def test_add_trains_duplicated_label(modify_sim):
+    with pytest.raises(ValueError):
+        modify_sim.add_trains([
+            {
+                'label': 'new_train',
+                'locations': [('T0', 300), ('T4', 490)],
+                'departure_time': 400,
+            },
+            {
+                'label': 'new_train',
+                'locations': [('T0', 300), ('T4', 490)],
+                'departure_time': 600,
+            },
+        ])
+    assert 'new_train' not in modify_sim.trains
+
+
 def test_add_scheduled_points_unknown_label(modify_sim):
     with pytest.raises(ValueError):
         modify_sim.add_scheduled_points(
@@ -168,3 +250,29 @@ def test_copy_train_already_existing_label(modify_sim):
             new_train_label='train1',
             departure_time=60.,
         )
+
+
+def test_run_changed_train_only(modify_sim):
+    group0, _ = modify_sim._train_schedule_group['train0']
+    group1, _ = modify_sim._train_schedule_group['train1']
+    results0 = modify_sim.results[group0]
+
+    modify_sim.stop_train('train1', 500, 60)
+    assert modify_sim._changed_groups() == [group1]
+    modify_sim.run()
+    assert modify_sim.results[group0] is results0
+    assert modify_sim._changed_groups() == []
+
+    delta = modify_sim.results
+    modify_sim.run(full=True)
+    assert modify_sim.results == delta
+
+
+def test_run_cancelled_train(modify_sim):
+    modify_sim.cancel_train('train0')
+    modify_sim.run()
+    assert modify_sim.trains == ['train1']
+    assert list(modify_sim.results) == [
+        group['id']
+        for group in modify_sim.simulation['train_schedule_groups']
+    ]
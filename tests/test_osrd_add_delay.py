@@ -1,5 +1,7 @@
 import pytest
 
+from pyosrd.delays import add_delay_between_points, add_delays_in_zones
+
 
 def test_osrd_add_delay_first_train(simulation_straight_line):
 
@@ -43,3 +45,30 @@ def test_osrd_add_delay_formatted_time(simulation_straight_line):
         delayed.last_arrival_times[0]
         - simulation_straight_line.last_arrival_times[0]
     ) == 200.
+
+
+def test_osrd_add_delays_in_zones(simulation_straight_line):
+
+    simulation_straight_line.reset_delays()
+    detectors = [
+        p['id']
+        for p in simulation_straight_line.points_encountered_by_train(0)
+        if p['type'] == 'detector'
+    ]
+    zones = {
+        f'{detectors[0]}<->{detectors[1]}': 60.,
+        f'{detectors[1]}<->{detectors[2]}': 300.,
+    }
+
+    bulk = simulation_straight_line.delayed()
+    add_delays_in_zones(bulk, {'train0': zones})
+
+    sequential = simulation_straight_line.delayed()
+    for zone, delay in zones.items():
+        add_delay_between_points(sequential, 0, *zone.split('<->'), delay)
+
+    assert [
+        pytest.approx(r['time']) for r in bulk._head_position(0)
+    ] == [
+        r['time'] for r in sequential._head_position(0)
+    ]
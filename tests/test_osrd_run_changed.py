@@ -0,0 +1,215 @@
+import copy
+import json
+import os
+
+import pytest
+
+from pyosrd import OSRD
+from pyosrd.osrd import _run_digests
+
+
+def _group(i: int) -> dict:
+    return {
+        'id': f'group.{i}',
+        'schedules': [{
+            'id': f'train{i}',
+            'departure_time': 100. * i,
+            'stops': [],
+        }],
+    }
+
+
+def _results(run: int) -> dict:
+    return {
+        'base_simulations': [{'head_positions': [{'time': run}]}],
+        'eco_simulations': [None],
+    }
+
+
+CASE_FILES = [
+    'infra.json', 'results.digests.json', 'results.json', 'simulation.json'
+]
+
+
+def _write_case(directory, digests: bool = True) -> None:
+    """Case with 3 train schedule groups and fake results, with the
+    digests of the run that produced them if digests is True"""
+
+    files = {
+        'infra.json': {'track_sections': [{'id': 'T0'}]},
+        'simulation.json': {
+            'rolling_stocks': [],
+            'train_schedule_groups': [_group(i) for i in range(3)],
+        },
+        'results.json': {f'group.{i}': _results(0) for i in range(3)},
+    }
+    if digests:
+        files['results.digests.json'] = _run_digests(
+            files['infra.json'],
+            files['simulation.json'],
+        )
+    for name, content in files.items():
+        with open(directory / name, 'w') as f:
+            json.dump(content, f)
+
+
+def _osrd(directory, monkeypatch) -> OSRD:
+    """OSRD whose runs are replaced by results naming the run"""
+
+    sim = OSRD(dir=str(directory))
+    sim.runs = []
+
+    def run_standalone(simulation_json: str, results_json: str) -> dict:
+        with open(os.path.join(sim.dir, simulation_json)) as f:
+            groups = [
+                group['id'] for group in json.load(f)['train_schedule_groups']
+            ]
+        sim.runs.append((simulation_json, groups))
+        assert simulation_json in os.listdir(sim.dir)
+        return {group: _results(len(sim.runs)) for group in groups}
+
+    monkeypatch.setattr(sim, '_run_standalone', run_standalone)
+    return sim
+
+
+@pytest.fixture
+def sim(tmp_path, monkeypatch) -> OSRD:
+
+    monkeypatch.setenv('PYOSRD_CACHE_DIR', '0')
+    _write_case(tmp_path)
+    return _osrd(tmp_path, monkeypatch)
+
+
+def test_changed_groups_unchanged(sim):
+    assert sim._changed_groups() == []
+
+
+def test_changed_groups_stop(sim):
+
+    sim.simulation['train_schedule_groups'][1]['schedules'][0]['stops'] = [
+        {'position': 100., 'duration': 60.}
+    ]
+    assert sim._changed_groups() == ['group.1']
+
+
+def test_changed_groups_added_and_cancelled(sim):
+
+    groups = sim.simulation['train_schedule_groups']
+    groups.append(_group(3))
+    del groups[0]
+    assert sim._changed_groups() == ['group.3']
+
+
+def test_changed_groups_full_run(sim):
+
+    simulated = copy.deepcopy(sim._simulated)
+
+    sim.simulation['time_step'] = 1
+    assert sim._changed_groups() is None
+
+    del sim.simulation['time_step']
+    sim._simulated = simulated
+    sim.infra = {'track_sections': []}
+    assert sim._changed_groups() is None
+
+
+def test_changed_groups_infra_modified_in_place(sim):
+
+    sim.infra['track_sections'][0]['length'] = 100.
+    assert sim._changed_groups() is None
+
+
+def test_changed_groups_without_digests(tmp_path, monkeypatch):
+
+    monkeypatch.setenv('PYOSRD_CACHE_DIR', '0')
+    _write_case(tmp_path, digests=False)
+    sim = _osrd(tmp_path, monkeypatch)
+
+    assert sim._changed_groups() is None
+    sim.run()
+    assert sim.runs == [
+        ('simulation.json', ['group.0', 'group.1', 'group.2'])
+    ]
+    assert sorted(os.listdir(tmp_path)) == CASE_FILES
+    assert sim._changed_groups() == []
+
+
+def test_changed_groups_edited_before_loading(tmp_path, monkeypatch):
+
+    monkeypatch.setenv('PYOSRD_CACHE_DIR', '0')
+    _write_case(tmp_path)
+    with open(tmp_path / 'simulation.json') as f:
+        simulation = json.load(f)
+    simulation['train_schedule_groups'][2]['schedules'][0][
+        'departure_time'
+    ] = 1_000.
+    with open(tmp_path / 'simulation.json', 'w') as f:
+        json.dump(simulation, f)
+
+    sim = _osrd(tmp_path, monkeypatch)
+    assert sim._changed_groups() == ['group.2']
+
+
+def test_changed_groups_delays(sim):
+
+    sim.add_delays_in_results()  # results modified in place
+    assert sim._changed_groups() is None
+    assert 'results.digests.json' not in os.listdir(sim.dir)
+
+
+def test_run_changed_groups(sim):
+
+    sim.simulation['train_schedule_groups'][1]['schedules'][0][
+        'departure_time'
+    ] = 1_000.
+    sim.simulation['train_schedule_groups'].append(_group(3))
+    previous = sim.results
+    sim.run()
+
+    assert sim.runs == [('simulation.changed.json', ['group.1', 'group.3'])]
+    assert sim.results is not previous
+    assert sim.results == {
+        'group.0': _results(0),
+        'group.1': _results(1),
+        'group.2': _results(0),
+        'group.3': _results(1),
+    }
+    with open(os.path.join(sim.dir, 'results.json')) as f:
+        assert json.load(f) == sim.results
+    assert sorted(os.listdir(sim.dir)) == CASE_FILES
+    assert sim._changed_groups() == []
+
+
+def test_run_cancelled_group(sim):
+
+    del sim.simulation['train_schedule_groups'][2]
+    sim.run()
+
+    assert sim.runs == []
+    assert list(sim.results) == ['group.0', 'group.1']
+
+
+def test_run_full(sim):
+
+    sim.run(full=True)
+
+    assert sim.runs == [
+        ('simulation.json', ['group.0', 'group.1', 'group.2'])
+    ]
+    assert sim.results == {
+        f'group.{i}': _results(1) for i in range(3)
+    }
+
+
+def test_run_failed_removes_temporary_files(sim, monkeypatch):
+
+    def fail(simulation_json: str, results_json: str) -> dict:
+        raise RuntimeError('OSRD failed')
+
+    monkeypatch.setattr(sim, '_run_standalone', fail)
+    sim.simulation['train_schedule_groups'].append(_group(3))
+
+    with pytest.raises(RuntimeError):
+        sim.run()
+    assert sorted(os.listdir(sim.dir)) == CASE_FILES
+    assert list(sim.results) == ['group.0', 'group.1', 'group.2']
@@ -11,3 +11,14 @@ def test_run_shoud_fail_and_raise_exception_with_malformed_jsons():
     with pytest.raises(RuntimeError):
         sim.run()
     shutil.rmtree('tmp4', ignore_errors=True)
+
+
+def test_run_shoud_fail_with_missing_jsons_and_results_cache(
+    tmp_path,
+    monkeypatch,
+):
+    monkeypatch.setenv('PYOSRD_RESULTS_CACHE', str(tmp_path / 'cache'))
+    sim = OSRD(dir=str(tmp_path / 'case'))
+    sim.infra, sim.simulation = '', ''
+    with pytest.raises(RuntimeError):
+        sim.run()
@@ -0,0 +1,95 @@
+import os
+
+import pytest
+
+from pyosrd.results_cache import ResultsCache, results_cache
+
+
+def _write(path, content: str) -> str:
+    with open(path, 'w') as f:
+        f.write(content)
+    return str(path)
+
+
+@pytest.fixture
+def files(tmp_path):
+    return {
+        'infra': _write(tmp_path / 'infra.json', '{"track_sections": []}'),
+        'simulation': _write(tmp_path / 'simulation.json', '{}'),
+        'jar': _write(tmp_path / 'osrd-0213.jar', 'jar'),
+    }
+
+
+def test_key(files, tmp_path):
+
+    key = ResultsCache.key(files['infra'], files['simulation'], files['jar'])
+
+    assert key == ResultsCache.key(
+        files['infra'], files['simulation'], files['jar']
+    )
+    _write(files['simulation'], '{"time_step": 2}')
+    assert key != ResultsCache.key(
+        files['infra'], files['simulation'], files['jar']
+    )
+    key = ResultsCache.key(
+        files['infra'], files['simulation'], files['jar']
+    )
+    # rebuilt jar with the same name and size
+    _write(files['jar'], 'JAR')
+    os.utime(files['jar'], ns=(1, 1))
+    assert key != ResultsCache.key(
+        files['infra'], files['simulation'], files['jar']
+    )
+
+
+def test_get_put(files, tmp_path):
+
+    cache = ResultsCache(str(tmp_path / 'cache'))
+    key = cache.key(files['infra'], files['simulation'], files['jar'])
+    results = str(tmp_path / 'results.json')
+
+    assert not cache.get(key, results)
+    _write(results, '{"group.0": {}}')
+    cache.put(key, results)
+    os.remove(results)
+
+    assert cache.get(key, results)
+    with open(results) as f:
+        assert f.read() == '{"group.0": {}}'
+
+
+def test_evict(tmp_path):
+
+    cache = ResultsCache(str(tmp_path / 'cache'), max_size=25)
+    results = _write(tmp_path / 'results.json', '0123456789')
+    for i, key in enumerate(['aa0', 'bb1']):
+        cache.put(key, results)
+        os.utime(cache._path(key), ns=(i, i))
+    cache.put('cc2', results)
+
+    assert cache.size() == 20
+    assert cache.evict() == []
+    assert not cache.get('aa0', results)
+    assert cache.get('bb1', results)
+
+
+def test_results_cache_disabled(monkeypatch):
+
+    monkeypatch.setenv('PYOSRD_RESULTS_CACHE', '0')
+    assert results_cache() is None
+    monkeypatch.setenv('PYOSRD_RESULTS_CACHE', '/tmp/results')
+    monkeypatch.setenv('PYOSRD_RESULTS_CACHE_SIZE', '100')
+    assert results_cache().max_size == 100
+
+
+def test_results_cache_opt_in(monkeypatch, tmp_path):
+
+    monkeypatch.delenv('PYOSRD_RESULTS_CACHE', raising=False)
+    monkeypatch.delenv('PYOSRD_RESULTS_CACHE_SIZE', raising=False)
+    monkeypatch.setenv('PYOSRD_CACHE_DIR', str(tmp_path))
+    assert results_cache() is None
+
+    monkeypatch.setenv('PYOSRD_RESULTS_CACHE', str(tmp_path / 'results'))
+    cache = results_cache()
+    assert cache.directory == str(tmp_path / 'results')
+    assert cache.max_size == 256 << 20
@@ -0,0 +1,159 @@
+import json
+import os
+from types import SimpleNamespace
+
+import pandas as pd
+import pytest
+
+from pyosrd import OSRD
+from pyosrd.infra.stations_and_platforms import platform_location
+from pyosrd.timetable import read_timetable, timetable_trains
+
+
+def _track(id: str, track_name: str) -> dict:
+    return {
+        'id': id,
+        'extensions': {'sncf': {'track_name': track_name, 'line_code': 1}},
+    }
+
+
+def _op(id: str, name: str, parts: list[tuple[str, float]]) -> dict:
+    return {
+        'id': id,
+        'parts': [{'track': t, 'position': p} for t, p in parts],
+        'extensions': {'identifier': {'name': name}, 'sncf': {'ch': 'BV'}},
+    }
+
+
+@pytest.fixture
+def sim():
+    return SimpleNamespace(infra={
+        'track_sections': [_track('T0', 'V1'), _track('T1', 'V2')],
+        'operational_points': [
+            _op('op0', 'A', [('T0', 10.)]),
+            _op('op1', 'B', [('T1', 20.)]),
+        ],
+    })
+
+
+@pytest.fixture
+def timetable():
+    return pd.DataFrame({
+        'train': ['t1', 't0', 't1', 't0'],
+        'station': ['B', 'B', 'A', 'A'],
+        'platform': ['V2', 'V2', 'V1', 'V1'],
+        'time': ['00:20:00', '00:15:00', '00:10:00', '00:05:00'],
+        'rolling_stock': ['short_fast_rolling_stock', None, None, None],
+    })
+
+
+def test_timetable_trains(sim, timetable):
+
+    assert timetable_trains(sim, timetable) == [
+        {
+            'label': 't1',
+            'locations': [('T0', 10.), ('T1', 20.)],
+            'departure_time': 600.,
+            'rolling_stock': 'fast_rolling_stock',
+        },
+        {
+            'label': 't0',
+            'locations': [('T0', 10.), ('T1', 20.)],
+            'departure_time': 300.,
+            'rolling_stock': 'fast_rolling_stock',
+        },
+    ]
+
+
+def test_timetable_trains_rolling_stock(sim, timetable):
+
+    timetable.loc[2, 'rolling_stock'] = 'short_fast_rolling_stock'
+
+    assert (
+        timetable_trains(sim, timetable)[0]['rolling_stock']
+        == 'short_fast_rolling_stock'
+    )
+
+
+@pytest.mark.parametrize(
+    'column, value, message',
+    [
+        ('platform', 'V9', 'Unknown platforms: B V9'),
+        ('time', '00:10:00', 'same time'),
+        ('time', None, 'Missing times'),
+    ]
+)
+def test_timetable_trains_errors(sim, timetable, column, value, message):
+
+    timetable.loc[0, column] = value
+
+    with pytest.raises(ValueError, match=message):
+        timetable_trains(sim, timetable)
+
+
+def test_timetable_trains_one_platform(sim, timetable):
+
+    with pytest.raises(ValueError, match='less than 2 platforms: t1'):
+        timetable_trains(sim, timetable.drop(index=0))
+
+
+def test_read_timetable(sim, timetable, tmp_path):
+
+    path = str(tmp_path / 'timetable.csv')
+    timetable.to_csv(path, index=False)
+
+    assert (
+        timetable_trains(sim, read_timetable(path))
+        == timetable_trains(sim, timetable)
+    )
+
+
+def test_import_timetable_and_run(tmp_path):
+
+    sim = OSRD(dir=str(tmp_path), infra='hamelinfra')
+    platforms = {
+        'trainAK': [('A', 'V2'), ('B', 'V1'), ('C', 'V4'), ('K', 'V1')],
+        'trainAG': [('A', 'V2'), ('C', 'V4'), ('G', 'V2')],
+    }
+    timetable = pd.DataFrame([
+        {
+            'train': train,
+            'station': station,
+            'platform': platform,
+            'time': 600 * i + 60 * j,
+            'rolling_stock': 'short_fast_rolling_stock' if i else None,
+        }
+        for i, (train, stations) in enumerate(platforms.items())
+        for j, (station, platform) in enumerate(stations)
+    ])
+    path = str(tmp_path / 'timetable.csv')
+    timetable.to_csv(path, index=False)
+
+    assert sim.import_timetable(path) == ['trainAK', 'trainAG']
+    with open(os.path.join(sim.dir, sim.simulation_json)) as f:
+        assert json.load(f) == sim.simulation
+
+    sim.run()
+
+    assert sim.trains == ['trainAK', 'trainAG']
+    assert sim.departure_times == [0., 600.]
+    for train, stations in platforms.items():
+        group_id, _ = sim._train_schedule_group[train]
+        group = next(
+            group
+            for group in sim.simulation['train_schedule_groups']
+            if group['id'] == group_id
+        )
+        assert [
+            waypoint[0]['track_section'] for waypoint in group['waypoints']
+        ] == [
+            platform_location(sim, station, platform)[0]
+            for station, platform in stations
+        ]
+    assert all(
+        arrival > departure
+        for departure, arrival in zip(
+            sim.departure_times,
+            sim.last_arrival_times,
+        )
+    )
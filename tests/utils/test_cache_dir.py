@@ -0,0 +1,46 @@
+import os
+
+from pyosrd.utils.cache_dir import cache_dir, cache_max_size, evict
+
+
+def test_cache_dir(monkeypatch, tmp_path):
+
+    monkeypatch.setenv('PYOSRD_CACHE_DIR', str(tmp_path))
+    assert cache_dir('infra') == os.path.join(str(tmp_path), 'infra')
+
+    monkeypatch.delenv('PYOSRD_CACHE_DIR')
+    monkeypatch.setenv('XDG_CACHE_HOME', str(tmp_path))
+    assert cache_dir('infra') == os.path.join(
+        str(tmp_path), 'pyosrd', 'infra'
+    )
+
+    for disabled in ['', '0']:
+        monkeypatch.setenv('PYOSRD_CACHE_DIR', disabled)
+        assert cache_dir('infra') is None
+
+
+def test_cache_max_size(monkeypatch):
+
+    monkeypatch.delenv('PYOSRD_INFRA_CACHE_SIZE', raising=False)
+    assert cache_max_size('infra', 10) == 10
+    monkeypatch.setenv('PYOSRD_INFRA_CACHE_SIZE', '20')
+    assert cache_max_size('infra', 10) == 20
+
+
+def test_evict(tmp_path):
+
+    for i, name in enumerate(['a/1.cache', 'b/2.cache', '3.cache', '4.tmp']):
+        path = tmp_path / name
+        path.parent.mkdir(exist_ok=True)
+        path.write_text('0123456789')
+        os.utime(path, ns=(i, i))
+
+    assert evict(str(tmp_path), 20, '.cache') == [
+        str(tmp_path / 'a' / '1.cache')
+    ]
+    assert evict(str(tmp_path), 20, '.cache') == []
+    assert sorted(
+        os.path.relpath(os.path.join(root, name), tmp_path)
+        for root, _, names in os.walk(tmp_path)
+        for name in names
+    ) == ['3.cache', '4.tmp', os.path.join('b', '2.cache')]
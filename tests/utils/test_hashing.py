@@ -0,0 +1,15 @@
+from pyosrd.utils.hashing import files_hash
+
+
+def test_files_hash(tmp_path):
+
+    path = str(tmp_path / 'results.json')
+    with open(path, 'w') as f:
+        f.write('[]')
+    h = files_hash(path)
+
+    assert files_hash(path) == h
+    assert files_hash(path, str(tmp_path / 'missing.json')) != h
+    with open(path, 'w') as f:
+        f.write('[{}]')
+    assert files_hash(path) != h
@@ -0,0 +1,30 @@
+import importlib
+
+from railjson_generator.schema.simulation import simulation
+
+from pyosrd.utils.rolling_stocks import ROLLING_STOCKS, set_rolling_stocks
+
+
+def test_rolling_stocks():
+    assert 'fast_rolling_stock' in ROLLING_STOCKS
+
+
+def test_set_rolling_stocks():
+
+    simulation.ROLLING_STOCKS = {}
+    set_rolling_stocks()
+    assert simulation.ROLLING_STOCKS is ROLLING_STOCKS
+
+
+def test_modify_simulation_sets_rolling_stocks():
+
+    simulation.ROLLING_STOCKS = {}
+    importlib.reload(importlib.import_module('pyosrd.modify_simulation'))
+    assert simulation.ROLLING_STOCKS is ROLLING_STOCKS
+
+
+def test_use_cases_set_rolling_stocks():
+
+    simulation.ROLLING_STOCKS = {}
+    importlib.reload(importlib.import_module('pyosrd.use_cases'))
+    assert simulation.ROLLING_STOCKS is ROLLING_STOCKS
@@ -0,0 +1,58 @@
+import os
+
+import numpy as np
+from plotly import graph_objects as go
+
+from pyosrd.viz.dashboard_cache import DashboardCache
+
+
+def test_dashboard_cache_memory():
+
+    cache = DashboardCache(maxsize=2)
+    calls = []
+    def build(value):
+        calls.append(value)
+        return value
+
+    assert cache.get('a', 'map', lambda: build('<html>')) == '<html>'
+    assert cache.get('a', 'map', lambda: build('other')) == '<html>'
+    cache.get('b', 'map', lambda: build(1))
+    cache.get('c', 'map', lambda: build(2))
+
+    assert calls == ['<html>', 1, 2]
+    assert ('a', 'map') not in cache
+    assert len(cache) == 2
+    assert cache.stats == {'hits': 1, 'disk_hits': 0, 'misses': 3}
+
+
+def test_dashboard_cache_disk(tmp_path):
+
+    directory = str(tmp_path / 'cache')
+    cache = DashboardCache(directory)
+    fig = go.Figure(go.Scatter(x=[0, 1], y=[1, 2]))
+    cache.get('a', 'map', lambda: '<html>')
+    cache.get('a', 'chart', lambda: fig)
+    cache.get('b', 'delays', lambda: np.arange(3.))
+
+    other = DashboardCache(directory)
+    assert other.get('a', 'map', lambda: None) == '<html>'
+    assert list(other.get('a', 'chart', lambda: None).data[0].y) == [1, 2]
+    assert np.array_equal(other.get('b', 'delays', lambda: None), [0, 1, 2])
+    assert other.stats['disk_hits'] == 3
+
+    os.utime(os.path.join(directory, 'a'), (0, 0))
+    assert other.prune(1) == ['a']
+    assert other.keys_on_disk() == ['b']
+    assert ('a', 'map') not in other
+
+
+def test_dashboard_cache_max_keys(tmp_path):
+
+    directory = str(tmp_path / 'cache')
+    cache = DashboardCache(directory, max_keys=2)
+    for i, key in enumerate(['a', 'b', 'c']):
+        cache.get(key, 'map', lambda: '<html>')
+        cache.get(key, 'chart', lambda: '<html>')
+        os.utime(os.path.join(directory, key), (i, i))
+
+    assert cache.keys_on_disk() == ['b', 'c']
@@ -1,9 +1,12 @@
+import json
 import os
 import shutil
 
 import folium
+import pytest
 
 from pyosrd import OSRD
+from pyosrd.viz.map import MARKER_LAYERS
 
 
 def test_map():
@@ -15,3 +18,63 @@ def test_map():
     assert isinstance(m, folium.Map)
 
     shutil.rmtree('small_infra', ignore_errors=True)
+
+
+def test_map_bounds():
+    os.makedirs('small_infra', exist_ok=True)
+    os.system('python doc/tutorials/small_infra.py small_infra')
+
+    sim = OSRD('small_infra')
+    m = sim.folium_map(bounds=(49.4, 49.5, -0.4, -0.3))
+    assert isinstance(m, folium.Map)
+    assert not os.path.exists(os.path.join('small_infra', 'infra.index.npz'))
+
+    shutil.rmtree('small_infra', ignore_errors=True)
+
+
+def test_map_lightweight():
+    os.makedirs('small_infra', exist_ok=True)
+    os.system('python doc/tutorials/small_infra.py small_infra')
+
+    sim = OSRD('small_infra')
+    m = sim.folium_map(lightweight=True, cluster=True, simplify_zoom=12)
+    assert isinstance(m, folium.Map)
+    assert m.stats['points']['drawn'] <= m.stats['points']['raw']
+    assert m.stats['features']['tracks'] == len(sim.infra['track_sections'])
+
+    with pytest.warns(UserWarning, match='budget'):
+        m = sim.folium_map(lightweight=True, max_size=1_000)
+    assert m.stats['html_size'] > 1_000
+
+    shutil.rmtree('small_infra', ignore_errors=True)
+
+
+def test_write_map_tiles():
+    os.makedirs('small_infra', exist_ok=True)
+    os.system('python doc/tutorials/small_infra.py small_infra')
+
+    sim = OSRD('small_infra')
+    stats = sim.write_map_tiles(os.path.join('small_infra', 'tiles'))
+    with open(os.path.join('small_infra', 'tiles', 'tiles.json')) as f:
+        tiles = json.load(f)
+    assert len(tiles['tiles']) == stats['tiles']
+    for z, x, y in tiles['tiles']:
+        assert os.path.exists(
+            os.path.join('small_infra', 'tiles', str(z), str(x), f'{y}.geojson')
+        )
+
+    shutil.rmtree('small_infra', ignore_errors=True)
+
+
+def test_map_lightweight_zones():
+
+    sim = OSRD(dir=os.path.join('cases', 'hamelinfra'))
+    m = sim.folium_map(lightweight=True, cluster=True)
+    html = m.get_root().render()
+
+    assert 'Zones limits' in html
+    assert m.stats['skipped'] == []
+
+    with pytest.warns(UserWarning, match='skipped layers'):
+        m = sim.folium_map(lightweight=True, max_time=0)
+    assert m.stats['skipped'] == [*MARKER_LAYERS, 'zones']
@@ -0,0 +1,58 @@
+import json
+import os
+
+from pyosrd.viz.result_to_geojson import iter_res2geojson, res2geojson
+
+
+def test_res2geojson(simulation_cvg_dvg):
+
+    data = res2geojson(simulation_cvg_dvg)
+
+    assert data['type'] == 'FeatureCollection'
+    assert len(data['features']) == len(simulation_cvg_dvg.trains)
+    for feature in data['features']:
+        coordinates = feature['geometry']['coordinates']
+        assert len(coordinates) == len(feature['properties']['times'])
+        assert coordinates[-1] == (None, None)
+
+
+def test_iter_res2geojson_chunks(simulation_cvg_dvg):
+
+    features = list(iter_res2geojson(simulation_cvg_dvg, chunk=60))
+    whole = res2geojson(simulation_cvg_dvg)['features']
+
+    assert len(features) > len(whole)
+    assert (
+        sum(len(f['properties']['times']) for f in features)
+        == sum(len(f['properties']['times']) for f in whole)
+        + len(features) - len(whole)
+    )
+    for feature in features:
+        assert feature['geometry']['coordinates'][-1] == (None, None)
+
+
+def test_iter_res2geojson_min_move(simulation_cvg_dvg):
+
+    decimated = res2geojson(simulation_cvg_dvg, min_move=200)['features']
+    whole = res2geojson(simulation_cvg_dvg)['features']
+
+    for f, g in zip(decimated, whole):
+        assert len(f['properties']['times']) < len(g['properties']['times'])
+        assert f['properties']['times'][0] == g['properties']['times'][0]
+        assert f['properties']['times'][-1] == g['properties']['times'][-1]
+
+
+def test_write_res2geojson(simulation_cvg_dvg, tmp_path):
+
+    path = os.path.join(tmp_path, 'positions.ndjson')
+    n = simulation_cvg_dvg.write_res2geojson(path, chunk=60)
+    with open(path) as f:
+        features = [json.loads(line) for line in f]
+    assert len(features) == n
+
+    path = os.path.join(tmp_path, 'positions.geojson')
+    simulation_cvg_dvg.write_res2geojson(path, chunk=None)
+    with open(path) as f:
+        assert json.load(f) == json.loads(
+            json.dumps(res2geojson(simulation_cvg_dvg))
+        )
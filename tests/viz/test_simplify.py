@@ -0,0 +1,53 @@
+import numpy as np
+
+from pyosrd.viz.simplify import (
+    minmax_downsample,
+    simplify_line,
+    zoom_tolerance,
+)
+
+
+def test_zoom_tolerance():
+    assert zoom_tolerance(0) == 360 / 256
+    assert zoom_tolerance(10, pixels=2) == zoom_tolerance(9)
+
+
+def test_simplify_line():
+    line = [[0., 0.], [1., 0.01], [2., -0.01], [3., 5.], [4., 6.], [5., 7.]]
+
+    np.testing.assert_array_equal(
+        simplify_line(line, 0.1),
+        [[0., 0.], [2., -0.01], [3., 5.], [5., 7.]],
+    )
+    np.testing.assert_array_equal(simplify_line(line, 0.), line)
+    np.testing.assert_array_equal(
+        simplify_line(line, 10.),
+        [[0., 0.], [5., 7.]],
+    )
+
+
+def test_simplify_short_and_closed_lines():
+    np.testing.assert_array_equal(simplify_line([[1., 2.]], 1.), [[1., 2.]])
+    np.testing.assert_array_equal(
+        simplify_line([[0., 0.], [1., 1.], [0., 0.]], .5),
+        [[0., 0.], [1., 1.], [0., 0.]],
+    )
+
+
+def test_minmax_downsample():
+    x = np.arange(1_000.)
+    y = np.sin(x / 50)
+    y[500] = 10.
+    y[700:710] = np.nan
+
+    kept = minmax_downsample(x, y, 20)
+
+    assert len(kept) <= 4 * 20 + 1
+    assert kept[0] == 0 and kept[-1] == 999
+    assert 500 in kept and 700 in kept
+    assert np.nanmax(y[kept]) == 10.
+    assert np.nanmin(y[kept]) == np.nanmin(y)
+    np.testing.assert_array_equal(
+        minmax_downsample(x[:50], y[:50], 20),
+        np.arange(50)
+    )
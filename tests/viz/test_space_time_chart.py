@@ -1,4 +1,6 @@
 import matplotlib.pyplot as plt
+import numpy as np
+from plotly import graph_objects as go
 
 
 def test_space_time_chart(simulation_cvg_dvg):
@@ -32,3 +34,52 @@ def test_space_time_chart_by_label(simulation_cvg_dvg):
     )
     assert ax.get_title() == "train0 (base)"
     plt.close()
+
+
+def test_space_time_chart_plotly_cache(simulation_cvg_dvg):
+
+    fig = simulation_cvg_dvg.space_time_chart_plotly(0)
+    figures = simulation_cvg_dvg.space_time_data(0).figures
+    n_figures = len(figures)
+
+    assert simulation_cvg_dvg.space_time_chart_plotly(0) == fig
+    assert simulation_cvg_dvg.space_time_chart_plotly('train0') == fig
+    assert len(figures) == n_figures
+    assert simulation_cvg_dvg.space_time_chart_plotly(0, webgl=True) != fig
+
+    fig.update_layout(title='modified')
+    assert simulation_cvg_dvg.space_time_chart_plotly(0) != fig
+
+
+def test_space_time_chart_plotly_webgl_lod(simulation_cvg_dvg):
+
+    fig = simulation_cvg_dvg.space_time_chart_plotly(
+        0,
+        webgl=True,
+        max_points=8,
+    )
+    full = simulation_cvg_dvg.space_time_chart_plotly(0)
+
+    assert {trace.type for trace in fig.data} == {'scattergl'}
+    for trace, full_trace in zip(fig.data, full.data):
+        assert len(trace.x) <= len(full_trace.x)
+        assert trace.x[0] == full_trace.x[0]
+        assert trace.x[-1] == full_trace.x[-1]
+
+
+def test_update_space_time_chart_plotly(simulation_cvg_dvg):
+
+    fig = go.Figure(simulation_cvg_dvg.space_time_chart_plotly(0))
+    simulation_cvg_dvg.update_space_time_chart_plotly(fig, 1)
+    expected = simulation_cvg_dvg.space_time_chart_plotly(1)
+
+    assert fig.layout.title.text == expected.layout.title.text
+    assert fig.layout.meta == expected.layout.meta
+    assert fig.layout.yaxis.tickvals == expected.layout.yaxis.tickvals
+    for trace, expected_trace in zip(fig.data, expected.data):
+        np.testing.assert_array_equal(trace.x, expected_trace.x)
+
+    simulation_cvg_dvg.update_space_time_chart_plotly(
+        fig, 1, x_range=(100, 200)
+    )
+    assert fig.layout.xaxis.range == (100, 200)
@@ -0,0 +1,52 @@
+import numpy as np
+
+from pyosrd.osrd import Point
+
+
+def test_space_time_data_offsets(simulation_cvg_dvg):
+
+    sim = simulation_cvg_dvg
+    data = sim.space_time_data(0)
+
+    assert data.trains == sim.trains
+    for i, _ in enumerate(sim.trains):
+        offsets = [
+            sim.offset_in_path_of_train(
+                Point(
+                    id='',
+                    track_section=record['track_section'],
+                    type='record',
+                    position=record['offset']
+                ),
+                0
+            )
+            for record in sim._head_position(i)
+        ]
+        expected = np.array(
+            [np.nan if o is None else o for o in offsets],
+            dtype=float
+        )
+        times = np.array([record['time'] for record in sim._head_position(i)])
+        for t, o in zip(times, expected):
+            j = np.flatnonzero(data.times[i] == t)[0]
+            np.testing.assert_allclose(data.offsets[i][j], o)
+        assert np.all(np.diff(data.times[i]) >= 0)
+
+
+def test_space_time_data_cache(simulation_cvg_dvg):
+
+    data = simulation_cvg_dvg.space_time_data(0)
+
+    assert simulation_cvg_dvg.space_time_data('train0') is data
+    assert simulation_cvg_dvg.space_time_data(1) is not data
+
+
+def test_space_time_data_points(simulation_cvg_dvg):
+
+    data = simulation_cvg_dvg.space_time_data(0)
+
+    assert data.points_to_plot(['station']) == {
+        point['id']: point['offset']
+        for point in simulation_cvg_dvg.points_encountered_by_train(0)
+        if point['type'] == 'station'
+    }